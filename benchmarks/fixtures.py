@@ -0,0 +1,212 @@
+import os
+import json
+import shutil
+import logging
+import tempfile
+from datetime import datetime, timedelta
+import pandas as pd
+import pybaseball as pb
+import requests
+
+import baseball_predictor
+import github_twitter_automation
+import statcast_warehouse
+
+logger = logging.getLogger(__name__)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+SCHEDULE_URL = 'https://statsapi.mlb.com/api/v1/schedule'
+
+
+def _date_range(start, end):
+    day = datetime.strptime(start, '%Y-%m-%d')
+    last = datetime.strptime(end, '%Y-%m-%d')
+    while day <= last:
+        yield day.strftime('%Y-%m-%d')
+        day += timedelta(days=1)
+
+
+def record_fixtures(start, end, fixture_dir=FIXTURE_DIR, odds_api_key=None):
+    """Record Statcast, schedules, standings and (current) odds for a date range from the live APIs"""
+    os.makedirs(os.path.join(fixture_dir, 'schedule'), exist_ok=True)
+    os.makedirs(os.path.join(fixture_dir, 'odds'), exist_ok=True)
+
+    logger.info(f"📼 Recording Statcast {start} to {end}...")
+    statcast = pb.statcast(start_dt=start, end_dt=end)
+    statcast.to_pickle(os.path.join(fixture_dir, 'statcast.pkl.gz'))
+
+    logger.info("📼 Recording schedules...")
+    for day in _date_range(start, end):
+        response = requests.get(SCHEDULE_URL, params={'sportId': '1', 'date': day, 'hydrate': 'probablePitcher,team'})
+        if response.status_code == 200:
+            with open(os.path.join(fixture_dir, 'schedule', f'{day}.json'), 'w', encoding='utf-8') as f:
+                json.dump(response.json(), f)
+
+    logger.info("📼 Recording standings...")
+    pd.to_pickle(pb.standings(int(end[:4])), os.path.join(fixture_dir, 'standings.pkl.gz'))
+
+    # The odds API only serves upcoming games, so only today's slate can be recorded
+    if odds_api_key:
+        response = requests.get(
+            'https://api.the-odds-api.com/v4/sports/baseball_mlb/odds',
+            params={'apiKey': odds_api_key, 'regions': 'us', 'markets': 'h2h,spreads,totals',
+                    'oddsFormat': 'american', 'dateFormat': 'iso'}
+        )
+        if response.status_code == 200:
+            today = datetime.now().strftime('%Y-%m-%d')
+            with open(os.path.join(fixture_dir, 'odds', f'{today}.json'), 'w', encoding='utf-8') as f:
+                json.dump(response.json(), f)
+
+    with open(os.path.join(fixture_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump({'start': start, 'end': end, 'rows': len(statcast),
+                   'recorded_at': datetime.now().isoformat()}, f, indent=2)
+    logger.info(f"✅ Recorded {len(statcast)} pitches to {fixture_dir}")
+
+
+class _FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self._payload = payload
+        self.status_code = status_code
+        self.content = json.dumps(payload).encode('utf-8')
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} from fixture replay")
+
+
+class FixtureReplay:
+    """Serve pybaseball, MLB Stats API and Odds API calls from recorded fixtures
+
+    Inside the context the predictor and warehouse see a frozen clock so their
+    "last N days" windows land inside the recorded Statcast sample, and the
+    working directory is a scratch directory (a fresh temporary one unless
+    workdir is given) so the replay's data/, state/, models/ and docs/ trees
+    never touch the real ones.
+    """
+
+    def __init__(self, fixture_dir=FIXTURE_DIR, workdir=None):
+        self.fixture_dir = os.path.abspath(fixture_dir)
+        self.workdir = workdir
+        self._temp_workdir = None
+        self._previous_cwd = None
+        with open(os.path.join(fixture_dir, 'manifest.json'), 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+
+        self.statcast = pd.read_pickle(os.path.join(fixture_dir, 'statcast.pkl.gz'))
+        self.statcast['game_date'] = pd.to_datetime(self.statcast['game_date'])
+        self.standings = pd.read_pickle(os.path.join(fixture_dir, 'standings.pkl.gz'))
+        self.schedules = {}
+        self.now = datetime.strptime(self.manifest['end'], '%Y-%m-%d')
+        self._originals = []
+
+    # -- fixture lookups -------------------------------------------------
+
+    def slate_dates(self):
+        """Dates with a recorded schedule, in order"""
+        names = sorted(os.listdir(os.path.join(self.fixture_dir, 'schedule')))
+        return [name[:-len('.json')] for name in names if name.endswith('.json')]
+
+    def schedule(self, day):
+        if day not in self.schedules:
+            path = os.path.join(self.fixture_dir, 'schedule', f'{day}.json')
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.schedules[day] = json.load(f)
+            else:
+                self.schedules[day] = {'dates': []}
+        return self.schedules[day]
+
+    def odds(self, day):
+        """Recorded odds for a day, or even -110 lines built from the schedule"""
+        path = os.path.join(self.fixture_dir, 'odds', f'{day}.json')
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+
+        games = []
+        for date_data in self.schedule(day).get('dates', []):
+            for game in date_data.get('games', []):
+                home = game['teams']['home']['team']['name']
+                away = game['teams']['away']['team']['name']
+                games.append({
+                    'home_team': home,
+                    'away_team': away,
+                    'commence_time': game.get('gameDate', f'{day}T23:05:00Z'),
+                    'bookmakers': [{'markets': [{'key': 'h2h', 'outcomes': [
+                        {'name': home, 'price': -110}, {'name': away, 'price': -110}
+                    ]}]}]
+                })
+        return games
+
+    # -- replacements for the live calls ---------------------------------
+
+    def _statcast(self, start_dt=None, end_dt=None, team=None, verbose=True, parallel=True):
+        mask = (self.statcast['game_date'] >= pd.Timestamp(start_dt)) & (self.statcast['game_date'] <= pd.Timestamp(end_dt))
+        return self.statcast[mask].copy()
+
+    def _statcast_pitcher(self, start_dt=None, end_dt=None, player_id=None):
+        df = self._statcast(start_dt, end_dt)
+        return df[df['pitcher'] == player_id]
+
+    def _standings(self, season=None):
+        return self.standings
+
+    def _requests_get(self, url, params=None, **kwargs):
+        params = params or {}
+        if url.startswith(SCHEDULE_URL):
+            if 'date' in params:
+                return _FakeResponse(self.schedule(params['date']))
+            days = _date_range(params['startDate'], params['endDate'])
+            return _FakeResponse({'dates': [entry for day in days for entry in self.schedule(day).get('dates', [])]})
+        if 'the-odds-api.com' in url:
+            return _FakeResponse(self.odds((self.now + timedelta(days=1)).strftime('%Y-%m-%d')))
+        return _FakeResponse({}, status_code=404)
+
+    def _frozen_datetime(self):
+        replay = self
+
+        class FrozenDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return replay.now
+
+        return FrozenDatetime
+
+    def set_today(self, day):
+        """Move the frozen clock; the predictor's 'tomorrow' becomes the day after"""
+        self.now = datetime.strptime(day, '%Y-%m-%d')
+
+    def _swap(self, obj, attr, value):
+        self._originals.append((obj, attr, getattr(obj, attr)))
+        setattr(obj, attr, value)
+
+    def __enter__(self):
+        if self.workdir is None:
+            self.workdir = self._temp_workdir = tempfile.mkdtemp(prefix='fixture-replay-')
+        os.makedirs(self.workdir, exist_ok=True)
+        self._previous_cwd = os.getcwd()
+        os.chdir(self.workdir)
+
+        frozen = self._frozen_datetime()
+        self._swap(pb, 'statcast', self._statcast)
+        self._swap(pb, 'statcast_pitcher', self._statcast_pitcher)
+        self._swap(pb, 'standings', self._standings)
+        self._swap(baseball_predictor.requests, 'get', self._requests_get)
+        self._swap(baseball_predictor, 'datetime', frozen)
+        self._swap(github_twitter_automation, 'datetime', frozen)
+        self._swap(statcast_warehouse, 'datetime', frozen)
+        return self
+
+    def __exit__(self, *exc):
+        while self._originals:
+            obj, attr, value = self._originals.pop()
+            setattr(obj, attr, value)
+        os.chdir(self._previous_cwd)
+        if self._temp_workdir:
+            shutil.rmtree(self._temp_workdir, ignore_errors=True)
+            self.workdir = self._temp_workdir = None
+        return False
@@ -0,0 +1,293 @@
+import os
+import sys
+import json
+import time
+import pickle
+import argparse
+import platform
+import subprocess
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # allow running as a script
+
+from github_twitter_automation import GitHubTwitterAutomation
+import instrumentation
+from benchmarks.fixtures import FIXTURE_DIR, FixtureReplay, record_fixtures
+from benchmarks.synthetic import PITCHES_PER_GAME, write_synthetic_fixtures
+from log_config import configure_logging, flush_logging
+from model_backends import BACKENDS, make_backend
+from calibration import walk_forward_probabilities, probability_scores
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_DIR, 'benchmarks', 'results')
+
+# Number of slate days replayed per scale (None = every recorded day)
+SCALES = {'slate': 1, 'week': 7, 'season': None}
+
+# Games scored per inference call in the backend benchmark, and how many calls are timed
+SLATE_SIZE = 15
+SLATE_REPEATS = 50
+
+
+class Timings:
+    """Accumulates wall time per benchmarked function"""
+
+    def __init__(self):
+        self.results = {}
+
+    def measure(self, name, func, *args, **kwargs):
+        start = time.perf_counter()
+        value = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+
+        entry = self.results.setdefault(name, {'calls': 0, 'seconds': 0.0, 'max_ms': 0.0})
+        entry['calls'] += 1
+        entry['seconds'] += elapsed
+        entry['max_ms'] = max(entry['max_ms'], elapsed * 1000)
+        return value
+
+    def as_dict(self):
+        return {
+            name: {
+                'calls': entry['calls'],
+                'seconds': round(entry['seconds'], 4),
+                'mean_ms': round(entry['seconds'] / entry['calls'] * 1000, 3),
+                'max_ms': round(entry['max_ms'], 3)
+            }
+            for name, entry in self.results.items()
+        }
+
+
+def _git_commit():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR, capture_output=True, text=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_DIR, capture_output=True, text=True).stdout.strip()
+        return f"{commit}-dirty" if dirty else commit
+    except OSError:
+        return 'unknown'
+
+
+def _day_before(day):
+    return (datetime.strptime(day, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')
+
+
+def run_benchmarks(scale='slate', fixture_dir=FIXTURE_DIR):
+    """Replay recorded fixtures through every pipeline stage and time each one"""
+    timings = Timings()
+    instrumentation.reset_metrics()
+
+    with FixtureReplay(fixture_dir) as replay:
+        days = replay.slate_dates()
+        if SCALES[scale]:
+            days = days[-SCALES[scale]:]
+        if not days:
+            raise SystemExit(f"No recorded schedules in {fixture_dir}; run with --record first")
+
+        automation = GitHubTwitterAutomation()
+        automation.twitter_client = None
+        predictor = automation.predictor
+        predictor.odds_api_key = 'fixture'  # route odds through the replayed API instead of the built-in samples
+
+        replay.set_today(_day_before(days[0]))
+        timings.measure('refresh_feature_tables', predictor.refresh_feature_tables)
+        timings.measure('train_model', predictor.train_model)
+
+        total_games = 0
+        for day in days:
+            replay.set_today(_day_before(day))
+            timings.measure('refresh_feature_tables', predictor.refresh_feature_tables)
+            slate = predictor.get_slate_probable_pitchers(day)
+            total_games += len(slate)
+
+            for team in sorted({team for home, away, _ in slate for team in (home, away)}):
+                timings.measure('get_team_statcast_data', predictor.get_team_statcast_data, team)
+
+            for (home_team, away_team, game_number), pitchers in slate.items():
+                for side in ('home_pitcher', 'away_pitcher'):
+                    pitcher = pitchers[side]
+                    timings.measure('get_pitcher_stats', predictor.get_pitcher_stats, pitcher['mlb_id'], pitcher['name'])
+                timings.measure('create_features', predictor.create_features, home_team, away_team, day, pitchers,
+                                game_number=game_number)
+
+            comparisons = timings.measure('compare_predictions_with_odds', predictor.compare_predictions_with_odds)
+
+            data = {'predictions': comparisons, 'generated_at': replay.now, 'game_date': day}
+            timings.measure('render_page', automation.create_github_pages_content, data)
+            timings.measure('render_thread', automation.create_twitter_thread, data)
+
+    return {
+        'commit': _git_commit(),
+        'scale': scale,
+        'days': len(days),
+        'games': total_games,
+        'recorded_at': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'fixtures': replay.manifest,
+        'timings': timings.as_dict(),
+        'spans': instrumentation.metrics.summary()['spans']
+    }
+
+
+def load_feature_matrix(fixture_dir=FIXTURE_DIR):
+    """Training features built once from the fixtures and cached, so every backend sees the same rows"""
+    path = os.path.join(fixture_dir, 'feature_matrix.pkl')
+    if os.path.exists(path):
+        return pd.read_pickle(path)
+
+    with FixtureReplay(fixture_dir) as replay:
+        days = replay.slate_dates()
+        if not days:
+            raise SystemExit(f"No recorded schedules in {fixture_dir}; run with --record first")
+        replay.set_today(_day_before(days[-1]))
+        predictor = GitHubTwitterAutomation().predictor
+        predictor.refresh_feature_tables()
+        df = predictor.prepare_training_data()
+
+    df = df.fillna(df.mean(numeric_only=True))
+    df.to_pickle(path)
+    return df
+
+
+def benchmark_backends(fixture_dir=FIXTURE_DIR, backends=None):
+    """Fit time, slate latency, artifact size and walk-forward log-loss of each model backend"""
+    df = load_feature_matrix(fixture_dir)
+    X = df.drop('outcome', axis=1).to_numpy(dtype=float)
+    y = df['outcome'].to_numpy()
+    slate = X[-SLATE_SIZE:]
+
+    results = {}
+    for name in backends or BACKENDS:
+        backend = make_backend(name)
+        start = time.perf_counter()
+        backend.fit(X, y)
+        fit_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(SLATE_REPEATS):
+            backend.predict_proba(slate)
+        slate_ms = (time.perf_counter() - start) / SLATE_REPEATS * 1000
+
+        start = time.perf_counter()
+        for _ in range(SLATE_REPEATS):
+            backend.predict_proba(slate[:1])
+        game_us = (time.perf_counter() - start) / SLATE_REPEATS * 1e6
+
+        # Per-game key factors for the same slate, when the backend can explain itself
+        explainer = backend.explainer()
+        explain_ms = None
+        if explainer is not None:
+            start = time.perf_counter()
+            for _ in range(SLATE_REPEATS):
+                explainer.contributions(slate)
+            explain_ms = round((time.perf_counter() - start) / SLATE_REPEATS * 1000, 3)
+
+        oof = walk_forward_probabilities(backend, X, y)
+        known = ~np.isnan(oof)
+        backtest = probability_scores(oof[known], y[known]) if known.any() else {}
+
+        results[name] = {
+            'fit_seconds': round(fit_seconds, 4),
+            'slate_ms': round(slate_ms, 3),
+            'game_us': round(game_us, 1),
+            'explain_ms': explain_ms,
+            'artifact_bytes': len(pickle.dumps(backend)),
+            'backtest_games': int(known.sum()),
+            **{f'backtest_{metric}': value for metric, value in backtest.items()}
+        }
+
+    return {
+        'commit': _git_commit(),
+        'scale': 'backends',
+        'rows': len(df),
+        'features': X.shape[1],
+        'recorded_at': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'backends': results
+    }
+
+
+def print_backend_results(results):
+    print(f"\n🤖 Model backends on {results['rows']} games x {results['features']} features @ {results['commit']}")
+    print(f"   {'backend':10} {'fit s':>8} {'slate ms':>9} {'game us':>8} {'explain ms':>11} {'artifact KB':>12} {'log-loss':>9} {'brier':>7}")
+    for name, entry in sorted(results['backends'].items(), key=lambda item: item[1].get('backtest_log_loss', float('inf'))):
+        explain = f"{entry['explain_ms']:11.3f}" if entry.get('explain_ms') is not None else f"{'-':>11}"
+        print(f"   {name:10} {entry['fit_seconds']:8.3f} {entry['slate_ms']:9.3f} {entry.get('game_us', float('nan')):8.1f} {explain} {entry['artifact_bytes'] / 1024:12.1f} "
+              f"{entry.get('backtest_log_loss', float('nan')):9.4f} {entry.get('backtest_brier', float('nan')):7.4f}")
+
+
+def save_results(results, results_dir=RESULTS_DIR):
+    os.makedirs(results_dir, exist_ok=True)
+    path = os.path.join(results_dir, f"{results['commit']}-{results['scale']}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    return path
+
+
+def _load_results(ref, scale, results_dir=RESULTS_DIR):
+    """Load results by file path or by commit prefix"""
+    if os.path.exists(ref):
+        path = ref
+    else:
+        matches = sorted(name for name in os.listdir(results_dir) if name.startswith(ref) and name.endswith(f'-{scale}.json'))
+        if not matches:
+            raise SystemExit(f"No {scale} results for {ref} in {results_dir}")
+        path = os.path.join(results_dir, matches[-1])
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_results(base, head):
+    """Print per-function mean latency of two runs side by side"""
+    print(f"{'function':32} {base['commit']:>14} {head['commit']:>14} {'change':>9}")
+    for name in sorted(set(base['timings']) | set(head['timings'])):
+        before = base['timings'].get(name, {}).get('mean_ms')
+        after = head['timings'].get(name, {}).get('mean_ms')
+        if before and after:
+            change = f"{(after - before) / before * 100:+.1f}%"
+        else:
+            change = 'n/a'
+        print(f"{name:32} {before if before is not None else '-':>12}ms {after if after is not None else '-':>12}ms {change:>9}")
+
+
+def print_results(results):
+    print(f"\n⏱️ {results['scale']} scale: {results['days']} day(s), {results['games']} games @ {results['commit']}")
+    for name, entry in sorted(results['timings'].items(), key=lambda item: item[1]['seconds'], reverse=True):
+        print(f"   {name:32} {entry['calls']:6d} calls {entry['seconds']:10.3f}s total {entry['mean_ms']:10.3f}ms mean")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline pipeline benchmarks over recorded fixtures")
+    parser.add_argument('--scale', choices=sorted(SCALES), default='slate')
+    parser.add_argument('--fixtures', default=FIXTURE_DIR, help="Fixture directory")
+    parser.add_argument('--record', nargs=2, metavar=('START', 'END'),
+                        help="Record fixtures for a date range from the live APIs instead of benchmarking")
+    parser.add_argument('--synthetic', nargs=2, metavar=('START', 'END'),
+                        help="Generate seeded synthetic fixtures for a date range instead of benchmarking")
+    parser.add_argument('--seed', type=int, default=42, help="Seed for --synthetic")
+    parser.add_argument('--pitches-per-game', type=int, default=PITCHES_PER_GAME,
+                        help="Average pitches per synthetic game (raise it to stress the pipeline)")
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'HEAD'),
+                        help="Compare two stored results (commit prefix or path)")
+    parser.add_argument('--backends', nargs='*', choices=sorted(BACKENDS),
+                        help="Compare model backends (all if none named) on the cached feature matrix")
+    args = parser.parse_args()
+    configure_logging()
+
+    if args.record:
+        record_fixtures(args.record[0], args.record[1], args.fixtures, os.getenv('ODDS_API_KEY'))
+    elif args.synthetic:
+        write_synthetic_fixtures(args.synthetic[0], args.synthetic[1], args.fixtures, args.seed, args.pitches_per_game)
+    elif args.backends is not None:
+        results = benchmark_backends(args.fixtures, args.backends)
+        flush_logging()
+        print_backend_results(results)
+        print(f"✅ Results saved to {save_results(results)}")
+    elif args.compare:
+        compare_results(_load_results(args.compare[0], args.scale), _load_results(args.compare[1], args.scale))
+    else:
+        results = run_benchmarks(args.scale, args.fixtures)
+        flush_logging()
+        print_results(results)
+        print(f"✅ Results saved to {save_results(results)}")
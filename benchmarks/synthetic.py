@@ -0,0 +1,323 @@
+import os
+import json
+import logging
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+from baseball_predictor import SAVANT_TEAMS
+from venues import STATCAST_TEAM_CODES
+
+logger = logging.getLogger(__name__)
+
+# Statcast's codes where they differ from the predictor's abbreviations
+STATCAST_CODES = {abbr: code for code, abbr in STATCAST_TEAM_CODES.items() if code in ('AZ', 'WSH', 'ATH')}
+
+# Average pitches thrown in one game, both teams combined
+PITCHES_PER_GAME = 290
+PITCHES_PER_PA = 3.9
+
+# Pitching staff per team: a five-man rotation plus the bullpen
+STARTERS = 5
+RELIEVERS = 8
+LINEUP = 9
+
+LEAGUE_RUNS_PER_TEAM = 4.5
+HOME_RUN_EDGE = 0.04
+
+# Pitch mix and each type's speed/spin offset from the pitcher's fastball
+PITCH_TYPES = np.array(['FF', 'SI', 'FC', 'SL', 'CH', 'CU'])
+PITCH_MIX = np.array([0.38, 0.14, 0.08, 0.20, 0.12, 0.08])
+SPEED_OFFSET = np.array([0.0, -0.8, -4.0, -9.0, -8.5, -14.0])
+SPIN_OFFSET = np.array([0.0, -150.0, 50.0, 200.0, -550.0, 350.0])
+
+# Outcome of a plate appearance's last pitch, and the wOBA weight of each event
+EVENTS = np.array(['field_out', 'single', 'double', 'triple', 'home_run', 'strikeout', 'walk'])
+WOBA_WEIGHTS = np.array([0.0, 0.88, 1.24, 1.56, 2.0, 0.0, 0.69])
+
+# Non-terminal pitch descriptions and their statcast type
+TAKE_DESCRIPTIONS = np.array(['ball', 'called_strike', 'foul', 'swinging_strike'])
+TAKE_TYPES = np.array(['B', 'S', 'S', 'S'])
+
+# Weekdays (Mon=0, Thu=3) with a lighter schedule, and games played on them
+LIGHT_DAYS = (0, 3)
+LIGHT_DAY_GAMES = (8, 13)
+
+
+def _american(probability):
+    """American price for a win probability (already including any vig)"""
+    probability = np.clip(probability, 0.05, 0.95)
+    return np.where(probability >= 0.5, -100 * probability / (1 - probability),
+                    100 * (1 - probability) / probability).round().astype(int)
+
+
+class SyntheticLeague:
+    """Seeded synthetic MLB season: teams, staffs, schedule, pitches, standings and odds
+
+    Team offense and pitching strengths drive run scoring, batted-ball quality,
+    pitcher velocity and whiffs alike, so the frames carry the correlated
+    structure the features are built to pick up. Everything is generated with
+    whole-array operations, so a full season of pitches takes seconds.
+    """
+
+    def __init__(self, seed=42, pitches_per_game=PITCHES_PER_GAME, team_names=SAVANT_TEAMS):
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.pitches_per_game = pitches_per_game
+        self.teams = np.array(sorted(team_names))
+        self.team_names = np.array([team_names[team] for team in self.teams])
+        self.codes = np.array([STATCAST_CODES.get(team, team) for team in self.teams])
+        n_teams = len(self.teams)
+
+        # Team strengths (standard normal), shared by every generated table
+        self.offense = self.rng.normal(size=n_teams)
+        self.pitching = self.rng.normal(size=n_teams)
+
+        # Pitchers: team t owns ids 600000 + 20t + slot; starters first, then relievers
+        slots = STARTERS + RELIEVERS
+        self.pitcher_ids = 600000 + 20 * np.arange(n_teams)[:, np.newaxis] + np.arange(slots)
+        self.pitcher_skill = self.pitching[:, np.newaxis] * 0.6 + self.rng.normal(scale=0.8, size=(n_teams, slots))
+        self.pitcher_velo = 93.0 + 1.2 * self.pitcher_skill + self.rng.normal(scale=1.0, size=(n_teams, slots))
+        self.pitcher_velo[:, STARTERS:] += 1.0
+        self.pitcher_hand = np.where(self.rng.random((n_teams, slots)) < 0.28, 'L', 'R')
+
+        # Lineups: team t's batters are 500000 + 20t + slot
+        self.batter_ids = 500000 + 20 * np.arange(n_teams)[:, np.newaxis] + np.arange(LINEUP)
+        self.batter_stand = self.rng.choice(np.array(['R', 'L', 'S']), p=[0.58, 0.36, 0.06], size=(n_teams, LINEUP))
+
+    def schedule(self, start, end):
+        """One row per game with starters, expected runs and the final score"""
+        days = pd.date_range(start, end)
+        n_teams = len(self.teams)
+        pairs = n_teams // 2
+
+        order = self.rng.permuted(np.tile(np.arange(n_teams), (len(days), 1)), axis=1)
+        games_per_day = np.where(np.isin(days.weekday, LIGHT_DAYS),
+                                 self.rng.integers(*LIGHT_DAY_GAMES, size=len(days)), pairs)
+        played = np.arange(pairs) < games_per_day[:, np.newaxis]
+
+        day_index = np.repeat(np.arange(len(days)), pairs).reshape(len(days), pairs)[played]
+        home = order[:, 0::2][:, :pairs][played]
+        away = order[:, 1::2][:, :pairs][played]
+        games = pd.DataFrame({'game_date': days[day_index], 'home': home, 'away': away})
+        games['game_pk'] = 700000 + np.arange(len(games))
+
+        # Rotation: each team's starters go in turn through its games
+        long = pd.DataFrame({'game': np.concatenate([games.index, games.index]),
+                             'team': np.concatenate([home, away])})
+        turn = long.groupby('team').cumcount().to_numpy() % STARTERS
+        games['home_starter'] = turn[:len(games)]
+        games['away_starter'] = turn[len(games):]
+
+        home_skill = self.pitcher_skill[home, games['home_starter']]
+        away_skill = self.pitcher_skill[away, games['away_starter']]
+        games['home_expected_runs'] = LEAGUE_RUNS_PER_TEAM * np.exp(
+            0.12 * self.offense[home] - 0.08 * self.pitching[away] - 0.08 * away_skill + HOME_RUN_EDGE)
+        games['away_expected_runs'] = LEAGUE_RUNS_PER_TEAM * np.exp(
+            0.12 * self.offense[away] - 0.08 * self.pitching[home] - 0.08 * home_skill)
+
+        home_runs = self.rng.poisson(games['home_expected_runs'])
+        away_runs = self.rng.poisson(games['away_expected_runs'])
+        # Extra innings: one more run for a side, weighted by expected runs
+        tied = home_runs == away_runs
+        home_share = games['home_expected_runs'] / (games['home_expected_runs'] + games['away_expected_runs'])
+        home_walks_off = self.rng.random(len(games)) < home_share
+        home_runs = home_runs + (tied & home_walks_off)
+        away_runs = away_runs + (tied & ~home_walks_off)
+        games['home_score'] = home_runs
+        games['away_score'] = away_runs
+        games['start_hour'] = self.rng.choice(np.array([13, 16, 19, 19, 19, 20, 22]), size=len(games))
+        return games
+
+    def statcast(self, games):
+        """Pitch-level frame with the Statcast columns the pipeline reads, for every game"""
+        rng = self.rng
+        pitches = np.maximum(rng.poisson(self.pitches_per_game, size=len(games)), 150)
+        game = np.repeat(np.arange(len(games)), pitches)
+        n = len(game)
+        starts = np.repeat(np.cumsum(pitches) - pitches, pitches)
+        position = np.arange(n) - starts
+        progress = position / pitches[game]
+
+        home = games['home'].to_numpy()[game]
+        away = games['away'].to_numpy()[game]
+        half = np.minimum((progress * 18).astype(int), 17)
+        top = half % 2 == 0
+        inning = half // 2 + 1
+        batting = np.where(top, away, home)
+        fielding = np.where(top, home, away)
+
+        # Starter through five to seven innings, then relievers in a per-game order
+        starter = np.where(top, games['home_starter'].to_numpy()[game], games['away_starter'].to_numpy()[game])
+        starter_innings = 5 + (games['game_pk'].to_numpy()[game] + top) % 3
+        relief = STARTERS + (games['game_pk'].to_numpy()[game] * 3 + inning) % RELIEVERS
+        slot = np.where(inning <= starter_innings, starter, relief)
+        skill = self.pitcher_skill[fielding, slot]
+
+        at_bat = (position / PITCHES_PER_PA).astype(int)
+        last_pitch = np.append(at_bat[1:] != at_bat[:-1], True) | np.append(game[1:] != game[:-1], True)
+        batter_slot = (at_bat // 2) % LINEUP
+
+        pitch_type = rng.choice(len(PITCH_TYPES), p=PITCH_MIX, size=n)
+        in_zone = rng.random(n) < 0.48 + 0.02 * skill
+
+        # Terminal pitches: strikeouts and walks from pitcher skill, the rest put in play
+        roll = rng.random(n)
+        strikeout = last_pitch & (roll < 0.22 + 0.03 * skill)
+        walk = last_pitch & ~strikeout & (roll > 0.91 + 0.01 * skill)
+        in_play = last_pitch & ~strikeout & ~walk
+
+        launch_speed = rng.normal(88.5 + 1.5 * self.offense[batting] - 1.0 * skill, 10.0)
+        launch_angle = rng.normal(12.0, 24.0, size=n)
+        barrel = in_play & (launch_speed >= 98) & (launch_angle >= 20) & (launch_angle <= 36)
+        xba = 1 / (1 + np.exp(-(launch_speed - 95) / 6)) * np.exp(-((launch_angle - 15) / 30) ** 2) * 0.9 + 0.1
+        # Hits by contact quality: barrels and well-hit fly balls leave the park, gappers go for extra bases
+        hit_roll = rng.random(n)
+        fly = (launch_speed >= 95) & (launch_angle >= 22) & (launch_angle <= 40)
+        gap = (launch_speed >= 90) & (launch_angle >= 8) & (launch_angle <= 30)
+        hit_type = np.select(
+            [(barrel & (hit_roll < 0.6)) | (fly & (hit_roll < 0.2)), gap & (hit_roll < 0.02),
+             gap & (hit_roll < xba * 0.6), hit_roll < xba],
+            [4, 3, 2, 1], 0)
+        event = np.where(strikeout, 5, np.where(walk, 6, hit_type))
+
+        take = rng.choice(len(TAKE_DESCRIPTIONS), p=[0.37, 0.17, 0.30, 0.16], size=n)
+        # Better stuff turns some fouls into whiffs
+        take = np.where((take == 2) & (rng.random(n) < 0.1 * skill), 3, take)
+        description = np.where(in_play, 'hit_into_play', np.where(strikeout, 'swinging_strike',
+                               np.where(walk, 'ball', TAKE_DESCRIPTIONS[take])))
+        pitch_kind = np.where(in_play, 'X', np.where(strikeout, 'S', np.where(walk, 'B', TAKE_TYPES[take])))
+
+        # Scores climb to each game's final, reached on its last pitch
+        home_final = games['home_score'].to_numpy()[game]
+        away_final = games['away_score'].to_numpy()[game]
+        after = (position + 1) / pitches[game]
+
+        return pd.DataFrame({
+            'game_pk': games['game_pk'].to_numpy()[game],
+            'game_date': games['game_date'].to_numpy()[game],
+            'game_year': games['game_date'].dt.year.to_numpy()[game],
+            'game_type': 'R',
+            'home_team': self.codes[home],
+            'away_team': self.codes[away],
+            'inning': inning,
+            'inning_topbot': np.where(top, 'Top', 'Bot'),
+            'at_bat_number': at_bat + 1,
+            'pitch_number': position - np.maximum.accumulate(np.where(np.append(True, last_pitch[:-1]), position, 0)) + 1,
+            'pitcher': self.pitcher_ids[fielding, slot],
+            'player_name': np.char.add('Pitcher ', self.pitcher_ids[fielding, slot].astype(str)),
+            'p_throws': self.pitcher_hand[fielding, slot],
+            'batter': self.batter_ids[batting, batter_slot],
+            'stand': self.batter_stand[batting, batter_slot],
+            'pitch_type': PITCH_TYPES[pitch_type],
+            'release_speed': (self.pitcher_velo[fielding, slot] + SPEED_OFFSET[pitch_type]
+                              + rng.normal(scale=0.8, size=n)).round(1),
+            'release_spin_rate': (2250 + 60 * skill + SPIN_OFFSET[pitch_type] + rng.normal(scale=120, size=n)).round(),
+            'zone': np.where(in_zone, rng.integers(1, 10, size=n), rng.integers(11, 15, size=n)),
+            'description': description,
+            'type': pitch_kind,
+            'events': np.where(last_pitch, EVENTS[event], None),
+            'launch_speed': np.where(in_play, launch_speed.round(1), np.nan),
+            'launch_angle': np.where(in_play, launch_angle.round(), np.nan),
+            'hit_distance_sc': np.where(in_play, np.maximum(0, 2.2 * launch_speed + 3.5 * launch_angle - 40).round(), np.nan),
+            'barrel': np.where(in_play, barrel.astype(float), np.nan),
+            'estimated_ba_using_speedangle': np.where(in_play, xba.round(3), np.nan),
+            'estimated_slg_using_speedangle': np.where(in_play, (xba * (1.2 + barrel * 1.6)).round(3), np.nan),
+            'estimated_woba_using_speedangle': np.where(in_play, (xba * (1.0 + barrel * 1.0)).round(3), np.nan),
+            'woba_value': np.where(last_pitch, WOBA_WEIGHTS[event], np.nan),
+            'woba_denom': np.where(last_pitch, 1.0, np.nan),
+            'home_score': np.floor(home_final * position / pitches[game]).astype(int),
+            'away_score': np.floor(away_final * position / pitches[game]).astype(int),
+            'post_home_score': np.floor(home_final * after).astype(int),
+            'post_away_score': np.floor(away_final * after).astype(int)
+        })
+
+    def schedule_payloads(self, games):
+        """MLB Stats API schedule responses per day, with probable pitchers"""
+        payloads = {}
+        for day, day_games in games.groupby(games['game_date'].dt.strftime('%Y-%m-%d')):
+            entries = []
+            for row in day_games.itertuples():
+                teams = {}
+                for side, team, starter in (('home', row.home, row.home_starter), ('away', row.away, row.away_starter)):
+                    pitcher_id = int(self.pitcher_ids[team, starter])
+                    teams[side] = {'team': {'name': self.team_names[team]},
+                                   'probablePitcher': {'id': pitcher_id, 'fullName': f'Pitcher {pitcher_id}'}}
+                entries.append({'gamePk': int(row.game_pk), 'gameDate': f'{day}T{row.start_hour:02d}:05:00Z', 'teams': teams,
+                                'status': {'abstractGameState': 'Final', 'detailedState': 'Final'}})
+            payloads[day] = {'dates': [{'date': day, 'games': entries}]}
+        return payloads
+
+    def odds_payloads(self, games, vig=0.045):
+        """Odds API responses per day: moneyline, run line and total priced off the true run expectations"""
+        expected_diff = games['home_expected_runs'] - games['away_expected_runs']
+        home_prob = 1 / (1 + np.exp(-expected_diff / 2.6)) + self.rng.normal(scale=0.02, size=len(games))
+        home_price = _american(home_prob * (1 + vig / 2))
+        away_price = _american((1 - home_prob) * (1 + vig / 2))
+        home_favored = home_prob >= 0.5
+        home_cover = 1 / (1 + np.exp(-(expected_diff - np.where(home_favored, 1.5, -1.5)) / 2.6))
+        total = ((games['home_expected_runs'] + games['away_expected_runs']) * 2).round() / 2
+
+        payloads = {}
+        for i, (day, row) in enumerate(zip(games['game_date'].dt.strftime('%Y-%m-%d'), games.itertuples())):
+            home_name, away_name = self.team_names[row.home], self.team_names[row.away]
+            payloads.setdefault(day, []).append({
+                'home_team': home_name,
+                'away_team': away_name,
+                'commence_time': f'{day}T{row.start_hour:02d}:05:00Z',
+                'bookmakers': [{'markets': [
+                    {'key': 'h2h', 'outcomes': [{'name': home_name, 'price': int(home_price[i])},
+                                                {'name': away_name, 'price': int(away_price[i])}]},
+                    {'key': 'spreads', 'outcomes': [
+                        {'name': home_name, 'point': -1.5 if home_favored[i] else 1.5,
+                         'price': int(_american(home_cover[i] * (1 + vig / 2)))},
+                        {'name': away_name, 'point': 1.5 if home_favored[i] else -1.5,
+                         'price': int(_american((1 - home_cover[i]) * (1 + vig / 2)))}]},
+                    {'key': 'totals', 'outcomes': [{'name': 'Over', 'point': float(total.iloc[i]), 'price': -110},
+                                                   {'name': 'Under', 'point': float(total.iloc[i]), 'price': -110}]}
+                ]}]
+            })
+        return payloads
+
+    def standings(self, games):
+        """pybaseball-style standings: six division frames with Tm, W, L, W-L% and GB"""
+        home_won = games['home_score'] > games['away_score']
+        wins = np.bincount(np.where(home_won, games['home'], games['away']), minlength=len(self.teams))
+        losses = np.bincount(np.where(home_won, games['away'], games['home']), minlength=len(self.teams))
+
+        divisions = []
+        for members in np.array_split(np.arange(len(self.teams)), 6):
+            division = pd.DataFrame({'Tm': self.team_names[members], 'W': wins[members], 'L': losses[members]})
+            division['W-L%'] = (division['W'] / (division['W'] + division['L']).clip(lower=1)).map(lambda pct: f'{pct:.3f}'.lstrip('0'))
+            division = division.sort_values('W', ascending=False, ignore_index=True)
+            lead = division['W'].iloc[0] - division['L'].iloc[0]
+            games_back = (lead - (division['W'] - division['L'])) / 2
+            division['GB'] = games_back.map(lambda gb: '--' if gb == 0 else f'{gb:.1f}')
+            divisions.append(division)
+        return divisions
+
+
+def write_synthetic_fixtures(start, end, fixture_dir, seed=42, pitches_per_game=PITCHES_PER_GAME):
+    """Write a synthetic season in the recorded-fixture layout FixtureReplay reads"""
+    league = SyntheticLeague(seed, pitches_per_game)
+    games = league.schedule(start, end)
+    statcast = league.statcast(games)
+
+    os.makedirs(os.path.join(fixture_dir, 'schedule'), exist_ok=True)
+    os.makedirs(os.path.join(fixture_dir, 'odds'), exist_ok=True)
+    # Fast gzip: at default compression, writing a full season's pitches takes over a minute
+    statcast.to_pickle(os.path.join(fixture_dir, 'statcast.pkl.gz'), compression={'method': 'gzip', 'compresslevel': 1})
+    pd.to_pickle(league.standings(games), os.path.join(fixture_dir, 'standings.pkl.gz'))
+
+    for day, payload in league.schedule_payloads(games).items():
+        with open(os.path.join(fixture_dir, 'schedule', f'{day}.json'), 'w', encoding='utf-8') as f:
+            json.dump(payload, f)
+    for day, payload in league.odds_payloads(games).items():
+        with open(os.path.join(fixture_dir, 'odds', f'{day}.json'), 'w', encoding='utf-8') as f:
+            json.dump(payload, f)
+
+    with open(os.path.join(fixture_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump({'start': start, 'end': end, 'rows': len(statcast), 'games': len(games),
+                   'synthetic': True, 'seed': seed, 'recorded_at': datetime.now().isoformat()}, f, indent=2)
+    logger.info(f"✅ Generated {len(games)} synthetic games ({len(statcast)} pitches) to {fixture_dir}")
+    return statcast
@@ -0,0 +1,167 @@
+import os
+import logging
+from datetime import datetime, timedelta
+import pandas as pd
+
+from instrumentation import timed
+from feature_tables import TABLE_DIR, LEAGUE_WOBA, CumulativeSums
+from venues import normalize_team
+
+logger = logging.getLogger(__name__)
+
+WORKLOAD_COLUMNS = ['game_date', 'game_pk', 'home_team', 'away_team', 'inning_topbot', 'pitcher',
+                    'at_bat_number', 'events', 'woba_value', 'woba_denom']
+
+# Days of reliever usage summed into the workload features
+WORKLOAD_DAYS = 7
+FATIGUE_DAYS = 3
+
+# A reliever used by the team in this many days counts as part of its bullpen
+ROSTER_DAYS = 14
+
+# Usage that makes a reliever unlikely to pitch today
+TIRED_PITCHES_YESTERDAY = 30
+TIRED_PITCHES_FATIGUE_DAYS = 50
+
+# Plate appearances of league-average wOBA blended into each reliever's line
+RELIEVER_REGRESSION_PA = 40
+
+
+@timed('transform')
+def aggregate_appearances(statcast, full_names=None):
+    """One row per pitcher appearance: pitches thrown, wOBA sums and whether it was a start"""
+    df = statcast[[col for col in WORKLOAD_COLUMNS if col in statcast.columns]].copy()
+    fielding = df['home_team'].where(df['inning_topbot'] == 'Top', df['away_team'])
+    codes = {code: normalize_team(code, full_names) for code in fielding.dropna().unique()}
+    df['team'] = fielding.map(codes)
+    df['game_date'] = pd.to_datetime(df['game_date']).dt.strftime('%Y-%m-%d')
+    df['pa'] = df['events'].notna().astype(int)
+
+    apps = df.groupby(['game_date', 'game_pk', 'team', 'pitcher'], as_index=False).agg(
+        pitches=('pitcher', 'size'), first_ab=('at_bat_number', 'min'), pa=('pa', 'sum'),
+        woba_value=('woba_value', 'sum'), woba_denom=('woba_denom', 'sum')
+    )
+
+    # The team's first pitcher in each game is the starter; everyone after is a reliever
+    apps['starter'] = 0
+    apps.loc[apps.groupby(['game_pk', 'team'])['first_ab'].idxmin(), 'starter'] = 1
+    return apps.drop(columns=['first_ab'])
+
+
+class BullpenWorkload:
+    """Rolling reliever workload per team, indexed by day so each game reads only its own window
+
+    Appearances are aggregated once per warehouse day and appended, so the daily
+    Statcast update only adds the new days instead of rescanning the window.
+    Reliever quality is read from running totals of the appearances through each as-of date.
+    """
+
+    def __init__(self, table_dir=TABLE_DIR):
+        self.table_dir = table_dir
+        # (team, date) -> {reliever: pitches thrown that day}
+        self.usage = {}
+        # Running wOBA sums per reliever, for quality through any as-of date
+        self.relief = None
+        # (team, game date, as-of date) -> features, dropped by forget_games_before
+        self._features = {}
+
+    @property
+    def path(self):
+        return os.path.join(self.table_dir, 'bullpen_appearances.csv')
+
+    @classmethod
+    def load(cls, table_dir=TABLE_DIR):
+        workload = cls(table_dir)
+        if os.path.exists(workload.path):
+            workload._index(pd.read_csv(workload.path))
+        return workload
+
+    def refresh(self, warehouse, full_names=None):
+        """Aggregate warehouse days not yet in the appearance table, then rebuild the usage index"""
+        apps = pd.read_csv(self.path) if os.path.exists(self.path) else None
+        done = set(apps['game_date']) if apps is not None else set()
+        new_days = [day for day in warehouse.dates() if day not in done]
+        if not new_days:
+            return False
+
+        statcast = warehouse.load(new_days[0], new_days[-1], columns=WORKLOAD_COLUMNS)
+        if statcast.empty:
+            return False
+        statcast = statcast[pd.to_datetime(statcast['game_date']).dt.strftime('%Y-%m-%d').isin(new_days)]
+        fresh = aggregate_appearances(statcast, full_names)
+        apps = fresh if apps is None else pd.concat([apps, fresh], ignore_index=True)
+
+        os.makedirs(self.table_dir, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        apps.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, self.path)
+
+        self._index(apps)
+        logger.info(f"🧢 Bullpen workload updated with {len(new_days)} new day(s)")
+        return True
+
+    def _index(self, apps):
+        relief = apps[apps['starter'] == 0]
+        daily = relief.groupby(['team', 'game_date', 'pitcher'])['pitches'].sum()
+        self.usage = {
+            (team, day): {int(pitcher): int(pitches) for (_, _, pitcher), pitches in group.items()}
+            for (team, day), group in daily.groupby(level=['team', 'game_date'])
+        }
+
+        self.relief = CumulativeSums(relief, ['pitcher'], ['woba_value', 'woba_denom'])
+        self._features = {}
+
+    def forget_games_before(self, game_date):
+        """Drop memoized features for games before game_date"""
+        for key in [key for key in self._features if key[1] < game_date]:
+            del self._features[key]
+
+    def reliever_woba(self, pitcher, as_of=None):
+        """wOBA a reliever allowed through as_of, regressed to the league"""
+        totals = self.relief.through(pitcher, as_of) if self.relief is not None else None
+        if totals is None:
+            return LEAGUE_WOBA
+        woba_value, woba_denom = totals
+        return (woba_value + RELIEVER_REGRESSION_PA * LEAGUE_WOBA) / (woba_denom + RELIEVER_REGRESSION_PA)
+
+    def team_features(self, team, game_date, as_of=None):
+        """Workload, availability and quality of a team's bullpen going into game_date, from days through as_of"""
+        key = (team, game_date, as_of)
+        if key in self._features:
+            return self._features[key]
+
+        day = datetime.strptime(game_date, '%Y-%m-%d')
+        days = [(day - timedelta(days=back)).strftime('%Y-%m-%d') for back in range(1, ROSTER_DAYS + 1)]
+        usage = [self.usage.get((team, used), {}) if as_of is None or used <= as_of else {} for used in days]
+
+        roster = set().union(*usage)
+        recent = {pitcher: [day_usage.get(pitcher, 0) for day_usage in usage[:FATIGUE_DAYS]] for pitcher in roster}
+
+        tired = {pitcher for pitcher, pitched in recent.items()
+                 if pitched[0] >= TIRED_PITCHES_YESTERDAY or sum(pitched) >= TIRED_PITCHES_FATIGUE_DAYS
+                 or (pitched[0] and pitched[1])}
+        available = roster - tired
+
+        if available:
+            quality = sum(self.reliever_woba(pitcher, as_of) for pitcher in available) / len(available)
+        else:
+            quality = LEAGUE_WOBA
+
+        features = {
+            'bullpen_pitches_3d': sum(sum(day_usage.values()) for day_usage in usage[:FATIGUE_DAYS]),
+            'bullpen_pitches_7d': sum(sum(day_usage.values()) for day_usage in usage[:WORKLOAD_DAYS]),
+            'bullpen_tired_relievers': len(tired),
+            'bullpen_available_share': len(available) / len(roster) if roster else 1.0,
+            'bullpen_available_woba': float(quality)
+        }
+        self._features[key] = features
+        return features
+
+    def matchup_features(self, home_team, away_team, game_date, as_of=None):
+        home = self.team_features(home_team, game_date, as_of)
+        away = self.team_features(away_team, game_date, as_of)
+        features = {f'home_{name}': value for name, value in home.items()}
+        features.update({f'away_{name}': value for name, value in away.items()})
+        features['bullpen_fatigue_diff'] = away['bullpen_pitches_3d'] - home['bullpen_pitches_3d']
+        features['bullpen_quality_diff'] = away['bullpen_available_woba'] - home['bullpen_available_woba']
+        return features
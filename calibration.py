@@ -0,0 +1,123 @@
+import numpy as np
+from sklearn.isotonic import IsotonicRegression
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import brier_score_loss, log_loss
+from sklearn.model_selection import TimeSeriesSplit
+
+from instrumentation import timed
+
+# Walk-forward blocks used to collect out-of-fold probabilities
+CALIBRATION_FOLDS = 5
+
+# Out-of-fold games needed before calibrating at all, and before isotonic replaces Platt scaling
+CALIBRATION_MIN_ROWS = 10
+ISOTONIC_MIN_ROWS = 200
+
+# Latest share of the out-of-fold games held back to score the calibration
+REPORT_HOLDOUT_SHARE = 1 / 3
+
+# Raw probabilities the cached curve is evaluated at
+CURVE_GRID = np.linspace(0.0, 1.0, 101)
+
+PROB_FLOOR = 0.01
+
+
+def _logit(p):
+    p = np.clip(np.asarray(p, dtype=float), PROB_FLOOR, 1 - PROB_FLOOR)
+    return np.log(p / (1 - p))
+
+
+@timed('train')
+def walk_forward_probabilities(model, X, y, folds=CALIBRATION_FOLDS):
+    """Home-win probabilities where each block of games is scored by a model fit only on earlier games
+
+    model is a ModelBackend; each fold trains a fresh copy of it. Rows must be in
+    chronological order; the first block has no history and stays NaN.
+    """
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y)
+    oof = np.full(len(y), np.nan)
+    if len(y) <= folds:
+        return oof
+
+    for train_idx, test_idx in TimeSeriesSplit(n_splits=folds).split(X):
+        if len(np.unique(y[train_idx])) < 2:
+            continue
+        fold_model = model.fresh().fit(X[train_idx], y[train_idx])
+        oof[test_idx] = fold_model.predict_proba(X[test_idx])
+    return oof
+
+
+class ProbabilityCalibrator:
+    """Monotone map from raw model probabilities to observed home-win rates
+
+    Platt scaling on short histories, isotonic regression once there are enough
+    games. Either way the fit is cached as a curve over CURVE_GRID, so a whole
+    slate is calibrated with a single np.interp.
+    """
+
+    def __init__(self):
+        self.method = 'identity'
+        self.rows = 0
+        self.curve = CURVE_GRID.copy()
+
+    def fit(self, raw, outcomes):
+        raw = np.asarray(raw, dtype=float)
+        outcomes = np.asarray(outcomes)
+        known = ~np.isnan(raw)
+        raw, outcomes = raw[known], outcomes[known]
+
+        if len(raw) < CALIBRATION_MIN_ROWS or len(np.unique(outcomes)) < 2:
+            return self
+
+        if len(raw) >= ISOTONIC_MIN_ROWS:
+            isotonic = IsotonicRegression(y_min=0.0, y_max=1.0, out_of_bounds='clip').fit(raw, outcomes)
+            curve = isotonic.predict(CURVE_GRID)
+            self.method = 'isotonic'
+        else:
+            platt = LogisticRegression().fit(_logit(raw).reshape(-1, 1), outcomes)
+            curve = platt.predict_proba(_logit(CURVE_GRID).reshape(-1, 1))[:, 1]
+            self.method = 'platt'
+
+        self.rows = len(raw)
+        self.curve = np.clip(curve, PROB_FLOOR, 1 - PROB_FLOOR)
+        return self
+
+    def transform(self, raw):
+        """Calibrated probabilities for an array (or scalar) of raw home-win probabilities"""
+        return np.interp(np.asarray(raw, dtype=float), CURVE_GRID, self.curve)
+
+
+def probability_scores(probabilities, outcomes):
+    """Brier score and log-loss of home-win probabilities against outcomes"""
+    probabilities = np.clip(probabilities, PROB_FLOOR, 1 - PROB_FLOOR)
+    return {
+        'brier': round(float(brier_score_loss(outcomes, probabilities)), 4),
+        'log_loss': round(float(log_loss(outcomes, probabilities, labels=[0, 1])), 4)
+    }
+
+
+def calibration_report(raw, outcomes, holdout_share=REPORT_HOLDOUT_SHARE):
+    """Brier and log-loss before and after calibration on the latest out-of-fold games
+
+    The calibrator scored here is fit only on the earlier games, so the
+    "after" numbers aren't flattered by fitting and scoring the same rows.
+    """
+    raw = np.asarray(raw, dtype=float)
+    outcomes = np.asarray(outcomes)
+    known = ~np.isnan(raw)
+    raw, outcomes = raw[known], outcomes[known]
+
+    split = int(len(raw) * (1 - holdout_share))
+    if split < CALIBRATION_MIN_ROWS or len(raw) - split < 2:
+        return {'rows': int(len(raw)), 'holdout_rows': 0}
+
+    calibrator = ProbabilityCalibrator().fit(raw[:split], outcomes[:split])
+    held_raw, held_outcomes = raw[split:], outcomes[split:]
+    return {
+        'rows': int(len(raw)),
+        'holdout_rows': int(len(held_raw)),
+        'method': calibrator.method,
+        'raw': probability_scores(held_raw, held_outcomes),
+        'calibrated': probability_scores(calibrator.transform(held_raw), held_outcomes)
+    }
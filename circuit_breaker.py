@@ -0,0 +1,180 @@
+import os
+import time
+import logging
+import threading
+from collections import Counter
+
+from instrumentation import count
+
+logger = logging.getLogger(__name__)
+
+# Consecutive failures before a source is skipped for the rest of the run
+FAILURE_THRESHOLD = int(os.getenv('MLB_BREAKER_THRESHOLD', 3))
+
+# Upstream data sources the predictor calls
+SOURCES = ('statcast', 'statcast_pitcher', 'mlb_schedule', 'odds')
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a source whose breaker has tripped"""
+
+    def __init__(self, source):
+        super().__init__(f"{source} circuit open, skipping call")
+        self.source = source
+
+
+class CircuitBreaker:
+    """Stops calling a data source after `threshold` consecutive failures
+
+    With reset_after=None the breaker stays open for the rest of the run;
+    otherwise one trial call is let through once that many seconds have passed.
+    """
+
+    def __init__(self, source, threshold=FAILURE_THRESHOLD, reset_after=None):
+        self.source = source
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.calls = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.skipped = 0
+        self.opened_at = None
+        self.last_error = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        return self.opened_at is not None
+
+    def _allow(self):
+        with self._lock:
+            if not self.is_open:
+                return True
+            if self.reset_after is not None and time.time() - self.opened_at >= self.reset_after:
+                # Half-open: the next call decides whether the source is back
+                self.opened_at = time.time()
+                return True
+            self.skipped += 1
+            return False
+
+    def call(self, func, *args, **kwargs):
+        if not self._allow():
+            count(f'breaker.{self.source}.skipped')
+            raise CircuitOpenError(self.source)
+
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self._record_failure(e)
+            raise
+
+        with self._lock:
+            self.calls += 1
+            self.consecutive_failures = 0
+            if self.is_open:
+                logger.info(f"✅ {self.source} recovered, closing circuit")
+                self.opened_at = None
+        return result
+
+    def _record_failure(self, error):
+        with self._lock:
+            self.calls += 1
+            self.failures += 1
+            self.consecutive_failures += 1
+            self.last_error = f"{type(error).__name__}: {error}"
+            tripped = not self.is_open and self.consecutive_failures >= self.threshold
+            if tripped or self.is_open:
+                self.opened_at = time.time()
+        count(f'breaker.{self.source}.failures')
+
+        if tripped:
+            logger.warning(f"🔌 {self.source} failed {self.consecutive_failures} times in a row, "
+                           f"skipping it and using fallbacks ({self.last_error})")
+        elif self.failures == 1:
+            logger.warning(f"⚠️ {self.source} call failed: {self.last_error}")
+
+    def status(self):
+        return {
+            'state': 'open' if self.is_open else 'closed',
+            'calls': self.calls,
+            'failures': self.failures,
+            'skipped': self.skipped,
+            'last_error': self.last_error
+        }
+
+
+class SourceHealth:
+    """Per-source circuit breakers plus a record of which inputs fell back to defaults"""
+
+    def __init__(self, threshold=FAILURE_THRESHOLD, reset_after=None):
+        self.breakers = {source: CircuitBreaker(source, threshold, reset_after) for source in SOURCES}
+        self.fallbacks = Counter()
+        # game key -> ["source:item", ...] for games whose features used fallbacks
+        self.degraded_games = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def set_reset_after(self, seconds):
+        for breaker in self.breakers.values():
+            breaker.reset_after = seconds
+
+    def call(self, source, func, *args, **kwargs):
+        """Call a data source through its breaker; raises CircuitOpenError while it's tripped"""
+        return self.breakers[source].call(func, *args, **kwargs)
+
+    def record_fallback(self, source, item, error=None):
+        """Note that `item` (a team, pitcher, ...) used default values instead of `source` data"""
+        with self._lock:
+            self.fallbacks[source] += 1
+        self._pending().append(f"{source}:{item}")
+        if error is not None and not isinstance(error, CircuitOpenError):
+            logger.debug(f"{source} fallback for {item}: {error}")
+
+    def _pending(self):
+        if not hasattr(self._local, 'pending'):
+            self._local.pending = []
+        return self._local.pending
+
+    def take_fallbacks(self):
+        """Fallbacks recorded on this thread since the last call"""
+        pending = self._pending()
+        taken = list(dict.fromkeys(pending))
+        pending.clear()
+        return taken
+
+    def mark_degraded(self, game, fallbacks):
+        with self._lock:
+            if fallbacks:
+                self.degraded_games[game] = fallbacks
+            else:
+                self.degraded_games.pop(game, None)
+
+    def forget_games_before(self, game_date):
+        """Drop degraded-game records for slates before game_date (keys start with the game date)"""
+        with self._lock:
+            for game in [game for game in self.degraded_games if game[:10] < game_date]:
+                del self.degraded_games[game]
+
+    @property
+    def degraded(self):
+        return any(breaker.failures for breaker in self.breakers.values()) or bool(self.fallbacks)
+
+    def report(self):
+        """JSON-ready per-run degradation report"""
+        with self._lock:
+            return {
+                'sources': {source: breaker.status() for source, breaker in self.breakers.items()},
+                'fallbacks': dict(self.fallbacks),
+                'degraded_games': dict(self.degraded_games)
+            }
+
+    def log_report(self):
+        if not self.degraded:
+            return
+        report = self.report()
+        sources = ', '.join(
+            f"{source} {status['state']} ({status['failures']} failed, {status['skipped']} skipped)"
+            for source, status in report['sources'].items() if status['failures'] or status['skipped']
+        )
+        logger.warning(f"🩹 Degraded run: {len(report['degraded_games'])} game(s) used fallback inputs; "
+                       f"{sources or 'no source failures'}", extra={'degradation': report})
@@ -0,0 +1,87 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+
+# Factors listed per game, largest contribution first
+TOP_FACTORS = 3
+
+# Contributions smaller than this (in home-win probability) aren't worth naming
+MIN_CONTRIBUTION = 0.005
+
+
+class ForestExplainer:
+    """Saabas tree-path contributions for a compiled random forest, computed for a whole slate at once
+
+    Every node's change in home-win share from its parent is charged to the
+    feature the parent split on. Summing those deltas down each root-to-node
+    path once, at build time, leaves a sparse (nodes x features) matrix; a
+    slate's contributions are then its leaf indicator times that matrix. The
+    bias plus a row's contributions equals the forest's raw home-win
+    probability exactly. `inputs` maps feature rows onto what the forest was
+    fit on (e.g. a scaler's transform); rows are used as they are by default.
+    """
+
+    def __init__(self, compiled, inputs=None):
+        self.compiled = compiled
+        self.inputs = inputs
+        n_nodes = len(compiled.feature)
+        classes = list(compiled.classes)
+        share = compiled.value[:, classes.index(1)] if 1 in classes else np.zeros(n_nodes)
+
+        # Parent of every node over all trees' nodes concatenated; leaves point at themselves
+        internal = np.flatnonzero(compiled.children[:, 0] != np.arange(n_nodes))
+        parent = np.full(n_nodes, -1)
+        delta_feature = np.zeros(n_nodes, dtype=int)
+        delta = np.zeros(n_nodes)
+        for side in (0, 1):
+            children = compiled.children[internal, side]
+            parent[children] = internal
+            delta_feature[children] = compiled.feature[internal]
+            delta[children] = (share[children] - share[internal]) / compiled.n_trees
+        self.bias = share[compiled.roots].sum() / compiled.n_trees
+
+        # Path matrix: row i marks node i and all its ancestors (one vectorized step per tree level)
+        rows, cols = [], []
+        nodes, ancestors = np.arange(n_nodes), np.arange(n_nodes)
+        while len(nodes):
+            rows.append(nodes)
+            cols.append(ancestors)
+            up = parent[ancestors] >= 0
+            nodes, ancestors = nodes[up], parent[ancestors[up]]
+        path = csr_matrix((np.ones(sum(map(len, rows))), (np.concatenate(rows), np.concatenate(cols))),
+                          shape=(n_nodes, n_nodes))
+        node_deltas = csr_matrix((delta, (np.arange(n_nodes), delta_feature)), shape=(n_nodes, compiled.n_features))
+        self.node_contributions = (path @ node_deltas).tocsr()
+
+    def contributions(self, X):
+        """(rows x features) change in home-win probability attributed to each feature"""
+        leaves = self.compiled.apply(self.inputs(X) if self.inputs else X)
+        n_trees = self.compiled.n_trees
+        indicator = csr_matrix((np.ones(leaves.size), leaves.ravel(), np.arange(0, leaves.size + 1, n_trees)),
+                               shape=(len(leaves), len(self.compiled.feature)))
+        return (indicator @ self.node_contributions).toarray()
+
+
+def top_factors(contributions, feature_names, home_teams, away_teams, top=TOP_FACTORS):
+    """Readable key factors per row: the features that moved the home-win probability most"""
+    contributions = np.asarray(contributions)
+    top = min(top, contributions.shape[1])
+    if top == 0:
+        return [[] for _ in range(len(contributions))]
+
+    # Largest absolute contributions per row, selected for the whole slate at once
+    magnitude = np.abs(contributions)
+    candidates = np.argpartition(-magnitude, top - 1, axis=1)[:, :top]
+    ranked = np.take_along_axis(candidates, np.argsort(-np.take_along_axis(magnitude, candidates, axis=1), axis=1), axis=1)
+
+    factors = []
+    for i, columns in enumerate(ranked):
+        row = []
+        for column in columns:
+            value = contributions[i, column]
+            if abs(value) < MIN_CONTRIBUTION:
+                break
+            team = home_teams[i] if value > 0 else away_teams[i]
+            label = feature_names[column].replace('_', ' ').capitalize()
+            row.append(f"{label} favors {team} ({value * 100:+.1f}% home win)")
+        factors.append(row)
+    return factors
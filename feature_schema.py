@@ -0,0 +1,184 @@
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+
+from feature_tables import LEAGUE_WOBA
+from venues import INDOOR_TEMP_F
+from team_ratings import BASE_RATING, HOME_ADVANTAGE, expected_home_win
+
+# Every feature is stored in one float32 matrix column; flags and counts included
+FEATURE_DTYPE = np.float32
+
+FeatureSpec = namedtuple('FeatureSpec', ['name', 'default'])
+
+# The model's inputs, in column order. Builders write by name; anything not written keeps its default.
+FEATURES = (
+    # Starting pitchers
+    FeatureSpec('home_pitcher_fastball_velo', 92.5),
+    FeatureSpec('away_pitcher_fastball_velo', 92.5),
+    FeatureSpec('home_pitcher_whiff_rate', 0.25),
+    FeatureSpec('away_pitcher_whiff_rate', 0.25),
+    FeatureSpec('home_pitcher_zone_rate', 0.50),
+    FeatureSpec('away_pitcher_zone_rate', 0.50),
+    FeatureSpec('home_pitcher_exit_velo_against', 88.0),
+    FeatureSpec('away_pitcher_exit_velo_against', 88.0),
+    FeatureSpec('pitching_velo_advantage', 0.0),
+    FeatureSpec('pitching_control_advantage', 0.0),
+    FeatureSpec('pitching_stuff_advantage', 0.0),
+    FeatureSpec('overall_pitching_advantage', 0.0),
+
+    # Team offense from Statcast
+    FeatureSpec('home_avg_exit_velocity', 88.0),
+    FeatureSpec('away_avg_exit_velocity', 88.0),
+    FeatureSpec('home_barrel_rate', 7.5),
+    FeatureSpec('away_barrel_rate', 7.5),
+    FeatureSpec('home_hard_hit_rate', 38.0),
+    FeatureSpec('away_hard_hit_rate', 38.0),
+
+    # Record and recent form
+    FeatureSpec('home_win_pct', 0.5),
+    FeatureSpec('away_win_pct', 0.5),
+    FeatureSpec('win_pct_diff', 0.0),
+    FeatureSpec('home_recent_form', 0.5),
+    FeatureSpec('away_recent_form', 0.5),
+    FeatureSpec('form_diff', 0.0),
+    FeatureSpec('home_field_advantage', 1.0),
+
+    # Elo ratings going into the game
+    FeatureSpec('home_elo', BASE_RATING),
+    FeatureSpec('away_elo', BASE_RATING),
+    FeatureSpec('elo_diff', HOME_ADVANTAGE),
+    FeatureSpec('elo_home_win_prob', expected_home_win(BASE_RATING, BASE_RATING)),
+
+    # Park and weather
+    FeatureSpec('park_run_factor', 1.0),
+    FeatureSpec('park_hr_factor', 1.0),
+    FeatureSpec('park_ev_adjustment', 0.0),
+    FeatureSpec('park_temp_f', INDOOR_TEMP_F),
+    FeatureSpec('park_roof_closed', 0.0),
+    FeatureSpec('park_air_density', 1.0),
+
+    # Handedness splits
+    FeatureSpec('home_offense_woba_vs_hand', LEAGUE_WOBA),
+    FeatureSpec('away_offense_woba_vs_hand', LEAGUE_WOBA),
+    FeatureSpec('home_pitcher_woba_vs_lineup', LEAGUE_WOBA),
+    FeatureSpec('away_pitcher_woba_vs_lineup', LEAGUE_WOBA),
+    FeatureSpec('handedness_matchup_edge', 0.0),
+
+    # Bullpen workload
+    FeatureSpec('home_bullpen_pitches_3d', 0.0),
+    FeatureSpec('home_bullpen_pitches_7d', 0.0),
+    FeatureSpec('home_bullpen_tired_relievers', 0.0),
+    FeatureSpec('home_bullpen_available_share', 1.0),
+    FeatureSpec('home_bullpen_available_woba', LEAGUE_WOBA),
+    FeatureSpec('away_bullpen_pitches_3d', 0.0),
+    FeatureSpec('away_bullpen_pitches_7d', 0.0),
+    FeatureSpec('away_bullpen_tired_relievers', 0.0),
+    FeatureSpec('away_bullpen_available_share', 1.0),
+    FeatureSpec('away_bullpen_available_woba', LEAGUE_WOBA),
+    FeatureSpec('bullpen_fatigue_diff', 0.0),
+    FeatureSpec('bullpen_quality_diff', 0.0),
+
+    # Rest and travel
+    FeatureSpec('home_rest_days', 0.0),
+    FeatureSpec('home_games_streak', 0.0),
+    FeatureSpec('home_travel_miles', 0.0),
+    FeatureSpec('home_travel_miles_7d', 0.0),
+    FeatureSpec('away_rest_days', 0.0),
+    FeatureSpec('away_games_streak', 0.0),
+    FeatureSpec('away_travel_miles', 0.0),
+    FeatureSpec('away_travel_miles_7d', 0.0),
+    FeatureSpec('rest_diff', 0.0),
+    FeatureSpec('travel_diff', 0.0),
+
+    # Offense vs opposing starter
+    FeatureSpec('home_offense_vs_away_pitcher', 0.0),
+    FeatureSpec('away_offense_vs_home_pitcher', 0.0),
+)
+
+
+class FeatureRow:
+    """Dict-like view over one row of a float32 feature matrix
+
+    Setting a feature writes straight into the row; None or NaN falls back to the
+    feature's default, and an unregistered name raises KeyError.
+    """
+
+    __slots__ = ('schema', 'values')
+
+    def __init__(self, schema, values):
+        self.schema = schema
+        self.values = values
+
+    def __setitem__(self, name, value):
+        index = self.schema.index[name]
+        if value is None or value != value:
+            value = self.schema.defaults[index]
+        self.values[index] = value
+
+    def __getitem__(self, name):
+        return float(self.values[self.schema.index[name]])
+
+    def __contains__(self, name):
+        return name in self.schema.index
+
+    def __iter__(self):
+        return iter(self.schema.names)
+
+    def __len__(self):
+        return len(self.schema.names)
+
+    def get(self, name, default=None):
+        return self[name] if name in self.schema.index else default
+
+    def update(self, features):
+        for name, value in features.items():
+            self[name] = value
+
+    def keys(self):
+        return list(self.schema.names)
+
+    def items(self):
+        return zip(self.schema.names, self.values.tolist())
+
+
+class FeatureSchema:
+    """Fixed feature order and defaults shared by training and prediction"""
+
+    def __init__(self, specs=FEATURES):
+        self.names = [spec.name for spec in specs]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        if len(self.index) != len(self.names):
+            raise ValueError("Duplicate feature names in schema")
+        self.defaults = np.array([spec.default for spec in specs], dtype=FEATURE_DTYPE)
+
+    def __len__(self):
+        return len(self.names)
+
+    def matrix(self, n_rows):
+        """Preallocated matrix with every feature at its default"""
+        return np.tile(self.defaults, (n_rows, 1))
+
+    def row(self, matrix=None, i=0):
+        """Writable view of row i of matrix (or of a fresh single row)"""
+        if matrix is None:
+            return FeatureRow(self, self.defaults.copy())
+        return FeatureRow(self, matrix[i])
+
+    def encode(self, features):
+        """Row array for a FeatureRow or a plain {name: value} dict"""
+        if isinstance(features, FeatureRow):
+            return features.values
+        row = self.row()
+        row.update({name: value for name, value in features.items() if name in self.index})
+        return row.values
+
+    def positions(self, names):
+        """Column positions of names, e.g. the columns an older model artifact was trained on"""
+        return np.array([self.index[name] for name in names])
+
+    def frame(self, matrix):
+        return pd.DataFrame(matrix, columns=self.names)
+
+
+SCHEMA = FeatureSchema()
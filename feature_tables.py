@@ -0,0 +1,395 @@
+import os
+import json
+import math
+import logging
+from bisect import bisect_right
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+
+from instrumentation import timed
+from venues import VENUES, INDOOR_TEMP_F, normalize_team, air_density_ratio
+
+logger = logging.getLogger(__name__)
+
+# Precomputed lookup tables that features join against
+TABLE_DIR = os.path.join('data', 'tables')
+
+# Games of league-average data blended into each park's numbers so small samples stay near neutral
+PARK_REGRESSION_GAMES = 30
+
+PARK_COLUMNS = ['game_date', 'game_pk', 'home_team', 'post_home_score', 'post_away_score', 'events', 'type', 'launch_speed']
+
+# Per-day, per-venue sums the park factors are rolled up from
+PARK_SUMS = ['games', 'runs', 'pa', 'home_runs', 'batted', 'exit_velo_sum']
+
+NEUTRAL_PARK = {'park_run_factor': 1.0, 'park_hr_factor': 1.0, 'park_ev_adjustment': 0.0, 'park_games': 0}
+
+SPLIT_COLUMNS = ['game_date', 'home_team', 'away_team', 'inning_topbot', 'pitcher', 'p_throws', 'stand',
+                 'events', 'woba_value', 'woba_denom']
+
+# Plate appearances of league-average wOBA blended into each split
+TEAM_SPLIT_REGRESSION_PA = 100
+PITCHER_SPLIT_REGRESSION_PA = 50
+LEAGUE_WOBA = 0.315
+
+
+@timed('transform')
+def aggregate_park_days(statcast, full_names=None):
+    """Per-day, per-venue runs, home runs and exit-velocity sums from pitch data
+
+    Like the handedness aggregate these are additive, so park factors for any
+    cutoff date roll up from the stored daily rows.
+    """
+    df = statcast[[col for col in PARK_COLUMNS if col in statcast.columns]].copy()
+    codes = {code: normalize_team(code, full_names) for code in df['home_team'].dropna().unique()}
+    df['venue'] = df['home_team'].map(codes)
+    df['game_date'] = pd.to_datetime(df['game_date']).dt.strftime('%Y-%m-%d')
+    keys = ['game_date', 'venue']
+
+    # Runs per game: the last pitch's post-scores are the final score
+    games = df.groupby('game_pk').agg(game_date=('game_date', 'first'), venue=('venue', 'first'),
+                                      home=('post_home_score', 'max'), away=('post_away_score', 'max'))
+    games['runs'] = games['home'] + games['away']
+    daily = games.groupby(keys).agg(games=('runs', 'size'), runs=('runs', 'sum'))
+
+    # Home runs per plate appearance; a PA ends on the pitch that has an event
+    pas = df[df['events'].notna()]
+    daily['pa'] = pas.groupby(keys).size()
+    daily['home_runs'] = (pas['events'] == 'home_run').groupby([pas['game_date'], pas['venue']]).sum()
+
+    # Exit velocity on balls in play
+    batted = df[(df['type'] == 'X') & df['launch_speed'].notna()]
+    daily['batted'] = batted.groupby(keys).size()
+    daily['exit_velo_sum'] = batted.groupby(keys)['launch_speed'].sum()
+    return daily.fillna(0).reset_index()
+
+
+def park_factors(venue, league):
+    """Run, home run and exit-velocity factors from a venue's PARK_SUMS against the league's
+
+    Works on scalars for one venue or on column arrays for many; empty samples come out NaN.
+    """
+    games, runs, pa, home_runs, batted, exit_velo_sum = venue
+    league_games, league_runs, league_pa, league_home_runs, league_batted, league_exit_velo_sum = league
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weight = games / (games + PARK_REGRESSION_GAMES)
+        return {
+            'park_games': games,
+            'park_run_factor': weight * (runs / games) / (league_runs / league_games) + (1 - weight),
+            'park_hr_factor': weight * (home_runs / pa) / (league_home_runs / league_pa) + (1 - weight),
+            'park_ev_adjustment': weight * (exit_velo_sum / batted - league_exit_velo_sum / league_batted)
+        }
+
+
+def build_park_factors(daily):
+    """Per-venue run, home run and exit-velocity factors relative to the league, from daily park sums"""
+    venues = daily.groupby('venue')[PARK_SUMS].sum()
+    factors = park_factors(venues.to_numpy(dtype=float).T, venues.sum().to_numpy(dtype=float))
+    table = pd.DataFrame(factors, index=venues.index).fillna(NEUTRAL_PARK)
+    table['park_games'] = table['park_games'].astype(int)
+    return table[table.index.isin(VENUES)].round(4)
+
+
+class CumulativeSums:
+    """Running totals of additive daily sums per key, so the total through any as-of date is one bisect
+
+    Rows are stored key by key in date order, with each key's dates in a sorted
+    run; a lookup bisects that run instead of re-aggregating the days before it.
+    """
+
+    def __init__(self, daily, keys, sums):
+        self.sums = sums
+        self._rows = {}
+        self.dates, self.values = [], np.empty((0, len(sums)))
+        if daily is None or daily.empty:
+            return
+
+        totals = daily.groupby(keys + ['game_date'])[sums].sum().groupby(level=keys).cumsum()
+        # The groupby sorts by key, so each key's rows are one contiguous run
+        groups = totals.groupby(level=keys, sort=False).ngroup().to_numpy()
+        starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+        ends = np.r_[starts[1:], len(groups)]
+        index = totals.index.droplevel('game_date')
+        self._rows = dict(zip(index[starts], zip(starts.tolist(), ends.tolist())))
+        self.dates = totals.index.get_level_values('game_date').tolist()
+        self.values = totals.to_numpy(dtype=float)
+
+    def through(self, key, as_of=None):
+        """Summed values for key over the days through as_of (every day when None), or None without any"""
+        rows = self._rows.get(key)
+        if rows is None:
+            return None
+        start, end = rows
+        position = end if as_of is None else bisect_right(self.dates, as_of, start, end)
+        return self.values[position - 1] if position > start else None
+
+
+@timed('transform')
+def aggregate_handedness(statcast, full_names=None):
+    """Per-day wOBA sums for every (batting team, pitcher, pitcher hand, batter side) in one groupby
+
+    The sums are additive, so daily rows can be appended as new days arrive and
+    rolled up into any team or pitcher split without touching raw pitches again.
+    """
+    pas = statcast.loc[statcast['events'].notna(), [col for col in SPLIT_COLUMNS if col in statcast.columns]].copy()
+    if pas.empty:
+        return pd.DataFrame(columns=['game_date', 'batting_team', 'pitcher', 'p_throws', 'stand', 'pa', 'woba_value', 'woba_denom'])
+
+    batting = pas['home_team'].where(pas['inning_topbot'] == 'Bot', pas['away_team'])
+    codes = {code: normalize_team(code, full_names) for code in batting.dropna().unique()}
+    pas['batting_team'] = batting.map(codes)
+    pas['game_date'] = pd.to_datetime(pas['game_date']).dt.strftime('%Y-%m-%d')
+    pas['pa'] = 1
+
+    daily = pas.groupby(['game_date', 'batting_team', 'pitcher', 'p_throws', 'stand'], as_index=False)[
+        ['pa', 'woba_value', 'woba_denom']
+    ].sum()
+    return daily
+
+
+def _regressed_woba(woba_value, woba_denom, prior_pa, prior_woba=LEAGUE_WOBA):
+    return (woba_value + prior_pa * prior_woba) / (woba_denom + prior_pa)
+
+
+def climatology_temp_f(lat, day):
+    """Stand-in game-time temperature from latitude and date until a real forecast source is wired in
+
+    Warmer toward the equator, peaking in mid-July with a bigger seasonal swing further north.
+    """
+    day_of_year = day.timetuple().tm_yday
+    july_mean = 84.0 - 0.5 * (lat - 30.0)
+    seasonal_swing = 10.0 + 0.5 * (lat - 25.0)
+    return july_mean - seasonal_swing * (1 - math.cos(2 * math.pi * (day_of_year - 200) / 365.0)) / 2
+
+
+@timed('transform')
+def build_weather_table(year):
+    """Temperature, roof and air density for every venue and day of a season"""
+    rows = []
+    day = datetime(year, 3, 1)
+    while day <= datetime(year, 11, 30):
+        date_str = day.strftime('%Y-%m-%d')
+        for team, venue in VENUES.items():
+            # Retractable roofs are treated as closed; they usually are when it's hot or cold enough to matter
+            indoor = venue['roof'] != 'open'
+            temp_f = INDOOR_TEMP_F if indoor else climatology_temp_f(venue['lat'], day)
+            rows.append({
+                'team': team,
+                'game_date': date_str,
+                'park_temp_f': round(temp_f, 1),
+                'park_roof_closed': int(indoor),
+                'park_air_density': round(air_density_ratio(temp_f, venue['elevation_ft']), 4)
+            })
+        day += timedelta(days=1)
+    return pd.DataFrame(rows)
+
+
+class FeatureTables:
+    """Per-venue park factors, weather and handedness splits, loaded once into dicts for O(1) joins
+
+    Park and handedness data are stored as additive per-day sums and kept as
+    running totals, so a lookup for an as-of date sums only the days through it
+    and a past slate never sees games played after its cutoff.
+    """
+
+    def __init__(self, table_dir=TABLE_DIR):
+        self.table_dir = table_dir
+        self.park = {}
+        self.weather = {}
+        self._weather_years = set()
+
+        # Daily sums, and running totals over them for as-of lookups
+        self.park_daily = None
+        self.splits_daily = None
+        self._venue_sums = self._league_sums = None
+        self._team_vs_hand = self._team_pas = self._team_sides = None
+        self._pitcher_vs_side = self._pitcher_hands = None
+
+    @property
+    def park_path(self):
+        return os.path.join(self.table_dir, 'park_factors.csv')
+
+    @property
+    def park_daily_path(self):
+        return os.path.join(self.table_dir, 'park_daily.csv')
+
+    @property
+    def splits_path(self):
+        return os.path.join(self.table_dir, 'handedness_daily.csv')
+
+    def _weather_path(self, year):
+        return os.path.join(self.table_dir, f'weather-{year}.csv')
+
+    def _write_csv(self, df, path, index=False):
+        os.makedirs(self.table_dir, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        df.to_csv(tmp_path, index=index)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, table_dir=TABLE_DIR):
+        tables = cls(table_dir)
+        if os.path.exists(tables.park_daily_path):
+            tables._set_park_daily(pd.read_csv(tables.park_daily_path))
+        elif os.path.exists(tables.park_path):
+            # Factors built before daily sums were kept; replaced on the next refresh
+            tables.park = pd.read_csv(tables.park_path, index_col=0).to_dict('index')
+        if os.path.exists(tables.splits_path):
+            tables._set_splits_daily(pd.read_csv(tables.splits_path))
+        return tables
+
+    def _append_days(self, path, warehouse, columns, aggregate, full_names=None):
+        """Aggregate warehouse days not yet in a daily table and append them; returns (table, new days)"""
+        daily = pd.read_csv(path) if os.path.exists(path) else None
+        done = set(daily['game_date']) if daily is not None else set()
+        new_days = [day for day in warehouse.dates() if day not in done]
+
+        if new_days:
+            statcast = warehouse.load(new_days[0], new_days[-1], columns=columns)
+            if not statcast.empty:
+                statcast = statcast[pd.to_datetime(statcast['game_date']).dt.strftime('%Y-%m-%d').isin(new_days)]
+                fresh = aggregate(statcast, full_names)
+                daily = fresh if daily is None else pd.concat([daily, fresh], ignore_index=True)
+                self._write_csv(daily, path)
+        return daily, new_days
+
+    def refresh_park_factors(self, warehouse, full_names=None):
+        """Add warehouse days not yet in the daily park sums, then rebuild the park factors"""
+        daily, new_days = self._append_days(self.park_daily_path, warehouse, PARK_COLUMNS, aggregate_park_days, full_names)
+        if daily is None or (not new_days and self.park_daily is not None):
+            return False
+
+        self._set_park_daily(daily)
+        table = build_park_factors(daily)
+        self._write_csv(table, self.park_path, index=True)
+        with open(os.path.join(self.table_dir, 'park_factors.json'), 'w', encoding='utf-8') as f:
+            json.dump({'built_at': datetime.now().isoformat(), 'venues': len(table),
+                       'games': int(table['park_games'].sum())}, f, indent=2)
+        logger.info(f"🏟️ Park factors rebuilt for {len(table)} venues")
+        return True
+
+    def refresh_splits(self, warehouse, full_names=None):
+        """Aggregate warehouse days not yet in the handedness table, then roll the splits up"""
+        daily, new_days = self._append_days(self.splits_path, warehouse, SPLIT_COLUMNS, aggregate_handedness, full_names)
+        if daily is None or (not new_days and self.splits_daily is not None):
+            return False
+
+        self._set_splits_daily(daily)
+        logger.info(f"🤚 Handedness splits updated with {len(new_days)} new day(s)")
+        return True
+
+    def _set_park_daily(self, daily):
+        self.park_daily = daily
+        self._venue_sums = CumulativeSums(daily, ['venue'], PARK_SUMS)
+        self._league_sums = CumulativeSums(daily.assign(league='MLB'), ['league'], PARK_SUMS)
+        self.park = build_park_factors(daily).to_dict('index') if not daily.empty else {}
+
+    def _set_splits_daily(self, daily):
+        self.splits_daily = daily
+        self._team_vs_hand = CumulativeSums(daily, ['batting_team', 'p_throws'], ['woba_value', 'woba_denom'])
+        self._team_pas = CumulativeSums(daily, ['batting_team'], ['pa'])
+        self._team_sides = CumulativeSums(daily, ['batting_team', 'stand'], ['pa'])
+        self._pitcher_vs_side = CumulativeSums(daily, ['pitcher', 'stand'], ['woba_value', 'woba_denom'])
+        self._pitcher_hands = CumulativeSums(daily, ['pitcher', 'p_throws'], ['pa'])
+
+    def _park_through(self, venue, as_of):
+        """Park factors for a venue from the days through as_of"""
+        if self.park_daily is None or as_of is None:
+            return self.park.get(venue, NEUTRAL_PARK)
+
+        venue_sums = self._venue_sums.through(venue, as_of)
+        if venue not in VENUES or venue_sums is None:
+            return NEUTRAL_PARK
+        factors = park_factors(venue_sums, self._league_sums.through('MLB', as_of))
+        return {name: round(float(NEUTRAL_PARK[name] if np.isnan(value) else value), 4)
+                for name, value in factors.items()}
+
+    def _team_woba_vs(self, team, hand, as_of):
+        sums = self._team_vs_hand.through((team, hand), as_of) if self._team_vs_hand is not None else None
+        return None if sums is None else _regressed_woba(*sums, TEAM_SPLIT_REGRESSION_PA)
+
+    def _pitcher_woba_vs(self, pitcher_id, side, as_of):
+        sums = self._pitcher_vs_side.through((pitcher_id, side), as_of) if self._pitcher_vs_side is not None else None
+        return LEAGUE_WOBA if sums is None else _regressed_woba(*sums, PITCHER_SPLIT_REGRESSION_PA)
+
+    def _left_share(self, team, as_of):
+        """Share of a lineup's plate appearances taken from the left side"""
+        total = self._team_pas.through(team, as_of) if self._team_pas is not None else None
+        if total is None:
+            return 0.4
+        left = self._team_sides.through((team, 'L'), as_of)
+        return 0.0 if left is None else float(left[0] / total[0])
+
+    def _pitcher_hand(self, pitcher_id, as_of):
+        """The hand a pitcher has thrown the most plate appearances with"""
+        if self._pitcher_hands is None:
+            return None
+        pas = {hand: self._pitcher_hands.through((pitcher_id, hand), as_of) for hand in ('L', 'R')}
+        pas = {hand: total[0] for hand, total in pas.items() if total is not None}
+        return max(pas, key=lambda hand: (pas[hand], hand == 'L')) if pas else None
+
+    def handedness_features(self, home_team, away_team, home_pitcher_id=None, away_pitcher_id=None, as_of=None):
+        """Each offense against the opposing starter's hand, and each starter against the opposing lineup's mix"""
+
+        def offense_vs(team, pitcher_id):
+            hand = self._pitcher_hand(int(pitcher_id), as_of) if pitcher_id else None
+            if hand is None:
+                values = [self._team_woba_vs(team, h, as_of) for h in ('L', 'R')]
+                values = [v for v in values if v is not None]
+                return float(np.mean(values)) if values else LEAGUE_WOBA
+            woba = self._team_woba_vs(team, hand, as_of)
+            return float(LEAGUE_WOBA if woba is None else woba)
+
+        def pitcher_vs(pitcher_id, lineup_team):
+            left_share = self._left_share(lineup_team, as_of)
+            if not pitcher_id:
+                return LEAGUE_WOBA
+            vs_left = self._pitcher_woba_vs(int(pitcher_id), 'L', as_of)
+            vs_right = self._pitcher_woba_vs(int(pitcher_id), 'R', as_of)
+            return float(left_share * vs_left + (1 - left_share) * vs_right)
+
+        features = {
+            'home_offense_woba_vs_hand': offense_vs(home_team, away_pitcher_id),
+            'away_offense_woba_vs_hand': offense_vs(away_team, home_pitcher_id),
+            'home_pitcher_woba_vs_lineup': pitcher_vs(home_pitcher_id, away_team),
+            'away_pitcher_woba_vs_lineup': pitcher_vs(away_pitcher_id, home_team)
+        }
+        # Positive favors the home side: its bats vs their starter, minus their bats vs its starter
+        features['handedness_matchup_edge'] = (
+            features['home_offense_woba_vs_hand'] - features['away_offense_woba_vs_hand']
+            + features['away_pitcher_woba_vs_lineup'] - features['home_pitcher_woba_vs_lineup']
+        ) / 2
+        return features
+
+    def _load_weather(self, year):
+        path = self._weather_path(year)
+        if os.path.exists(path):
+            table = pd.read_csv(path)
+        else:
+            table = build_weather_table(year)
+            self._write_csv(table, path)
+
+        records = table.set_index(['team', 'game_date']).to_dict('index')
+        self.weather.update(records)
+        self._weather_years.add(year)
+
+    def venue_features(self, home_team, game_date, as_of=None):
+        """Park and weather features for a game at home_team's venue, with park factors through as_of"""
+        year = int(game_date[:4])
+        if year not in self._weather_years:
+            self._load_weather(year)
+
+        park = self._park_through(home_team, as_of)
+        weather = self.weather.get((home_team, game_date))
+        if weather is None:
+            venue = VENUES.get(home_team, {'roof': 'open', 'elevation_ft': 0})
+            weather = {'park_temp_f': INDOOR_TEMP_F, 'park_roof_closed': int(venue['roof'] != 'open'),
+                       'park_air_density': air_density_ratio(INDOOR_TEMP_F, venue['elevation_ft'])}
+
+        return {
+            'park_run_factor': float(park['park_run_factor']),
+            'park_hr_factor': float(park['park_hr_factor']),
+            'park_ev_adjustment': float(park['park_ev_adjustment']),
+            **{key: float(value) for key, value in weather.items()}
+        }
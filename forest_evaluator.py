@@ -0,0 +1,73 @@
+import numpy as np
+
+
+class CompiledForest:
+    """Fitted random forest flattened into node arrays and evaluated for every tree at once
+
+    All trees' nodes are concatenated into one set of arrays. Leaves point back
+    at themselves, so a batch walks down by gathering from the arrays once per
+    tree level, with no per-tree or per-call validation. Inputs are cast to
+    float32 and compared against the float64 thresholds as sklearn does, and
+    tree probabilities are summed in tree order, so the outputs match
+    predict_proba exactly.
+    """
+
+    def __init__(self, forest):
+        trees = [estimator.tree_ for estimator in forest.estimators_]
+        self.classes = np.asarray(forest.classes_)
+        self.n_features = forest.n_features_in_
+        self.n_trees = len(trees)
+        self.offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+        self.roots = self.offsets[:-1]
+        self.depth = max(tree.max_depth for tree in trees)
+
+        features, thresholds, lefts, rights, missing_left, values = [], [], [], [], [], []
+        for tree, offset in zip(trees, self.roots):
+            nodes = np.arange(tree.node_count)
+            leaf = tree.children_left < 0
+            features.append(np.where(leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            lefts.append(np.where(leaf, nodes, tree.children_left) + offset)
+            rights.append(np.where(leaf, nodes, tree.children_right) + offset)
+            missing_left.append(getattr(tree, 'missing_go_to_left', np.zeros(tree.node_count, dtype=np.uint8)))
+
+            # Class shares per node, normalized the way DecisionTreeClassifier.predict_proba does
+            value = tree.value[:, 0, :len(self.classes)]
+            normalizer = value.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            values.append(value / normalizer)
+
+        self.feature = np.concatenate(features).astype(np.int32)
+        self.threshold = np.concatenate(thresholds)
+        # Column 0 is the left child, column 1 the right, so a step indexes with the comparison result
+        self.children = np.stack([np.concatenate(lefts), np.concatenate(rights)], axis=1).astype(np.int32)
+        self.missing_left = np.concatenate(missing_left).astype(bool)
+        self.value = np.concatenate(values)
+
+    def apply(self, X):
+        """(rows x trees) global index of the leaf each row lands in"""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        flat = X.ravel()
+        row_starts = (np.arange(len(X)) * X.shape[1])[:, np.newaxis]
+        has_missing = np.isnan(flat).any()
+
+        nodes = np.broadcast_to(self.roots, (len(X), self.n_trees))
+        for _ in range(self.depth):
+            x = flat[row_starts + self.feature[nodes]]
+            go_right = x > self.threshold[nodes]
+            if has_missing:
+                go_right |= np.isnan(x) & ~self.missing_left[nodes]
+            nodes = self.children[nodes, go_right.view(np.uint8)]
+        return nodes
+
+    def predict(self, X):
+        """Predicted class and class probabilities for each row, from one walk of the forest"""
+        leaf_values = self.value[self.apply(X)]
+        proba = np.zeros((leaf_values.shape[0], leaf_values.shape[2]))
+        for tree in range(self.n_trees):
+            proba += leaf_values[:, tree]
+        proba /= self.n_trees
+        return self.classes[np.argmax(proba, axis=1)], proba
+
+    def predict_proba(self, X):
+        return self.predict(X)[1]
@@ -0,0 +1,330 @@
+import zlib
+import numpy as np
+import pandas as pd
+from scipy.linalg import solve_triangular
+
+from instrumentation import timed
+
+# Plate-appearance outcomes; 'productive_out' is an out on which every runner moves up a base
+PA_OUTCOMES = ('strikeout', 'walk', 'single', 'double', 'triple', 'home_run', 'out', 'productive_out')
+
+# League-average rates per plate appearance (walk includes HBP)
+LEAGUE_PA_RATES = {
+    'strikeout': 0.224, 'walk': 0.089, 'single': 0.143, 'double': 0.044,
+    'triple': 0.004, 'home_run': 0.031
+}
+PRODUCTIVE_OUT_SHARE = 0.25
+
+# League references for the Statcast inputs, in the units the predictor produces them
+LEAGUE_BATTING = {'xba': 0.320, 'xslg': 0.510}                        # per batted ball
+LEAGUE_STARTER = {'whiff_rate': 0.25, 'zone_rate': 0.50,                # per swing / per pitch
+                  'avg_exit_velo_against': 88.0, 'barrel_rate_against': 0.08}
+LEAGUE_STAFF = {'whiff_rate': 11.0, 'strike_rate': 48.0, 'xera': 0.320}  # team pitching, percent / per batted ball
+
+# Half-inning runs are tracked exactly up to MAX_RUNS - 1; the last bucket means "MAX_RUNS or more"
+MAX_RUNS = 16
+EXTRA_INNINGS_LIMIT = 10
+PITCHES_PER_INNING = 16.0
+DEFAULT_STARTER_INNINGS = 5
+
+FACTOR_BOUNDS = (0.5, 2.0)
+
+
+def _stat(stats, key, default):
+    """stats[key], or the league default when it's missing or NaN"""
+    value = stats.get(key) if stats else None
+    return default if value is None or pd.isna(value) else float(value)
+
+
+def _ratio(stats, key, reference):
+    """stats[key] / reference, or 1.0 when the value is missing"""
+    value = stats.get(key) if stats else None
+    if value is None or pd.isna(value) or not value:
+        return 1.0
+    return float(np.clip(value / reference, *FACTOR_BOUNDS))
+
+
+def _offense_factors(batting_stats):
+    hit = _ratio(batting_stats, 'xba', LEAGUE_BATTING['xba'])
+    slg = _ratio(batting_stats, 'xslg', LEAGUE_BATTING['xslg'])
+    # Power is slugging beyond what the hit rate alone explains
+    return {'hit': hit, 'power': float(np.clip(slg / hit, *FACTOR_BOUNDS))}
+
+
+def _starter_factors(pitcher_stats):
+    ball_rate = 1 - _stat(pitcher_stats, 'zone_rate', LEAGUE_STARTER['zone_rate'])
+    exit_velo = _stat(pitcher_stats, 'avg_exit_velo_against', LEAGUE_STARTER['avg_exit_velo_against'])
+    return {
+        'strikeout': _ratio(pitcher_stats, 'whiff_rate', LEAGUE_STARTER['whiff_rate']),
+        'walk': float(np.clip(ball_rate / (1 - LEAGUE_STARTER['zone_rate']), *FACTOR_BOUNDS)),
+        'hit': float(np.clip(1 + 0.03 * (exit_velo - LEAGUE_STARTER['avg_exit_velo_against']), *FACTOR_BOUNDS)),
+        'power': _ratio(pitcher_stats, 'barrel_rate_against', LEAGUE_STARTER['barrel_rate_against'])
+    }
+
+
+def _staff_factors(team_stats):
+    """Relief factors from a team's pitching Statcast (get_team_statcast_data)"""
+    ball_rate = 100 - _stat(team_stats, 'strike_rate', LEAGUE_STAFF['strike_rate'])
+    return {
+        'strikeout': _ratio(team_stats, 'whiff_rate', LEAGUE_STAFF['whiff_rate']),
+        'walk': float(np.clip(ball_rate / (100 - LEAGUE_STAFF['strike_rate']), *FACTOR_BOUNDS)),
+        'hit': _ratio(team_stats, 'xera', LEAGUE_STAFF['xera']),
+        'power': 1.0
+    }
+
+
+def pa_outcome_probabilities(batting_stats, pitching_factors):
+    """Per-PA outcome probabilities (ordered as PA_OUTCOMES) for an offense against a pitcher"""
+    offense = _offense_factors(batting_stats)
+    rates = {
+        'strikeout': LEAGUE_PA_RATES['strikeout'] * pitching_factors['strikeout'],
+        'walk': LEAGUE_PA_RATES['walk'] * pitching_factors['walk'],
+        'single': LEAGUE_PA_RATES['single'] * offense['hit'] * pitching_factors['hit'],
+        'double': LEAGUE_PA_RATES['double'] * offense['hit'] * offense['power'] * pitching_factors['hit'],
+        'triple': LEAGUE_PA_RATES['triple'] * offense['hit'] * pitching_factors['hit'],
+        'home_run': LEAGUE_PA_RATES['home_run'] * offense['power'] * pitching_factors['power']
+    }
+
+    probs = np.array([rates[name] for name in PA_OUTCOMES[:6]])
+    # Anything non-finite that got past the input fallbacks would poison the whole Markov chain
+    if not np.isfinite(probs).all():
+        probs = np.array([LEAGUE_PA_RATES[name] for name in PA_OUTCOMES[:6]])
+    # Keep at least half of PAs as outs so extreme inputs can't produce endless innings
+    on_base = probs[1:].sum()
+    if on_base > 0.5:
+        probs[1:] *= 0.5 / on_base
+    probs[0] = min(probs[0], 1 - probs[1:].sum() - 0.1)
+
+    in_play_outs = 1 - probs.sum()
+    return np.concatenate([probs, [in_play_outs * (1 - PRODUCTIVE_OUT_SHARE), in_play_outs * PRODUCTIVE_OUT_SHARE]])
+
+
+def _transition_tables():
+    """(new_bases, runs, outs_added) for every outcome and base state (bit 0 = first base)"""
+    tables = []
+    for outcome in PA_OUTCOMES:
+        new_bases, runs = np.zeros(8, dtype=int), np.zeros(8, dtype=int)
+        for bases in range(8):
+            on = [bool(bases & 1), bool(bases & 2), bool(bases & 4)]
+            if outcome in ('strikeout', 'out'):
+                new_bases[bases] = bases
+            elif outcome == 'productive_out':
+                runs[bases] = int(on[2])
+                new_bases[bases] = (bases << 1) & 7
+            elif outcome == 'walk':
+                forced = on[0] and on[1] and on[2]
+                runs[bases] = int(forced)
+                if not on[0]:
+                    new_bases[bases] = bases | 1
+                elif not on[1]:
+                    new_bases[bases] = bases | 3
+                else:
+                    new_bases[bases] = 7
+            elif outcome == 'single':
+                runs[bases] = int(on[1]) + int(on[2])
+                new_bases[bases] = 1 | (2 if on[0] else 0)
+            elif outcome == 'double':
+                runs[bases] = int(on[1]) + int(on[2])
+                new_bases[bases] = 2 | (4 if on[0] else 0)
+            elif outcome == 'triple':
+                runs[bases] = sum(on)
+                new_bases[bases] = 4
+            elif outcome == 'home_run':
+                runs[bases] = sum(on) + 1
+                new_bases[bases] = 0
+        outs_added = 1 if outcome in ('strikeout', 'out', 'productive_out') else 0
+        tables.append((new_bases, runs, outs_added))
+    return tables
+
+
+_TABLES = _transition_tables()
+
+# Transient states are (outs, runs so far, bases) with runs < MAX_RUNS. Ordered this way
+# every transition moves strictly forward, so I - Q is unit upper triangular.
+_OUTS, _RUNS, _BASES = [a.ravel() for a in np.meshgrid(np.arange(3), np.arange(MAX_RUNS), np.arange(8), indexing='ij')]
+_N_TRANSIENT = len(_OUTS)
+
+
+def _state_index(outs, runs, bases):
+    return (outs * MAX_RUNS + runs) * 8 + bases
+
+
+def half_inning_run_distributions(pa_probs):
+    """Exact run distribution of a half inning from the standard and ghost-runner start states
+
+    Solves the absorbing base-out Markov chain; returns (bases empty, runner on second)
+    probability vectors over 0..MAX_RUNS runs.
+    """
+    q = np.zeros((_N_TRANSIENT, _N_TRANSIENT))
+    absorb = np.zeros((_N_TRANSIENT, MAX_RUNS + 1))
+
+    for p, (new_bases, runs, outs_added) in zip(pa_probs, _TABLES):
+        new_outs = _OUTS + outs_added
+        new_runs = _RUNS + np.where(new_outs < 3, runs[_BASES], 0)
+
+        # The third out ends the inning; so does reaching the run cap
+        ended = (new_outs >= 3) | (new_runs >= MAX_RUNS)
+        rows = np.flatnonzero(ended)
+        np.add.at(absorb, (rows, np.minimum(new_runs[rows], MAX_RUNS)), p)
+
+        rows = np.flatnonzero(~ended)
+        cols = _state_index(new_outs[rows], new_runs[rows], new_bases[_BASES[rows]])
+        np.add.at(q, (rows, cols), p)
+
+    outcome = solve_triangular(np.eye(_N_TRANSIENT) - q, absorb, unit_diagonal=True)
+    standard, ghost = outcome[_state_index(0, 0, 0)], outcome[_state_index(0, 0, 2)]
+    return standard / standard.sum(), ghost / ghost.sum()
+
+
+def starter_innings(pitcher_stats):
+    """Innings a starter is expected to cover, from his recent pitch counts"""
+    total_pitches, recent_games = _stat(pitcher_stats, 'total_pitches', 0), _stat(pitcher_stats, 'recent_games', 0)
+    if not total_pitches or not recent_games:
+        return DEFAULT_STARTER_INNINGS
+    per_start = total_pitches / recent_games
+    return int(np.clip(round(per_start / PITCHES_PER_INNING), 3, 7))
+
+
+def _sample(cdf, u):
+    return np.minimum(np.searchsorted(cdf, u, side='right'), MAX_RUNS)
+
+
+class GameSimulator:
+    """Monte Carlo game simulator driven by per-PA outcome probabilities
+
+    Each half inning's runs are drawn from an exact Markov-chain distribution,
+    so a simulated game is just 18+ vectorized draws across all simulations.
+    """
+
+    def __init__(self, n_sims=20000, seed=42):
+        self.n_sims = n_sims
+        self.seed = seed
+
+    def _rng(self, key):
+        # Seeded per matchup so reruns publish the same numbers
+        return np.random.default_rng([self.seed, zlib.crc32(key.encode('utf-8'))])
+
+    def _offense_distributions(self, batting_stats, starter_stats, staff_stats):
+        starter = half_inning_run_distributions(pa_outcome_probabilities(batting_stats, _starter_factors(starter_stats)))[0]
+        bullpen, bullpen_ghost = half_inning_run_distributions(pa_outcome_probabilities(batting_stats, _staff_factors(staff_stats)))
+        return np.cumsum(starter), np.cumsum(bullpen), np.cumsum(bullpen_ghost)
+
+    def _regulation_runs(self, rng, cdfs, starter_innings_count):
+        starter_cdf, bullpen_cdf, _ = cdfs
+        u = rng.random((self.n_sims, 9))
+        runs = np.empty((self.n_sims, 9), dtype=np.int64)
+        runs[:, :starter_innings_count] = _sample(starter_cdf, u[:, :starter_innings_count])
+        runs[:, starter_innings_count:] = _sample(bullpen_cdf, u[:, starter_innings_count:])
+        return runs
+
+    @timed('simulate')
+    def simulate(self, home_batting, away_batting, home_pitcher, away_pitcher,
+                 home_staff=None, away_staff=None, key='', run_line=1.5):
+        """Simulate one game; *_batting/*_staff are team Statcast dicts, *_pitcher starter stats"""
+        rng = self._rng(key)
+        home_staff = home_batting if home_staff is None else home_staff
+        away_staff = away_batting if away_staff is None else away_staff
+
+        home_cdfs = self._offense_distributions(home_batting, away_pitcher, away_staff)
+        away_cdfs = self._offense_distributions(away_batting, home_pitcher, home_staff)
+
+        away_innings = self._regulation_runs(rng, away_cdfs, starter_innings(home_pitcher))
+        home_innings = self._regulation_runs(rng, home_cdfs, starter_innings(away_pitcher))
+
+        away = away_innings.sum(axis=1)
+        home = home_innings[:, :8].sum(axis=1)
+
+        # Bottom of the ninth: skipped if home already leads, ends on a walk-off otherwise
+        ninth = home_innings[:, 8]
+        deficit = away - home
+        ninth = np.where(deficit < 0, 0, np.where(ninth > deficit, np.minimum(ninth, deficit + 1), ninth))
+        home = home + ninth
+
+        # Extra innings start with a runner on second and are played by the bullpens
+        tied = np.flatnonzero(home == away)
+        for _ in range(EXTRA_INNINGS_LIMIT):
+            if not len(tied):
+                break
+            top = _sample(away_cdfs[2], rng.random(len(tied)))
+            bottom = _sample(home_cdfs[2], rng.random(len(tied)))
+            deficit = top
+            bottom = np.where(bottom > deficit, np.minimum(bottom, deficit + 1), bottom)
+            away[tied] += top
+            home[tied] += bottom
+            tied = tied[home[tied] == away[tied]]
+
+        # Anything still level after the limit is settled by a coin flip
+        if len(tied):
+            home_wins_tie = rng.random(len(tied)) < 0.5
+            home[tied[home_wins_tie]] += 1
+            away[tied[~home_wins_tie]] += 1
+
+        return simulation_summary(home, away, run_line)
+
+    def simulate_slate(self, games, run_line=1.5):
+        """Simulate a list of simulate() keyword dicts; returns results in the same order"""
+        return [self.simulate(run_line=run_line, **game) for game in games]
+
+
+def simulation_summary(home_runs, away_runs, run_line=1.5):
+    """Win probability, run distributions and run-line cover from simulated final scores"""
+    totals = home_runs + away_runs
+    margin = home_runs - away_runs
+
+    total_pmf = np.bincount(totals) / len(totals)
+    margins, margin_counts = np.unique(margin, return_counts=True)
+
+    return {
+        'home_win_probability': float((margin > 0).mean()),
+        'away_win_probability': float((margin < 0).mean()),
+        'expected_home_runs': float(home_runs.mean()),
+        'expected_away_runs': float(away_runs.mean()),
+        'expected_total_runs': float(totals.mean()),
+        'total_runs_pmf': [round(float(p), 5) for p in total_pmf],
+        'margin_pmf': {int(m): round(float(c) / len(margin), 5) for m, c in zip(margins, margin_counts)},
+        'home_run_line_cover': float((margin > run_line).mean()),
+        'away_run_line_cover': float((margin < run_line).mean()),
+        'simulations': int(len(totals))
+    }
+
+
+def _pmf_matrix(pmfs):
+    """Stack per-game {value: p} or list pmfs into one (games, values) matrix plus its first value"""
+    dicts = [dict(enumerate(pmf)) if isinstance(pmf, list) else {int(k): v for k, v in pmf.items()} for pmf in pmfs]
+    low = min(min(d) for d in dicts)
+    high = max(max(d) for d in dicts)
+    matrix = np.zeros((len(dicts), high - low + 1))
+    for row, d in enumerate(dicts):
+        matrix[row, [k - low for k in d]] = list(d.values())
+    return matrix, low
+
+
+def _beyond_line(pmfs, lines):
+    """P(value > line) and P(value == line) for each game's pmf and line, vectorized"""
+    matrix, low = _pmf_matrix(pmfs)
+    lines = np.asarray(lines, dtype=float)
+    rows = np.arange(len(matrix))
+
+    # Index of the largest value <= line, clipped to the pmf's support
+    idx = np.floor(lines).astype(int) - low
+    at_or_below = np.where(idx < 0, 0.0, np.cumsum(matrix, axis=1)[rows, np.clip(idx, 0, matrix.shape[1] - 1)])
+    at_or_below = np.where(idx >= matrix.shape[1], 1.0, at_or_below)
+
+    on_line = lines == np.floor(lines)
+    push = np.where(on_line & (idx >= 0) & (idx < matrix.shape[1]), matrix[rows, np.clip(idx, 0, matrix.shape[1] - 1)], 0.0)
+    return 1 - at_or_below, push
+
+
+def over_probabilities(total_pmfs, lines):
+    """Model P(over) per game with pushes excluded, comparable to no-vig market prices"""
+    over, push = _beyond_line(total_pmfs, lines)
+    under = 1 - over - push
+    return over / np.maximum(over + under, 1e-12)
+
+
+def cover_probabilities(margin_pmfs, home_spreads):
+    """Model P(home covers) per game, e.g. home_spread=-1.5 needs a win by 2+; pushes excluded"""
+    spreads = np.asarray(home_spreads, dtype=float)
+    covers, push = _beyond_line(margin_pmfs, -spreads)
+    fails = 1 - covers - push
+    return covers / np.maximum(covers + fails, 1e-12)
@@ -1,14 +1,46 @@
 import os
+import re
 import json
-from datetime import datetime, timedelta
+import logging
+import argparse
+from datetime import datetime
 import pandas as pd
 import numpy as np
-from jinja2 import Template
-import tweepy
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
 import requests
 
 # Import your existing predictor
-from baseball_predictor import BaseballSavantPredictor
+from baseball_predictor import BaseballSavantPredictor, MARKET_FIELDS
+from slate_state import SlateState, game_key
+from predictions_feed import write_predictions_feed
+from grading import grade_pending, latest_performance
+from twitter_poster import TweetEndpoint, ThreadPostingQueue, pending_threads
+import instrumentation
+from instrumentation import timed, run_profiled
+from log_config import configure_logging
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+TEMPLATE_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.jinja_cache')
+
+_template_env = None
+
+def get_template_env():
+    """Shared Jinja environment; templates compile once and the bytecode is cached on disk"""
+    global _template_env
+    if _template_env is None:
+        os.makedirs(TEMPLATE_CACHE_DIR, exist_ok=True)
+        _template_env = Environment(
+            loader=FileSystemLoader(TEMPLATE_DIR),
+            bytecode_cache=FileSystemBytecodeCache(TEMPLATE_CACHE_DIR),
+            auto_reload=False,
+            trim_blocks=True,
+            lstrip_blocks=True,
+            keep_trailing_newline=True
+        )
+        _template_env.globals['game_key'] = game_key
+    return _template_env
 
 class GitHubTwitterAutomation:
     def __init__(self):
@@ -20,6 +52,11 @@ class GitHubTwitterAutomation:
         self.twitter_access_token = os.getenv('TWITTER_ACCESS_TOKEN')
         self.twitter_access_token_secret = os.getenv('TWITTER_ACCESS_TOKEN_SECRET')
         
+        # Longest the job waits on Twitter rate limits before leaving the rest for the next run
+        self.twitter_max_wait = int(os.getenv('TWITTER_MAX_WAIT', 15 * 60))
+        # thread key -> queue finishing a thread an earlier run left half-posted
+        self.resumed_threads = {}
+        
         self.predictor = BaseballSavantPredictor(self.odds_api_key)
         
         # Initialize Twitter API
@@ -28,342 +65,56 @@ class GitHubTwitterAutomation:
     def setup_twitter(self):
         """Setup Twitter API v2 client"""
         try:
-            self.twitter_client = tweepy.Client(
-                bearer_token=self.twitter_bearer_token,
+            self.twitter_client = TweetEndpoint(
                 consumer_key=self.twitter_api_key,
                 consumer_secret=self.twitter_api_secret,
                 access_token=self.twitter_access_token,
-                access_token_secret=self.twitter_access_token_secret,
-                wait_on_rate_limit=True
+                access_token_secret=self.twitter_access_token_secret
             )
-            print("✅ Twitter API initialized")
+            logger.info("✅ Twitter API initialized")
         except Exception as e:
-            print(f"❌ Twitter setup failed: {e}")
+            logger.error(f"❌ Twitter setup failed: {e}")
             self.twitter_client = None
     
-    def generate_predictions(self):
-        """Generate today's predictions"""
-        print("🤖 Generating MLB predictions...")
+    def prepare_model(self):
+        """Refresh the feature tables, then train the model and persist it for the prediction server"""
+        # Pull new Statcast days into the warehouse and rebuild the lookup tables
+        self.predictor.refresh_feature_tables()
         
-        # Train model
         self.predictor.train_model()
+        self.predictor.save_model()
+    
+    @timed('pipeline')
+    def generate_predictions(self, game_date=None, slate=None, train=True):
+        """Generate predictions for a slate (tomorrow, or the day after the as-of date, by default)"""
+        game_date = game_date or self.predictor.default_game_date()
+        logger.info(f"🤖 Generating MLB predictions for {game_date}...")
+        
+        if train:
+            self.prepare_model()
         
         # Get predictions vs odds
-        comparisons = self.predictor.compare_predictions_with_odds()
+        comparisons = self.predictor.compare_predictions_with_odds(game_date, slate)
         
         return {
             'predictions': comparisons,
             'generated_at': datetime.now(),
-            'game_date': (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d')
+            'game_date': game_date
         }
     
-    def create_github_pages_content(self, data):
-        """Create beautiful GitHub Pages content"""
-        
-        # Get game date for display
-        game_date = datetime.strptime(data['game_date'], '%Y-%m-%d')
-        game_date_formatted = game_date.strftime('%B %d, %Y')
-        
-        # HTML template with modern styling
-        html_template = Template("""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>⚾ MLB Predictions - {{ game_date_formatted }}</title>
-    <meta name="description" content="AI-powered MLB predictions using Statcast data for {{ game_date_formatted }}">
-    
-    <!-- Open Graph for social sharing -->
-    <meta property="og:title" content="MLB Predictions - {{ game_date_formatted }}">
-    <meta property="og:description" content="AI predictions for {{ total_games }} MLB games using Statcast data">
-    <meta property="og:type" content="article">
-    
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-        }
-        
-        .container {
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-        }
-        
-        .header {
-            background: rgba(255,255,255,0.95);
-            backdrop-filter: blur(10px);
-            border-radius: 20px;
-            padding: 30px;
-            margin-bottom: 30px;
-            text-align: center;
-            box-shadow: 0 20px 40px rgba(0,0,0,0.1);
-        }
-        
-        .header h1 {
-            font-size: 2.5em;
-            margin-bottom: 10px;
-            background: linear-gradient(45deg, #ff6b6b, #4ecdc4);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-        }
-        
-        .header .subtitle {
-            color: #666;
-            font-size: 1.1em;
-        }
-        
-        .summary-cards {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-            gap: 20px;
-            margin-bottom: 30px;
-        }
-        
-        .card {
-            background: rgba(255,255,255,0.95);
-            backdrop-filter: blur(10px);
-            border-radius: 15px;
-            padding: 25px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.1);
-            border: 1px solid rgba(255,255,255,0.2);
-        }
-        
-        .card h3 {
-            color: #2c3e50;
-            margin-bottom: 15px;
-            font-size: 1.2em;
-        }
-        
-        .stat-number {
-            font-size: 2.2em;
-            font-weight: bold;
-            color: #3498db;
-            margin-bottom: 5px;
-        }
-        
-        .value-bet {
-            background: linear-gradient(135deg, #ff9a9e 0%, #fecfef 100%);
-            border-left: 5px solid #ff6b6b;
-            margin-bottom: 20px;
-            border-radius: 10px;
-            overflow: hidden;
-        }
-        
-        .value-bet-header {
-            background: rgba(255,255,255,0.2);
-            padding: 15px 20px;
-            font-weight: bold;
-            font-size: 1.1em;
-        }
-        
-        .value-bet-content {
-            padding: 20px;
-        }
-        
-        .value-indicator {
-            display: inline-block;
-            background: #ff6b6b;
-            color: white;
-            padding: 5px 15px;
-            border-radius: 20px;
-            font-weight: bold;
-            margin-top: 10px;
-        }
-        
-        .prediction-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-            gap: 20px;
-        }
-        
-        .game-card {
-            background: rgba(255,255,255,0.95);
-            border-radius: 15px;
-            padding: 20px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.1);
-            transition: transform 0.3s ease;
-        }
-        
-        .game-card:hover {
-            transform: translateY(-5px);
-        }
-        
-        .game-header {
-            font-size: 1.3em;
-            font-weight: bold;
-            margin-bottom: 15px;
-            text-align: center;
-            color: #2c3e50;
-        }
-        
-        .pitchers {
-            background: #f8f9fa;
-            padding: 10px;
-            border-radius: 8px;
-            margin-bottom: 15px;
-            text-align: center;
-            font-style: italic;
-        }
-        
-        .prediction {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 10px;
-        }
-        
-        .confidence {
-            background: #28a745;
-            color: white;
-            padding: 5px 12px;
-            border-radius: 20px;
-            font-weight: bold;
-        }
-        
-        .agreement {
-            text-align: center;
-            margin-top: 15px;
-            padding: 8px;
-            border-radius: 8px;
-        }
-        
-        .agreement.agree {
-            background: #d4edda;
-            color: #155724;
-        }
-        
-        .agreement.disagree {
-            background: #f8d7da;
-            color: #721c24;
-        }
-        
-        .footer {
-            text-align: center;
-            margin-top: 40px;
-            padding: 20px;
-            color: rgba(255,255,255,0.8);
-        }
-        
-        .footer a {
-            color: rgba(255,255,255,0.9);
-            text-decoration: none;
-        }
-        
-        @media (max-width: 768px) {
-            .header h1 { font-size: 2em; }
-            .container { padding: 10px; }
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <header class="header">
-            <h1>⚾ MLB Predictions</h1>
-            <p class="subtitle">{{ game_date_formatted }} • AI-Powered Statcast Analysis</p>
-        </header>
-        
-        <div class="summary-cards">
-            <div class="card">
-                <h3>📊 Games Analyzed</h3>
-                <div class="stat-number">{{ total_games }}</div>
-                <p>With betting odds</p>
-            </div>
-            
-            <div class="card">
-                <h3>🎯 Avg Confidence</h3>
-                <div class="stat-number">{{ "%.0f"|format(avg_confidence) }}%</div>
-                <p>Model certainty</p>
-            </div>
-            
-            <div class="card">
-                <h3>🤝 Agreement</h3>
-                <div class="stat-number">{{ agreement_pct }}%</div>
-                <p>With Vegas odds</p>
-            </div>
-        </div>
-        
-        {% if value_bets %}
-        <section class="card">
-            <h3>💰 Top Value Opportunities</h3>
-            <p style="margin-bottom: 20px;">Where our model significantly disagrees with the market:</p>
-            
-            {% for bet in value_bets %}
-            <div class="value-bet">
-                <div class="value-bet-header">
-                    {{ bet.game }}
-                </div>
-                <div class="value-bet-content">
-                    <strong>{{ bet.team }}</strong> {{ bet.odds if bet.odds > 0 else bet.odds }}
-                    <br>
-                    Model: {{ "%.1f"|format(bet.model_prob) }}% | Market: {{ "%.1f"|format(bet.market_prob) }}%
-                    <span class="value-indicator">{{ "+%.1f"|format(bet.value) if bet.value > 0 else "%.1f"|format(bet.value) }}% Value</span>
-                </div>
-            </div>
-            {% endfor %}
-        </section>
-        {% endif %}
-        
-        <section class="card">
-            <h3>🎯 All Predictions</h3>
-            <div class="prediction-grid">
-                {% for pred in predictions %}
-                <div class="game-card">
-                    <div class="game-header">{{ pred.game }}</div>
-                    
-                    {% if pred.home_pitcher and pred.away_pitcher and pred.home_pitcher != 'TBD' %}
-                    <div class="pitchers">
-                        {{ pred.away_pitcher }} vs {{ pred.home_pitcher }}
-                    </div>
-                    {% endif %}
-                    
-                    <div class="prediction">
-                        <strong>Pick: {{ pred.predicted_winner }}</strong>
-                        <span class="confidence">{{ "%.0f"|format(pred.confidence * 100) }}%</span>
-                    </div>
-                    
-                    <div style="font-size: 0.9em; color: #666;">
-                        Model: {{ pred.home_team }} {{ "%.0f"|format(pred.model_home_prob * 100) }}% | 
-                        {{ pred.away_team }} {{ "%.0f"|format(pred.model_away_prob * 100) }}%
-                    </div>
-                    
-                    <div class="agreement {{ 'agree' if pred.agreement else 'disagree' }}">
-                        {% if pred.agreement %}
-                        ✅ Agrees with Vegas ({{ pred.odds_favorite }} favored)
-                        {% else %}
-                        ❌ Disagrees with Vegas ({{ pred.odds_favorite }} favored)
-                        {% endif %}
-                    </div>
-                </div>
-                {% endfor %}
-            </div>
-        </section>
-        
-        <footer class="footer">
-            <p>Generated at {{ generated_at.strftime('%I:%M %p ET') }} using Statcast data & machine learning</p>
-            <p><small>Not gambling advice • <a href="https://github.com/davisgrininger/mlb-predictions">View source code</a></small></p>
-        </footer>
-    </div>
-</body>
-</html>
-        """)
-        
-        # Calculate summary stats
-        total_games = len(data['predictions'])
+    def _summary_context(self, predictions):
+        """Summary stats and top value bets shown at the top of the page"""
+        # Calculate summary stats; agreement and value only count games with odds
+        total_games = len(predictions)
+        priced = [p for p in predictions if p.get('agreement') is not None]
         if total_games > 0:
-            agreements = sum(1 for p in data['predictions'] if p['agreement'])
-            agreement_pct = round(agreements / total_games * 100)
-            avg_confidence = np.mean([max(p['model_home_prob'], p['model_away_prob']) for p in data['predictions']]) * 100
+            agreements = sum(1 for p in priced if p['agreement'])
+            agreement_pct = round(agreements / len(priced) * 100) if priced else 0
+            avg_confidence = np.mean([max(p['model_home_prob'], p['model_away_prob']) for p in predictions]) * 100
             
             # Find value bets
             value_bets = []
-            for pred in data['predictions']:
+            for pred in priced:
                 home_diff = pred['prob_diff_home']
                 away_diff = pred['prob_diff_away']
                 
@@ -395,18 +146,45 @@ class GitHubTwitterAutomation:
             avg_confidence = 0
             value_bets = []
         
+        return {
+            'total_games': total_games,
+            'games_with_odds': len(priced),
+            'agreement_pct': agreement_pct,
+            'avg_confidence': avg_confidence,
+            'value_bets': value_bets
+        }
+    
+    def render_summary(self, predictions):
+        """Render the summary cards and value bets block"""
+        return get_template_env().get_template('summary.html').render(**self._summary_context(predictions))
+    
+    def render_game_card(self, pred):
+        """Render one game's prediction card"""
+        return get_template_env().get_template('game_card.html').render(pred=pred)
+    
+    @timed('render')
+    def create_github_pages_content(self, data):
+        """Create beautiful GitHub Pages content"""
+        
+        # Get game date for display
+        game_date = datetime.strptime(data['game_date'], '%Y-%m-%d')
+        game_date_formatted = game_date.strftime('%B %d, %Y')
+        
+        # HTML template with modern styling (shared stylesheet lives in docs/static)
+        html_template = get_template_env().get_template('predictions.html')
+        
         content = html_template.render(
             predictions=data['predictions'],
             generated_at=data['generated_at'],
+            game_date=data['game_date'],
             game_date_formatted=game_date_formatted,
-            total_games=total_games,
-            agreement_pct=agreement_pct,
-            avg_confidence=avg_confidence,
-            value_bets=value_bets
+            performance=data.get('performance'),
+            **self._summary_context(data['predictions'])
         )
         
         return content
     
+    @timed('render')
     def create_twitter_thread(self, data):
         """Create beautiful Twitter thread"""
         
@@ -418,10 +196,11 @@ class GitHubTwitterAutomation:
         
         tweets = []
         
-        # Main tweet with summary
+        # Main tweet with summary; market comparisons only cover games with odds
         total_games = len(data['predictions'])
-        agreements = sum(1 for p in data['predictions'] if p['agreement'])
-        agreement_pct = round(agreements / total_games * 100)
+        priced = [p for p in data['predictions'] if p.get('agreement') is not None]
+        agreements = sum(1 for p in priced if p['agreement'])
+        agreement_pct = round(agreements / len(priced) * 100) if priced else 0
         avg_confidence = np.mean([max(p['model_home_prob'], p['model_away_prob']) for p in data['predictions']]) * 100
         
         main_tweet = f"""🤖⚾ MLB PREDICTIONS - {game_date_formatted}
@@ -441,20 +220,20 @@ AI vs The House 👇 🧵"""
         for i, pick in enumerate(best_picks, 1):
             confidence = max(pick['model_home_prob'], pick['model_away_prob']) * 100
             winner = pick['predicted_winner']
-            agreement_emoji = "✅" if pick['agreement'] else "🚨"
+            agreement_emoji = "" if pick.get('agreement') is None else "✅" if pick['agreement'] else "🚨"
             
             # Get pitcher info if available
             pitcher_info = ""
             if pick.get('home_pitcher') and pick.get('away_pitcher') and pick['home_pitcher'] != 'TBD':
                 pitcher_info = f"\n🥎 {pick['away_pitcher']} vs {pick['home_pitcher']}"
             
-            picks_tweet += f"{i}. {pick['game']}{pitcher_info}\n📈 {winner} ({confidence:.0f}%) {agreement_emoji}\n\n"
+            picks_tweet += f"{i}. {pick['game']}{pitcher_info}\n📈 {winner} ({confidence:.0f}%) {agreement_emoji}".rstrip() + "\n\n"
         
         tweets.append(picks_tweet.strip())
         
         # Value bets
         value_bets = []
-        for pred in data['predictions']:
+        for pred in priced:
             home_diff = pred['prob_diff_home']
             away_diff = pred['prob_diff_away']
             
@@ -483,7 +262,7 @@ AI vs The House 👇 🧵"""
         
         # Upset alerts
         upset_alerts = []
-        for pred in data['predictions']:
+        for pred in priced:
             # Find underdogs with >40% chance
             if pred['odds_home_prob'] < pred['odds_away_prob']:  # Home is underdog
                 if pred['model_home_prob'] > 0.4:
@@ -521,80 +300,312 @@ AI vs The House 👇 🧵"""
         
         return tweets
     
-    def post_twitter_thread(self, tweets):
-        """Post Twitter thread"""
+    def post_twitter_thread(self, tweets, thread_key, reply_to=None):
+        """Start posting a thread in the background; call .wait() on the result for the tweet ids"""
+        if not self.twitter_client:
+            logger.warning("❌ Twitter client not available")
+            return None
+        
+        # Keyed by thread so a rerun resumes where the last one stopped instead of double-posting
+        resumed = self.resumed_threads.pop(thread_key, None)
+        if resumed:
+            resumed.wait()
+        queue = ThreadPostingQueue(self.twitter_client, thread_key)
+        queue.enqueue(tweets, reply_to)
+        return queue.start(self.twitter_max_wait)
+    
+    def resume_pending_threads(self):
+        """Start finishing threads an earlier run left half-posted, in the background alongside the other stages"""
         if not self.twitter_client:
-            print("❌ Twitter client not available")
             return
         
-        try:
-            tweet_ids = []
-            
-            for i, tweet in enumerate(tweets):
-                if i == 0:
-                    # First tweet
-                    response = self.twitter_client.create_tweet(text=tweet)
-                    tweet_ids.append(response.data['id'])
-                    print(f"✅ Posted main tweet: {tweet[:50]}...")
-                else:
-                    # Reply to previous tweet
-                    response = self.twitter_client.create_tweet(
-                        text=tweet,
-                        in_reply_to_tweet_id=tweet_ids[-1]
-                    )
-                    tweet_ids.append(response.data['id'])
-                    print(f"✅ Posted reply {i}: {tweet[:50]}...")
-            
-            print(f"🐦 Successfully posted {len(tweets)} tweet thread!")
-            return tweet_ids
-            
-        except Exception as e:
-            print(f"❌ Twitter posting failed: {e}")
-            return None
+        for thread_key in pending_threads():
+            logger.info(f"🔁 Resuming unfinished thread {thread_key}")
+            self.resumed_threads[thread_key] = ThreadPostingQueue(self.twitter_client, thread_key).start(self.twitter_max_wait)
     
-    def save_to_github_pages(self, content):
+    def wait_for_resumed_threads(self):
+        while self.resumed_threads:
+            _, queue = self.resumed_threads.popitem()
+            queue.wait()
+    
+    @timed('publish')
+    def save_to_github_pages(self, content, data=None):
         """Save content for GitHub Pages"""
         try:
             # Create docs directory if it doesn't exist
             os.makedirs('docs', exist_ok=True)
             
-            # Save main page
-            with open('docs/index.html', 'w', encoding='utf-8') as f:
-                f.write(content)
-            
-            # Also save dated version
-            date_str = datetime.now().strftime('%Y-%m-%d')
+            # Dated page, named for the slate so a date-range run keeps one page per day
+            date_str = data['game_date'] if data is not None else datetime.now().strftime('%Y-%m-%d')
             with open(f'docs/predictions-{date_str}.html', 'w', encoding='utf-8') as f:
                 f.write(content)
+            self.saved_pages = [f'docs/predictions-{date_str}.html']
+            
+            # The main page only ever shows a slate that hasn't been played yet
+            if date_str >= datetime.now().strftime('%Y-%m-%d'):
+                with open('docs/index.html', 'w', encoding='utf-8') as f:
+                    f.write(content)
+                self.saved_pages.insert(0, 'docs/index.html')
             
-            print("✅ Saved to GitHub Pages")
+            if data is not None:
+                self.update_archive_index(data, date_str)
+            
+            logger.info("✅ Saved to GitHub Pages")
             return f"https://yourusername.github.io/mlb-predictions/"
             
         except Exception as e:
-            print(f"❌ GitHub Pages save failed: {e}")
+            logger.error(f"❌ GitHub Pages save failed: {e}")
             return None
     
-    def run_automation(self):
+    @timed('publish')
+    def update_archive_index(self, data, date_str):
+        """Add or refresh one slate's entry in docs/archive.html without re-rendering the others"""
+        env = get_template_env()
+        summary = self._summary_context(data['predictions'])
+        entry = {
+            'date': date_str,
+            'page': f'predictions-{date_str}.html',
+            'game_date_formatted': datetime.strptime(data['game_date'], '%Y-%m-%d').strftime('%B %d, %Y'),
+            'total_games': summary['total_games'],
+            'agreement_pct': summary['agreement_pct']
+        }
+        
+        archive_path = 'docs/archive.html'
+        if not os.path.exists(archive_path):
+            content = env.get_template('archive.html').render(entries=[entry])
+        else:
+            with open(archive_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            
+            entry_html = env.get_template('archive_entry.html').render(entry=entry)
+            if f'<!-- archive:{date_str} -->' in content:
+                content = _replace_block(content, f'archive:{date_str}', entry_html)
+            else:
+                # Newest first, right below the marker
+                content = content.replace('<!-- archive-entries -->', '<!-- archive-entries -->\n' + entry_html.rstrip('\n'), 1)
+        
+        with open(archive_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        
+        return archive_path
+    
+    @timed('publish')
+    def patch_github_pages(self, data, changed_keys, pages):
+        """Re-render only the changed game cards and the summary in already-published pages"""
+        summary_html = self.render_summary(data['predictions'])
+        cards = {
+            game_key(pred['home_team'], pred['away_team'], pred.get('game_number', 1)): self.render_game_card(pred)
+            for pred in data['predictions']
+            if game_key(pred['home_team'], pred['away_team'], pred.get('game_number', 1)) in changed_keys
+        }
+        
+        patched = []
+        for path in pages:
+            if not os.path.exists(path):
+                continue
+            
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            
+            content = _replace_block(content, 'summary', summary_html)
+            for key, card_html in cards.items():
+                content = _replace_block(content, f'game:{key}', card_html)
+            
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            patched.append(path)
+        
+        logger.info(f"✅ Patched {len(cards)} game(s) in {len(patched)} page(s)")
+        return patched
+    
+    def create_update_tweet(self, changes):
+        """Create a reply announcing re-predicted games"""
+        tweet = "🔄 PREDICTION UPDATE:\n\n"
+        for key, stale, comparison in changes[:3]:
+            reason = "pitching change" if stale & {'home_pitcher', 'away_pitcher'} else "line movement" if stale == {'odds'} else "new data"
+            tweet += f"⚾ {comparison['game']} ({reason})\n"
+            if comparison.get('home_pitcher') and comparison['home_pitcher'] != 'TBD':
+                tweet += f"🥎 {comparison['away_pitcher']} vs {comparison['home_pitcher']}\n"
+            tweet += f"📈 {comparison['predicted_winner']} ({comparison['confidence'] * 100:.0f}%)\n\n"
+        
+        return tweet.strip()
+    
+    def _record_slate(self, data, tweet_ids):
+        """Save what each published game was built from for later incremental updates"""
+        state = SlateState(data['game_date'])
+        for comparison in data['predictions']:
+            game = (comparison['home_team'], comparison['away_team'], comparison.get('game_number', 1))
+            inputs = dict(self.predictor.feature_dependencies.get((game[0], game[1], data['game_date'], game[2]), {}))
+            inputs['odds'] = self._odds_inputs(comparison)
+            state.record(game_key(*game), inputs, comparison)
+        
+        state.tweet_ids = tweet_ids or []
+        state.pages = getattr(self, 'saved_pages', [])
+        state.save()
+        return state
+    
+    def _odds_inputs(self, game):
+        """Moneyline, totals and run-line prices a published game was scored against"""
+        return [game.get('home_odds'), game.get('away_odds')] + [game.get(field) for field in MARKET_FIELDS]
+    
+    def _prediction_from_comparison(self, comparison):
+        """Rebuild a predict_game-style result from a stored comparison"""
+        return {
+            'home_team': comparison['home_team'],
+            'away_team': comparison['away_team'],
+            'game_number': comparison.get('game_number', 1),
+            'home_pitcher': comparison['home_pitcher'],
+            'away_pitcher': comparison['away_pitcher'],
+            'predicted_winner': comparison['predicted_winner'],
+            'home_win_probability': comparison['model_home_prob'],
+            'away_win_probability': comparison['model_away_prob'],
+            'confidence': comparison['confidence'],
+            'key_factors': comparison.get('key_factors', []),
+            'simulation': comparison.get('simulation')
+        }
+    
+    @timed('pipeline')
+    def run_update(self, game_date=None):
+        """Re-predict only the games whose pitchers, team data, standings or odds changed"""
+        game_date = game_date or self.predictor.default_game_date()
+        logger.info(f"🔄 Checking {game_date} slate for changes...")
+        
+        state = SlateState.load(game_date)
+        if not state.games:
+            logger.warning(f"⚠️ No published slate for {game_date}, run the full automation first")
+            return []
+        
+        self.predictor.load_model()
+        
+        # One request each for pitchers and odds covers the whole slate; standings come from the rated results
+        slate_pitchers = self.predictor.get_slate_probable_pitchers(game_date)
+        odds_games = self.predictor.get_slate_odds(game_date)
+        standings = self.predictor.get_team_standings(game_date)
+        
+        changes = []
+        for key, record in state.games.items():
+            published = record['comparison']
+            home_team, away_team = published['home_team'], published['away_team']
+            game_number = published.get('game_number', 1)
+            
+            pitchers = slate_pitchers.get((home_team, away_team, game_number))
+            if pitchers is None:
+                continue  # Game no longer listed, leave the published prediction alone
+            odds_game = odds_games.get((home_team, away_team, game_number),
+                                       {'home_team': home_team, 'away_team': away_team, 'game_number': game_number})
+            
+            inputs = self.predictor.describe_feature_inputs(home_team, away_team, game_date, pitchers, standings)
+            if not standings:
+                inputs.pop('standings')  # No rated games this season yet, nothing to compare
+            inputs['odds'] = self._odds_inputs(odds_game)
+            
+            stale = state.changed_inputs(key, inputs)
+            if not stale:
+                continue
+            
+            logger.debug(f"🔄 {published['game']}: {', '.join(sorted(stale))} changed")
+            if stale == {'odds'}:
+                # Features are unchanged, only the market side needs re-scoring
+                prediction = self._prediction_from_comparison(published)
+            else:
+                prediction = self.predictor.predict_game(home_team, away_team, game_date, pitchers=pitchers,
+                                                         game_number=game_number)
+                inputs.update(self.predictor.feature_dependencies.get((home_team, away_team, game_date, game_number), {}))
+            
+            comparison = self.predictor.compare_game_with_odds(odds_game, prediction)
+            changes.append((key, stale, comparison, inputs))
+        
+        # Totals and run lines for every changed game in one pass, then persist
+        self.predictor.score_market_edges([comparison for _, _, comparison, _ in changes])
+        for key, _, comparison, inputs in changes:
+            state.record(key, inputs, comparison)
+        changes = [(key, stale, comparison) for key, stale, comparison, _ in changes]
+        
+        if not changes:
+            logger.info("✅ Slate unchanged, nothing to update")
+            return changes
+        
+        data = {'predictions': state.comparisons(), 'game_date': game_date, 'generated_at': datetime.now()}
+        
+        queue = None
+        if state.tweet_ids:
+            update_tweet = self.create_update_tweet(changes)
+            update_key = f"update-{game_date}-{len(state.tweet_ids)}"
+            queue = self.post_twitter_thread([update_tweet], update_key, reply_to=state.tweet_ids[-1])
+        
+        # index.html moves on to the next slate, so it's only patched while it still shows this one
+        pages = [path for path in state.pages if path != 'docs/index.html' or _page_slate(path) == game_date]
+        self.patch_github_pages(data, {key for key, _, _ in changes}, pages)
+        write_predictions_feed(data)
+        
+        if queue:
+            state.tweet_ids.extend(queue.wait())
+        
+        state.save()
+        logger.info(f"✅ Updated {len(changes)} game(s)")
+        return changes
+    
+    def write_run_summary(self):
+        """Emit the run's timing spans, counters, data-source degradation and calibration as JSON"""
+        self.predictor.sources.log_report()
+        path = instrumentation.metrics.write_summary(degradation=self.predictor.sources.report(),
+                                                     calibration=self.predictor.calibration)
+        logger.info(f"⏱️ Run summary written to {path}")
+        return path
+    
+    @timed('pipeline')
+    def run_range(self, start_date, end_date):
+        """Publish every slate from start_date to end_date from one training run and one schedule request
+
+        Past slates are re-predicted with only the data available the day before
+        each one; tweets are only posted for slates that haven't happened yet.
+        """
+        logger.info(f"📅 Predicting slates {start_date} to {end_date}...")
+        # Train only on what was known before the first slate
+        with self.predictor.as_of_date(self.predictor.as_of_for(start_date)):
+            self.prepare_model()
+        
+        schedule = self.predictor.get_schedule(start_date, end_date)
+        self.predictor.prefetch_statcast(start_date, end_date)
+        
+        for game_date in sorted(schedule):
+            with self.predictor.as_of_date(self.predictor.as_of_for(game_date)):
+                self.run_automation(game_date, schedule[game_date], train=False)
+        return sorted(schedule)
+    
+    @timed('pipeline')
+    def run_automation(self, game_date=None, slate=None, train=True):
         """Main automation function"""
-        print("🚀 Starting GitHub + Twitter automation...")
+        logger.info("🚀 Starting GitHub + Twitter automation...")
         
         try:
+            self.resume_pending_threads()
+            
             # Generate predictions
-            data = self.generate_predictions()
+            data = self.generate_predictions(game_date, slate, train)
+            
+            # Slates already played are re-published to the site and feed but not tweeted
+            live = data['game_date'] >= datetime.now().strftime('%Y-%m-%d')
             
             if not data['predictions']:
-                print("⚠️ No games with odds today")
+                logger.warning(f"⚠️ No games on the {data['game_date']} slate")
                 # Still post a tweet about it
                 no_games_tweet = "🚨 No MLB games with betting odds today. The robots are taking a rest day! 🤖⚾\n\nCheck back tomorrow for AI-powered predictions! 📊"
-                if self.twitter_client:
-                    self.twitter_client.create_tweet(text=no_games_tweet)
+                queue = self.post_twitter_thread([no_games_tweet], f"no-games-{data['game_date']}") if live else None
+                if queue:
+                    queue.wait()
                 return
             
+            # Grade finished slates up to the as-of date and show the season's running record
+            grade_pending(self.predictor.warehouse, self.predictor.savant_teams,
+                          through=self.predictor.as_of_for(data['game_date']))
+            data['performance'] = latest_performance(year=data['game_date'][:4])
+            
             # Create GitHub Pages content
             html_content = self.create_github_pages_content(data)
             
             # Save to GitHub Pages
-            github_url = self.save_to_github_pages(html_content)
+            github_url = self.save_to_github_pages(html_content, data)
             
             # Create Twitter thread
             tweets = self.create_twitter_thread(data)
@@ -603,21 +614,67 @@ AI vs The House 👇 🧵"""
             if github_url and len(tweets) > 0:
                 tweets[-1] = tweets[-1].replace('[GitHub Pages link will be added]', github_url)
             
-            # Post to Twitter
-            self.post_twitter_thread(tweets)
+            # Post to Twitter in the background while the remaining outputs are written
+            queue = self.post_twitter_thread(tweets, f"slate-{data['game_date']}") if live else None
             
-            print("✅ Automation completed successfully!")
+            # Machine-readable copy of the same numbers
+            write_predictions_feed(data)
+            
+            tweet_ids = queue.wait() if queue else []
+            
+            # Remember what was published so late changes can be patched in
+            self._record_slate(data, tweet_ids)
+            
+            logger.info("✅ Automation completed successfully!")
             
         except Exception as e:
-            print(f"❌ Automation failed: {e}")
+            logger.error(f"❌ Automation failed: {e}")
             # Post error tweet
             error_tweet = "🚨 Prediction bot encountered an error today. The humans are investigating! 🔧🤖\n\n#MLBPredictions #TechnicalDifficulties"
-            if self.twitter_client:
-                try:
-                    self.twitter_client.create_tweet(text=error_tweet)
-                except:
-                    pass
+            try:
+                queue = self.post_twitter_thread([error_tweet], f"error-{datetime.now().strftime('%Y-%m-%d')}")
+                if queue:
+                    queue.wait()
+            except:
+                pass
+        finally:
+            self.wait_for_resumed_threads()
+
+def _page_slate(path):
+    """Slate date a published page shows, from its <!-- slate:YYYY-MM-DD --> marker"""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        match = re.search(r'<!-- slate:(\d{4}-\d{2}-\d{2}) -->', f.read())
+    return match.group(1) if match else None
+
+
+def _replace_block(content, name, fragment):
+    """Swap the marked <!-- name --> ... <!-- /name --> block for a new fragment"""
+    pattern = re.compile(re.escape(f'<!-- {name} -->') + '.*?' + re.escape(f'<!-- /{name} -->'), re.DOTALL)
+    return pattern.sub(lambda _: fragment.strip(), content, count=1)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Daily MLB predictions for GitHub Pages and Twitter")
+    parser.add_argument('--update', action='store_true',
+                        help="Only re-predict games whose pitchers, data or odds changed since the last run")
+    parser.add_argument('--date', help="Slate date, or first date with --end (YYYY-MM-DD, default tomorrow)")
+    parser.add_argument('--end', help="Last slate date: predict and publish every slate from --date to --end")
+    parser.add_argument('--as-of', help="Only use data through this date (YYYY-MM-DD), e.g. to re-predict past slates")
+    parser.add_argument('--profile', choices=['cprofile', 'pyinstrument'],
+                        help="Profile the run (also settable via MLB_PROFILE)")
+    args = parser.parse_args()
+    configure_logging()
+    
     automation = GitHubTwitterAutomation()
-    automation.run_automation()
+    automation.predictor.as_of = args.as_of
+    try:
+        if args.update:
+            run_profiled(automation.run_update, args.date, profiler=args.profile)
+        elif args.end:
+            start = args.date or automation.predictor.default_game_date()
+            run_profiled(automation.run_range, start, args.end, profiler=args.profile)
+        else:
+            run_profiled(automation.run_automation, args.date, profiler=args.profile)
+    finally:
+        automation.write_run_summary()
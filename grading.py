@@ -0,0 +1,214 @@
+import os
+import json
+import logging
+import argparse
+import pandas as pd
+
+from instrumentation import timed
+from predictions_feed import FEED_DIR
+from statcast_warehouse import StatcastWarehouse
+from team_ratings import RESULT_COLUMNS, game_results
+from log_config import configure_logging
+
+logger = logging.getLogger(__name__)
+
+# Graded games, one row each, in ledger order
+LEDGER_COLUMNS = [
+    'game_date', 'game', 'home_team', 'away_team', 'predicted_winner', 'model_home_prob',
+    'home_score', 'away_score', 'home_win', 'correct', 'brier', 'odds', 'stake', 'profit'
+]
+
+# Running sums kept per season; every headline number is derived from these
+TOTAL_FIELDS = ['graded', 'correct', 'brier_sum', 'staked', 'profit']
+
+
+def american_profit(odds):
+    """Profit on a one-unit stake that wins at American odds"""
+    return odds / 100.0 if odds > 0 else 100.0 / -odds
+
+
+def _number_games(games):
+    """Number each team pair's games on the day in order, so a doubleheader's games join one to one"""
+    if 'game_number' in games.columns and games['game_number'].notna().all():
+        return games
+    games = games.copy()
+    games['game_number'] = games.groupby(['home_team', 'away_team']).cumcount() + 1
+    return games
+
+
+def grade_slate(predictions, results):
+    """Join one slate's published predictions with final scores
+
+    Every pick is graded as a one-unit bet on the predicted winner at its
+    published odds; games without odds are graded but not staked. Predictions
+    carry the schedule's game_number (feeds written before it are numbered in
+    slate order) and results are numbered in game_pk order, so each game of a
+    doubleheader is graded against its own final score.
+    """
+    predictions, results = _number_games(predictions), _number_games(results.sort_values('game_pk'))
+    graded = predictions.merge(results[['home_team', 'away_team', 'game_number', 'home_score', 'away_score']],
+                               on=['home_team', 'away_team', 'game_number'], how='inner')
+    if graded.empty:
+        return pd.DataFrame(columns=LEDGER_COLUMNS)
+
+    graded['home_win'] = (graded['home_score'] > graded['away_score']).astype(int)
+    picked_home = graded['predicted_winner'] == graded['home_team']
+    graded['correct'] = (picked_home == (graded['home_win'] == 1)).astype(int)
+    graded['brier'] = (graded['model_home_prob'] - graded['home_win']) ** 2
+
+    graded['odds'] = pd.to_numeric(graded['home_odds'].where(picked_home, graded['away_odds']), errors='coerce')
+    graded['stake'] = graded['odds'].notna().astype(float)
+    payout = graded['odds'].map(lambda odds: american_profit(odds) if odds == odds and odds else 0.0)
+    graded['profit'] = payout.where(graded['correct'] == 1, -1.0).where(graded['stake'] > 0, 0.0).round(4)
+    return graded[LEDGER_COLUMNS]
+
+
+class SeasonLedger:
+    """Append-only ledger of graded games for one season plus its running totals
+
+    Grading a day appends that day's rows and adds them to the totals, so the
+    headline numbers never require re-reading the ledger.
+    """
+
+    def __init__(self, year, feed_dir=FEED_DIR):
+        self.year = str(year)
+        self.feed_dir = feed_dir
+        self.totals = {field: 0 for field in TOTAL_FIELDS}
+        self.graded_dates = []
+        self.last_day = None
+
+    @property
+    def path(self):
+        return os.path.join(self.feed_dir, f'ledger-{self.year}.csv')
+
+    @property
+    def totals_path(self):
+        return os.path.join(self.feed_dir, f'performance-{self.year}.json')
+
+    @classmethod
+    def load(cls, year, feed_dir=FEED_DIR):
+        ledger = cls(year, feed_dir)
+        if os.path.exists(ledger.totals_path):
+            with open(ledger.totals_path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            ledger.totals = saved['totals']
+            ledger.graded_dates = saved['graded_dates']
+            ledger.last_day = saved.get('last_day')
+        return ledger
+
+    def save(self):
+        os.makedirs(self.feed_dir, exist_ok=True)
+        payload = {'totals': self.totals, 'graded_dates': self.graded_dates, 'last_day': self.last_day,
+                   'summary': self.summary()}
+        tmp_path = f"{self.totals_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2)
+        os.replace(tmp_path, self.totals_path)
+
+    def add(self, game_date, graded):
+        """Append a graded day to the ledger and fold it into the running totals"""
+        if game_date in self.graded_dates:
+            return False
+
+        os.makedirs(self.feed_dir, exist_ok=True)
+        graded.to_csv(self.path, mode='a', header=not os.path.exists(self.path), index=False)
+
+        day = {
+            'graded': int(len(graded)),
+            'correct': int(graded['correct'].sum()),
+            'brier_sum': float(graded['brier'].sum()),
+            'staked': float(graded['stake'].sum()),
+            'profit': float(graded['profit'].sum())
+        }
+        for field in TOTAL_FIELDS:
+            self.totals[field] += day[field]
+        self.graded_dates.append(game_date)
+        self.last_day = dict(day, game_date=game_date)
+        self.save()
+        return True
+
+    def summary(self):
+        """Record, accuracy, Brier score and ROI for the season so far"""
+        totals = self.totals
+        graded = totals['graded']
+        summary = {
+            'season': self.year,
+            'graded': graded,
+            'wins': totals['correct'],
+            'losses': graded - totals['correct'],
+            'accuracy': round(totals['correct'] / graded, 4) if graded else None,
+            'brier': round(totals['brier_sum'] / graded, 4) if graded else None,
+            'units': round(totals['profit'], 2),
+            'roi': round(totals['profit'] / totals['staked'], 4) if totals['staked'] else None,
+            'through': self.graded_dates[-1] if self.graded_dates else None
+        }
+        if self.last_day:
+            summary['last_day'] = {
+                'game_date': self.last_day['game_date'],
+                'wins': self.last_day['correct'],
+                'losses': self.last_day['graded'] - self.last_day['correct'],
+                'units': round(self.last_day['profit'], 2)
+            }
+        return summary
+
+
+def _load_predictions(game_date, feed_dir):
+    path = os.path.join(feed_dir, f'predictions-{game_date}.json')
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return pd.DataFrame(json.load(f))
+
+
+@timed('publish')
+def grade_pending(warehouse, full_names=None, feed_dir=FEED_DIR, through=None):
+    """Grade every published slate whose games are in the warehouse but not yet in its season ledger
+
+    Only dates after each season's last graded date are considered, so a daily
+    run grades the new day(s) and nothing else. Returns the seasons with graded games.
+    """
+    ledgers = {}
+    for day in warehouse.dates():
+        if through and day > through:
+            break
+        year = day[:4]
+        if year not in ledgers:
+            ledgers[year] = SeasonLedger.load(year, feed_dir)
+        ledger = ledgers[year]
+        if ledger.graded_dates and day <= ledger.graded_dates[-1]:
+            continue
+
+        predictions = _load_predictions(day, feed_dir)
+        if predictions is None or predictions.empty:
+            continue
+        predictions['game_date'] = day
+
+        results = game_results(warehouse.load(day, day, columns=RESULT_COLUMNS), full_names)
+        graded = grade_slate(predictions, results)
+        if ledger.add(day, graded):
+            logger.info(f"📒 Graded {day}: {int(graded['correct'].sum())}-{len(graded) - int(graded['correct'].sum())}, "
+                        f"{graded['profit'].sum():+.2f} units")
+    return [ledger for ledger in ledgers.values() if ledger.graded_dates]
+
+
+def latest_performance(feed_dir=FEED_DIR, year=None):
+    """Summary of the most recent season with graded games, or None"""
+    if year is None:
+        seasons = sorted(name[len('performance-'):-len('.json')] for name in os.listdir(feed_dir)
+                         if name.startswith('performance-') and name.endswith('.json')) if os.path.isdir(feed_dir) else []
+        if not seasons:
+            return None
+        year = seasons[-1]
+    ledger = SeasonLedger.load(year, feed_dir)
+    return ledger.summary() if ledger.graded_dates else None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Grade published predictions against final scores")
+    parser.add_argument('--through', help="Last date to grade (YYYY-MM-DD, default every stored day)")
+    parser.add_argument('--feed-dir', default=FEED_DIR, help="Directory with the published prediction feed")
+    args = parser.parse_args()
+    configure_logging()
+
+    for ledger in grade_pending(StatcastWarehouse(), feed_dir=args.feed_dir, through=args.through):
+        logger.info(f"📊 {ledger.year}: {json.dumps(ledger.summary())}")
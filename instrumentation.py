@@ -0,0 +1,211 @@
+import os
+import json
+import time
+import logging
+import functools
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+# Run summaries and profiles land here
+METRICS_DIR = os.path.join('state', 'metrics')
+
+# Numeric span attributes that are summed per span name
+SUMMED_ATTRS = ('bytes', 'rows', 'frame_bytes', 'cache_hits', 'cache_misses')
+
+logger = logging.getLogger(__name__)
+
+
+class RunMetrics:
+    """Timing spans and counters for one pipeline run"""
+
+    def __init__(self):
+        self.started_at = datetime.now()
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # (stage, name) -> aggregate; (parent, name) -> aggregate for nested spans
+        self.spans = {}
+        self.children = {}
+        self.counters = {}
+
+    def reset(self):
+        """Clear every span and counter and restart the clock"""
+        with self._lock:
+            self.started_at = datetime.now()
+            self._t0 = time.perf_counter()
+            self.spans = {}
+            self.children = {}
+            self.counters = {}
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def span(self, name, stage):
+        """Time a block; attributes added via annotate() are summed per span name"""
+        stack = self._stack()
+        parent = stack[-1]['name'] if stack else None
+        frame = {'name': name, 'attrs': {}}
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield frame['attrs']
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            self._record(stage, name, parent, elapsed, frame['attrs'])
+
+    def _record(self, stage, name, parent, elapsed, attrs):
+        with self._lock:
+            agg = self.spans.setdefault((stage, name), {'count': 0, 'seconds': 0.0, 'max_seconds': 0.0})
+            agg['count'] += 1
+            agg['seconds'] += elapsed
+            agg['max_seconds'] = max(agg['max_seconds'], elapsed)
+            for key in SUMMED_ATTRS:
+                if key in attrs:
+                    agg[key] = agg.get(key, 0) + attrs[key]
+
+            if parent:
+                child = self.children.setdefault((parent, name), {'count': 0, 'seconds': 0.0})
+                child['count'] += 1
+                child['seconds'] += elapsed
+
+    def annotate(self, **attrs):
+        """Add attributes (bytes, rows, cache hits, ...) to the innermost open span"""
+        stack = self._stack()
+        if not stack:
+            return
+        current = stack[-1]['attrs']
+        for key, value in attrs.items():
+            current[key] = current.get(key, 0) + value
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def summary(self):
+        """JSON-ready run summary: per-stage totals, per-span totals and the slowest inputs"""
+        with self._lock:
+            spans = {f'{stage}:{name}': dict(agg) for (stage, name), agg in self.spans.items()}
+            stages = {}
+            for (stage, _), agg in self.spans.items():
+                totals = stages.setdefault(stage, {'count': 0, 'seconds': 0.0})
+                totals['count'] += agg['count']
+                totals['seconds'] += agg['seconds']
+
+            breakdown = {}
+            for (parent, name), agg in self.children.items():
+                breakdown.setdefault(parent, {})[name] = dict(agg)
+            counters = dict(self.counters)
+
+        for agg in list(spans.values()) + list(stages.values()):
+            agg['seconds'] = round(agg['seconds'], 4)
+            if 'max_seconds' in agg:
+                agg['max_seconds'] = round(agg['max_seconds'], 4)
+
+        # Rank each parent's inputs by total time, e.g. what makes create_features slow
+        for parent, inputs in breakdown.items():
+            breakdown[parent] = dict(sorted(
+                ((name, {'count': agg['count'], 'seconds': round(agg['seconds'], 4)}) for name, agg in inputs.items()),
+                key=lambda item: item[1]['seconds'], reverse=True
+            ))
+
+        return {
+            'started_at': self.started_at.isoformat(),
+            'wall_seconds': round(time.perf_counter() - self._t0, 4),
+            'stages': stages,
+            'spans': dict(sorted(spans.items(), key=lambda item: item[1]['seconds'], reverse=True)),
+            'breakdown': breakdown,
+            'counters': counters
+        }
+
+    def write_summary(self, path=None, **sections):
+        """Write the run summary (plus any extra report sections) as JSON and return its path"""
+        if path is None:
+            path = os.path.join(METRICS_DIR, f"run-{self.started_at.strftime('%Y%m%d-%H%M%S')}.json")
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({**self.summary(), **sections}, f, indent=2)
+        return path
+
+
+# Process-wide collector used by the @timed decorators
+metrics = RunMetrics()
+
+
+def reset_metrics():
+    """Reset the collector in place (e.g. between benchmark runs), so modules that imported it keep seeing it"""
+    metrics.reset()
+    return metrics
+
+
+def timed(stage, name=None):
+    """Decorator that records a span around every call"""
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with metrics.span(span_name, stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def annotate(**attrs):
+    metrics.annotate(**attrs)
+
+
+def count(name, value=1):
+    metrics.count(name, value)
+
+
+def frame_stats(df):
+    """Row count and in-memory size of a downloaded DataFrame"""
+    return {'rows': len(df), 'frame_bytes': int(df.memory_usage(index=False).sum())}
+
+
+def run_profiled(func, *args, profiler=None, **kwargs):
+    """Run func under cProfile or pyinstrument when MLB_PROFILE (or profiler=) asks for it"""
+    profiler = profiler or os.getenv('MLB_PROFILE')
+    if not profiler:
+        return func(*args, **kwargs)
+
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+
+    if profiler == 'pyinstrument':
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            logger.warning("⚠️ pyinstrument not installed, falling back to cProfile")
+        else:
+            prof = Profiler()
+            prof.start()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                prof.stop()
+                path = os.path.join(METRICS_DIR, f'profile-{stamp}.html')
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(prof.output_html())
+                logger.info(f"📈 Profile written to {path}")
+
+    import cProfile
+    import pstats
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        prof.disable()
+        path = os.path.join(METRICS_DIR, f'profile-{stamp}.prof')
+        prof.dump_stats(path)
+        # The top of the cumulative report goes beside the raw stats rather than onto stdout
+        report_path = os.path.join(METRICS_DIR, f'profile-{stamp}.txt')
+        with open(report_path, 'w', encoding='utf-8') as f:
+            pstats.Stats(prof, stream=f).sort_stats('cumulative').print_stats(20)
+        logger.info(f"📈 Profile written to {path} (top 20 by cumulative time in {report_path})")
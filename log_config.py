@@ -0,0 +1,89 @@
+import os
+import sys
+import json
+import logging
+import logging.handlers
+from collections import Counter
+from datetime import datetime, timezone
+
+# Standard LogRecord attributes; anything else passed via extra= is emitted as a JSON field
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with any extra= fields included"""
+
+    def format(self, record):
+        payload = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                payload[key] = value
+        if record.exc_info:
+            payload['exc'] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+def configure_logging(level=None, fmt=None, buffer_size=200):
+    """Set up root logging from MLB_LOG_LEVEL / MLB_LOG_FORMAT (text or json)
+
+    Records are buffered and written in batches; anything at WARNING or above
+    flushes the buffer immediately so ordering is preserved.
+    """
+    level = (level or os.getenv('MLB_LOG_LEVEL', 'INFO')).upper()
+    fmt = (fmt or os.getenv('MLB_LOG_FORMAT', 'text')).lower()
+
+    stream = logging.StreamHandler(sys.stdout)
+    if fmt == 'json':
+        stream.setFormatter(JsonFormatter())
+    else:
+        stream.setFormatter(logging.Formatter('%(asctime)s %(levelname)-7s %(message)s', '%H:%M:%S'))
+
+    # Long-running servers pass buffer_size=0 so each request is logged as it happens
+    handler = stream
+    if buffer_size:
+        handler = logging.handlers.MemoryHandler(buffer_size, flushLevel=logging.WARNING, target=stream)
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    # Third-party chatter stays at WARNING unless we're debugging
+    for noisy in ('urllib3', 'requests_oauthlib', 'oauthlib'):
+        logging.getLogger(noisy).setLevel(logging.WARNING if level != 'DEBUG' else logging.DEBUG)
+    return root
+
+
+class StageLog:
+    """Counts per-item events inside a stage and logs one summary line when it ends"""
+
+    def __init__(self, logger, stage, level=logging.INFO):
+        self.logger = logger
+        self.stage = stage
+        self.level = level
+        self.counts = Counter()
+
+    def add(self, event, n=1):
+        self.counts[event] += n
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if self.counts:
+            details = ', '.join(f"{event}={n}" for event, n in self.counts.items())
+            self.logger.log(self.level, f"{self.stage}: {details}",
+                            extra={'stage': self.stage, 'counts': dict(self.counts)})
+        return False
+
+
+def flush_logging():
+    """Write out any buffered records (e.g. before printing a report to stdout)"""
+    for handler in logging.getLogger().handlers:
+        handler.flush()
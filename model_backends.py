@@ -0,0 +1,131 @@
+import os
+from abc import ABC, abstractmethod
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+from explanations import ForestExplainer
+from forest_evaluator import CompiledForest
+
+# Backend used when the predictor isn't given one explicitly
+MODEL_BACKEND = os.getenv('MLB_MODEL_BACKEND', 'forest')
+
+
+class ModelBackend(ABC):
+    """Common fit / predict_proba interface over the classifiers the predictor can train
+
+    Only backends that need standardized inputs carry a scaler; trees see raw features.
+    """
+
+    name = None
+    needs_scaling = False
+
+    def __init__(self, random_state=42):
+        self.random_state = random_state
+        self.estimator = self.build()
+        self.scaler = StandardScaler() if self.needs_scaling else None
+
+    @abstractmethod
+    def build(self):
+        """Unfitted estimator for this backend"""
+
+    def fresh(self):
+        """Unfitted copy with the same settings, e.g. for walk-forward folds"""
+        return type(self)(self.random_state)
+
+    def _inputs(self, X, fit=False):
+        X = np.asarray(X, dtype=float)
+        if self.scaler is None:
+            return X
+        return self.scaler.fit_transform(X) if fit else self.scaler.transform(X)
+
+    def fit(self, X, y):
+        self.estimator.fit(self._inputs(X, fit=True), np.asarray(y))
+        return self
+
+    def predict_proba(self, X):
+        """Home-win probability for each row"""
+        return self.estimator.predict_proba(self._inputs(X))[:, 1]
+
+    def feature_importances(self):
+        """Per-feature importance, or None when the estimator doesn't expose one"""
+        return None
+
+    def explainer(self):
+        """Per-game feature contributions for the fitted model, or None when the backend has none"""
+        return None
+
+
+class ForestBackend(ModelBackend):
+    """Random forest trained with sklearn and served from its compiled node arrays
+
+    Only the compiled forest and the importances are pickled; the sklearn
+    estimator is needed for fitting, not for predicting.
+    """
+
+    name = 'forest'
+
+    def build(self):
+        return RandomForestClassifier(n_estimators=100, random_state=self.random_state)
+
+    def compile(self):
+        self.compiled = CompiledForest(self.estimator)
+        self.importances = self.estimator.feature_importances_
+        return self
+
+    def fit(self, X, y):
+        super().fit(X, y)
+        return self.compile()
+
+    def predict_proba(self, X):
+        # Only legacy artifacts carry a scaler: forests that were fit on standardized inputs
+        return self.compiled.predict_proba(self._inputs(X))[:, 1]
+
+    def feature_importances(self):
+        return self.importances
+
+    def explainer(self):
+        return ForestExplainer(self.compiled, self._inputs)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        if 'compiled' in state:
+            state['estimator'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # Artifacts saved before compilation carry the fitted estimator instead
+        if 'compiled' not in state and hasattr(self.estimator, 'estimators_'):
+            self.compile()
+
+
+class GradientBoostingBackend(ModelBackend):
+    name = 'hist_gbm'
+
+    def build(self):
+        # Shallow, heavily regularized trees; training sets are small
+        return HistGradientBoostingClassifier(max_iter=200, learning_rate=0.05, max_depth=3, min_samples_leaf=5,
+                                              l2_regularization=1.0, random_state=self.random_state)
+
+
+class LogisticBackend(ModelBackend):
+    name = 'logistic'
+    needs_scaling = True
+
+    def build(self):
+        return LogisticRegression(C=0.5, max_iter=1000)
+
+    def feature_importances(self):
+        return np.abs(self.estimator.coef_[0])
+
+
+BACKENDS = {backend.name: backend for backend in (ForestBackend, GradientBoostingBackend, LogisticBackend)}
+
+
+def make_backend(name=None, random_state=42):
+    name = name or MODEL_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown model backend {name!r}; choose from {', '.join(BACKENDS)}")
+    return BACKENDS[name](random_state)
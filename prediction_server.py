@@ -0,0 +1,245 @@
+import os
+import json
+import logging
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from baseball_predictor import BaseballSavantPredictor, MODEL_PATH
+from instrumentation import metrics, count
+from slate_state import game_label
+from log_config import configure_logging
+
+logger = logging.getLogger(__name__)
+
+
+class PredictionService:
+    """Long-running predictor with a warm model and per-game feature cache
+
+    The predictor keeps per-call state (as-of date, Statcast window, pending
+    fallbacks), so request threads and the background refresh take turns on it.
+    """
+
+    def __init__(self, model_path=MODEL_PATH, odds_api_key=None, refresh_interval=300):
+        self.predictor = BaseballSavantPredictor(odds_api_key)
+        self.predictor.load_model(model_path)
+        self.refresh_interval = refresh_interval
+
+        # Long-lived process: retry a tripped source once per refresh instead of never
+        self.predictor.sources.set_reset_after(refresh_interval)
+
+        # (game_date, home_team, away_team, game_number) -> {'features': ..., 'pitchers': ..., 'simulation': ..., 'built_at': ...}
+        self.feature_cache = {}
+        self.lock = threading.Lock()
+        self.predictor_lock = threading.RLock()
+        self._stop = threading.Event()
+        self._refresher = None
+
+    def _default_date(self):
+        return self.predictor.default_game_date()
+
+    def _pitcher_ids(self, pitchers):
+        return (pitchers['home_pitcher'].get('id'), pitchers['away_pitcher'].get('id'))
+
+    def _build_entry(self, home_team, away_team, game_date, pitchers=None, game_number=1):
+        """Featurize and simulate one game and store it in the cache"""
+        with self.predictor_lock:
+            if pitchers is None:
+                pitchers = self.predictor.get_probable_pitchers(home_team, away_team, game_date, game_number)
+            features = self.predictor.create_features(home_team, away_team, game_date, pitchers, game_number=game_number)
+            simulation = self.predictor.simulate_game(home_team, away_team, game_date, pitchers, game_number)
+            # Read with the same lock held, so another game's build can't record or clear this game's fallbacks in between
+            fallbacks = list(self.predictor.sources.degraded_games.get(f"{game_date} {game_label(home_team, away_team, game_number)}", []))
+
+        entry = {
+            'features': features,
+            'pitchers': pitchers,
+            'simulation': simulation,
+            'built_at': datetime.now().isoformat(),
+            'fallbacks': fallbacks
+        }
+        with self.lock:
+            self.feature_cache[(game_date, home_team, away_team, game_number)] = entry
+        return entry
+
+    def evict_before(self, game_date):
+        """Drop cached games, simulation inputs, bullpen features and degraded-game records for dates before game_date"""
+        with self.lock:
+            stale = [key for key in self.feature_cache if key[0] < game_date]
+            for key in stale:
+                del self.feature_cache[key]
+        with self.predictor_lock:
+            inputs = self.predictor.simulation_inputs
+            for key in [key for key in inputs if key[2] and key[2] < game_date]:
+                del inputs[key]
+            self.predictor.bullpen.forget_games_before(game_date)
+            self.predictor.sources.forget_games_before(game_date)
+        return len(stale)
+
+    def warm_slate(self, game_date=None):
+        """Featurize every game on a date, reusing entries whose pitchers are unchanged and inputs complete
+
+        Games from earlier dates are evicted first, so a long-running server's caches stay one slate deep.
+        """
+        game_date = game_date or self._default_date()
+        evicted = self.evict_before(game_date)
+        if evicted:
+            logger.debug(f"🧹 Evicted {evicted} cached game(s) from before {game_date}")
+        with self.predictor_lock:
+            slate = self.predictor.get_slate_probable_pitchers(game_date)
+
+        refreshed = 0
+        for (home_team, away_team, game_number), pitchers in slate.items():
+            with self.lock:
+                cached = self.feature_cache.get((game_date, home_team, away_team, game_number))
+
+            if cached and self._pitcher_ids(cached['pitchers']) == self._pitcher_ids(pitchers) and not cached['fallbacks']:
+                continue
+
+            if cached and cached['fallbacks']:
+                logger.debug(f"🔄 Retrying fallback inputs for {away_team} @ {home_team}")
+            elif cached:
+                logger.debug(f"🔄 Probable pitchers changed for {away_team} @ {home_team}, refreshing features")
+            self._build_entry(home_team, away_team, game_date, pitchers, game_number)
+            refreshed += 1
+
+        logger.info(f"✅ Slate {game_date}: {len(slate)} games, {refreshed} featurized")
+        return refreshed
+
+    def predict(self, home_team, away_team, game_date=None, game_number=1):
+        """Predict a single game from cached features (game_number 2 for a doubleheader's second game)"""
+        game_date = game_date or self._default_date()
+
+        with self.lock:
+            entry = self.feature_cache.get((game_date, home_team, away_team, game_number))
+        if entry is None:
+            count('feature_cache.miss')
+            entry = self._build_entry(home_team, away_team, game_date, game_number=game_number)
+        else:
+            count('feature_cache.hit')
+
+        with self.predictor_lock:
+            prediction = self.predictor.predict_game(
+                home_team, away_team, game_date,
+                features=entry['features'], pitchers=entry['pitchers'], simulation=entry['simulation'],
+                game_number=game_number
+            )
+        prediction['game_date'] = game_date
+        prediction['features_built_at'] = entry['built_at']
+        prediction['fallback_inputs'] = entry['fallbacks']
+        return prediction
+
+    def predict_batch(self, games):
+        """Predict a list of {'home': ..., 'away': ..., 'date': ..., 'game': ...} games"""
+        return [self.predict(game['home'], game['away'], game.get('date'), int(game.get('game', 1))) for game in games]
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.warm_slate()
+            except Exception as e:
+                logger.error(f"❌ Background refresh failed: {e}")
+
+    def start_background_refresh(self):
+        """Poll probable pitchers and refresh features for games that changed"""
+        if self._refresher and self._refresher.is_alive():
+            return
+        self._stop.clear()
+        self._refresher = threading.Thread(target=self._refresh_loop, daemon=True)
+        self._refresher.start()
+
+    def stop(self):
+        self._stop.set()
+
+
+def _to_json(value):
+    """Make numpy scalars JSON-serializable"""
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+def make_handler(service):
+    """Build a request handler bound to a PredictionService"""
+
+    class PredictionHandler(BaseHTTPRequestHandler):
+        def _send(self, status, payload):
+            body = json.dumps(payload, default=_to_json).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+            if url.path == '/health':
+                sources = {source: status['state'] for source, status in service.predictor.sources.report()['sources'].items()}
+                self._send(200, {
+                    'status': 'degraded' if 'open' in sources.values() else 'ok',
+                    'cached_games': len(service.feature_cache),
+                    'sources': sources
+                })
+            elif url.path == '/metrics':
+                self._send(200, metrics.summary())
+            elif url.path == '/predict':
+                if 'home' not in params or 'away' not in params:
+                    self._send(400, {'error': 'home and away are required'})
+                    return
+                try:
+                    self._send(200, service.predict(params['home'], params['away'], params.get('date'), int(params.get('game', 1))))
+                except Exception as e:
+                    self._send(500, {'error': str(e)})
+            else:
+                self._send(404, {'error': 'not found'})
+
+        def do_POST(self):
+            if urlparse(self.path).path != '/predict/batch':
+                self._send(404, {'error': 'not found'})
+                return
+
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                payload = json.loads(self.rfile.read(length) or b'{}')
+                games = payload.get('games', [])
+            except (ValueError, AttributeError):
+                self._send(400, {'error': 'body must be JSON like {"games": [{"home": ..., "away": ...}]}'})
+                return
+
+            try:
+                self._send(200, {'predictions': service.predict_batch(games)})
+            except KeyError as e:
+                self._send(400, {'error': f'missing field {e}'})
+            except Exception as e:
+                self._send(500, {'error': str(e)})
+
+        def log_message(self, format, *args):
+            pass
+
+    return PredictionHandler
+
+
+def serve(host='0.0.0.0', port=8000, model_path=MODEL_PATH):
+    """Load the persisted model, warm tomorrow's slate and serve predictions"""
+    service = PredictionService(model_path, odds_api_key=os.getenv('ODDS_API_KEY'))
+    service.predictor.refresh_feature_tables()
+    service.warm_slate()
+    service.start_background_refresh()
+
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    logger.info(f"🚀 Serving predictions on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    configure_logging(buffer_size=0)
+    serve(port=int(os.getenv('PORT', 8000)))
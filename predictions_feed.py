@@ -0,0 +1,114 @@
+import os
+import json
+import logging
+from datetime import datetime
+import pandas as pd
+
+from baseball_predictor import MARKET_FIELDS
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow  # noqa: F401 - only needed for Parquet output
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+# Published alongside the HTML so downstream users don't have to scrape it
+FEED_DIR = os.path.join('docs', 'data')
+
+# Comparison fields produced by compare_predictions_with_odds, in feed order
+FEED_COLUMNS = [
+    'game_date', 'game', 'home_team', 'away_team', 'game_number', 'home_pitcher', 'away_pitcher',
+    'model_home_prob', 'model_away_prob', 'predicted_winner', 'confidence',
+    'odds_home_prob', 'odds_away_prob', 'odds_favorite', 'home_odds', 'away_odds',
+    'prob_diff_home', 'prob_diff_away', 'agreement', 'generated_at'
+]
+
+# Market lines and the simulated edges against them, kept in the season file after the feed columns
+MARKET_COLUMNS = list(MARKET_FIELDS) + [
+    'model_total_runs', 'model_over_prob', 'odds_over_prob', 'total_edge',
+    'model_home_cover_prob', 'odds_home_cover_prob', 'run_line_edge'
+]
+SEASON_COLUMNS = FEED_COLUMNS + MARKET_COLUMNS
+
+
+def predictions_frame(data):
+    """Flatten one run's comparisons into a DataFrame with the feed columns"""
+    # Simulated run distributions stay in slate state; the feed keeps the scalar results
+    df = pd.DataFrame(data['predictions']).drop(columns=['simulation'], errors='ignore')
+    df['game_date'] = data['game_date']
+
+    generated_at = data.get('generated_at') or datetime.now()
+    df['generated_at'] = generated_at.isoformat() if hasattr(generated_at, 'isoformat') else str(generated_at)
+
+    for col in FEED_COLUMNS:
+        if col not in df.columns:
+            df[col] = None
+
+    extra = [col for col in df.columns if col not in FEED_COLUMNS]
+    return df[FEED_COLUMNS + extra]
+
+
+def write_predictions_feed(data, feed_dir=FEED_DIR):
+    """Write the day's JSON + Parquet/CSV files and append to the season-to-date file"""
+    if not data['predictions']:
+        return []
+
+    os.makedirs(feed_dir, exist_ok=True)
+    df = predictions_frame(data)
+    game_date = data['game_date']
+    written = []
+
+    # Compact JSON for web consumers
+    json_path = os.path.join(feed_dir, f'predictions-{game_date}.json')
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(json.loads(df.to_json(orient='records')), f, separators=(',', ':'))
+    written.append(json_path)
+
+    # Columnar copy for analysis; CSV when no Parquet engine is installed
+    if HAS_PARQUET:
+        table_path = os.path.join(feed_dir, f'predictions-{game_date}.parquet')
+        df.to_parquet(table_path, index=False)
+    else:
+        table_path = os.path.join(feed_dir, f'predictions-{game_date}.csv')
+        df.to_csv(table_path, index=False)
+    written.append(table_path)
+
+    # Season file is append-only; reruns add newer rows that load_season prefers
+    season_path = season_feed_path(game_date[:4], feed_dir)
+    _upgrade_season_file(season_path)
+    season = df.reindex(columns=SEASON_COLUMNS)
+    season.to_csv(season_path, mode='a', header=not os.path.exists(season_path), index=False)
+    written.append(season_path)
+
+    logger.info(f"✅ Wrote predictions feed for {game_date} ({len(df)} games)")
+    return written
+
+
+def season_feed_path(year, feed_dir=FEED_DIR):
+    return os.path.join(feed_dir, f'season-{year}.csv')
+
+
+def _upgrade_season_file(path):
+    """Rewrite a season file written with older columns so appended rows line up with its header"""
+    if not os.path.exists(path) or list(pd.read_csv(path, nrows=0).columns) == SEASON_COLUMNS:
+        return
+    df = pd.read_csv(path).reindex(columns=SEASON_COLUMNS)
+    tmp_path = f"{path}.tmp"
+    df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    logger.info(f"🔧 Upgraded {path} to the current season columns")
+
+
+def load_season(year, feed_dir=FEED_DIR):
+    """Load a whole season of predictions in one read, keeping the latest row per game"""
+    path = season_feed_path(year, feed_dir)
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=SEASON_COLUMNS)
+
+    df = pd.read_csv(path)
+    # Rows written before games were numbered are all first games
+    df['game_number'] = df['game_number'].fillna(1).astype(int)
+    df = df.drop_duplicates(subset=['game_date', 'home_team', 'away_team', 'game_number'], keep='last')
+    return df.reset_index(drop=True)
@@ -0,0 +1,180 @@
+import os
+import logging
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+from instrumentation import timed
+from feature_tables import TABLE_DIR
+from team_ratings import TEAMS
+from venues import distance_miles, normalize_team
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE_COLUMNS = ['game_date', 'game_pk', 'home_team', 'away_team']
+
+# Rest beyond this many days off counts the same (and is what a team's first game of a season gets)
+MAX_REST_DAYS = 4
+
+# Days of travel summed into the recent-travel feature
+TRAVEL_DAYS = 7
+
+# Miles between every pair of home venues, rows and columns in TEAMS order
+VENUE_MILES = np.array([[distance_miles(a, b) for b in TEAMS] for a in TEAMS])
+
+NEUTRAL_SCHEDULE = {'rest_days': MAX_REST_DAYS, 'games_streak': 0, 'travel_miles': 0.0, 'travel_miles_7d': 0.0}
+
+
+@timed('transform')
+def build_season(games, year):
+    """Rest, playing streak, last venue and recent travel for every team going into every day of a season
+
+    Each value is a (teams x days) array whose column d describes a team on the
+    morning of Jan 1 + d, computed with whole-array cumulative operations over
+    the season's games.
+    """
+    start = np.datetime64(f'{year}-01-01')
+    n_days = int((np.datetime64(f'{year + 1}-01-01') - start).astype(int))
+    day_numbers = np.arange(n_days)
+    index = {team: i for i, team in enumerate(TEAMS)}
+
+    games = games[games['home_team'].isin(index) & games['away_team'].isin(index)]
+    days = (pd.to_datetime(games['game_date']).to_numpy().astype('datetime64[D]') - start).astype(int)
+    home = games['home_team'].map(index).to_numpy()
+    away = games['away_team'].map(index).to_numpy()
+
+    # Venue (as a team index) each team played at on each day, -1 for days off; neutral sites count as the home park
+    venue = np.full((len(TEAMS), n_days), -1)
+    venue[home, days] = home
+    venue[away, days] = home
+    played = venue >= 0
+
+    last_game = np.maximum.accumulate(np.where(played, day_numbers, -1), axis=1)
+    last_off = np.maximum.accumulate(np.where(played, -1, day_numbers), axis=1)
+    last_venue = np.where(last_game >= 0, np.take_along_axis(venue, np.maximum(last_game, 0), axis=1), -1)
+
+    # Miles traveled into each game day from wherever the team last played, summed along the season
+    previous_venue = _going_into(last_venue, -1)
+    legs = np.where(played & (previous_venue >= 0), VENUE_MILES[np.maximum(previous_venue, 0), np.maximum(venue, 0)], 0.0)
+    travelled = _going_into(legs.cumsum(axis=1), 0.0)
+
+    prior = _going_into(last_game, -1)
+    return {
+        'rest_days': np.where(prior >= 0, np.minimum(day_numbers - prior - 1, MAX_REST_DAYS), MAX_REST_DAYS),
+        'games_streak': _going_into(day_numbers - last_off, 0),
+        'last_venue': previous_venue,
+        'travel_miles_7d': travelled - _going_into(travelled, 0.0, TRAVEL_DAYS)
+    }
+
+
+def _going_into(values, fill, days=1):
+    """Shift (teams x days) values right, so column d holds what was known after day d - days"""
+    shifted = np.full_like(values, fill)
+    shifted[:, days:] = values[:, :-days]
+    return shifted
+
+
+class ScheduleIndex:
+    """Per-season rest and travel arrays for all teams and dates, so each game's lookup is a few array reads
+
+    Games are taken from warehouse days not yet indexed and appended to a stored
+    game list; only the seasons those days fall in are rebuilt. Days the warehouse
+    doesn't have yet (today's games, when predicting tomorrow) can be filled in
+    from the schedule with add_scheduled; those are indexed but never stored.
+    """
+
+    def __init__(self, table_dir=TABLE_DIR):
+        self.table_dir = table_dir
+        self.index = {team: i for i, team in enumerate(TEAMS)}
+        # Stored game list, and scheduled games for days it doesn't cover
+        self.games = pd.DataFrame(columns=SCHEDULE_COLUMNS)
+        self.scheduled = pd.DataFrame(columns=SCHEDULE_COLUMNS)
+        # year -> {name: (teams x days) array}
+        self.seasons = {}
+
+    @property
+    def path(self):
+        return os.path.join(self.table_dir, 'schedule_games.csv')
+
+    @classmethod
+    def load(cls, table_dir=TABLE_DIR):
+        schedule = cls(table_dir)
+        if os.path.exists(schedule.path):
+            schedule.games = pd.read_csv(schedule.path)
+            schedule._index(schedule.games['game_date'].str[:4].astype(int).unique())
+        return schedule
+
+    def refresh(self, warehouse, full_names=None):
+        """Add warehouse days not yet in the game list, then rebuild the seasons they belong to"""
+        games = pd.read_csv(self.path) if os.path.exists(self.path) else None
+        done = set(games['game_date']) if games is not None else set()
+        new_days = [day for day in warehouse.dates() if day not in done]
+        if not new_days:
+            return False
+
+        statcast = warehouse.load(new_days[0], new_days[-1], columns=SCHEDULE_COLUMNS)
+        if statcast.empty:
+            return False
+        fresh = statcast.drop_duplicates('game_pk').copy()
+        fresh['game_date'] = pd.to_datetime(fresh['game_date']).dt.strftime('%Y-%m-%d')
+        fresh = fresh[fresh['game_date'].isin(new_days)]
+        codes = {code: normalize_team(code, full_names)
+                 for code in pd.concat([fresh['home_team'], fresh['away_team']]).dropna().unique()}
+        fresh['home_team'] = fresh['home_team'].map(codes)
+        fresh['away_team'] = fresh['away_team'].map(codes)
+        games = fresh if games is None else pd.concat([games, fresh], ignore_index=True)
+
+        os.makedirs(self.table_dir, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        games[SCHEDULE_COLUMNS].to_csv(tmp_path, index=False)
+        os.replace(tmp_path, self.path)
+
+        self.games = games
+        self.scheduled = self.scheduled[~self.scheduled['game_date'].isin(new_days)]
+        self._index({int(day[:4]) for day in new_days})
+        logger.info(f"🗓️ Schedule index updated with {len(new_days)} new day(s)")
+        return True
+
+    def add_scheduled(self, schedule):
+        """Index {game_date: {(home, away, game_number): ...}} games for days the stored game list doesn't have yet"""
+        played = set(self.games['game_date'])
+        rows = [(day, home, away) for day, slate in schedule.items() if day not in played for home, away, _ in slate]
+        fresh = pd.DataFrame(rows, columns=['game_date', 'home_team', 'away_team'])
+        if fresh.empty:
+            return False
+
+        kept = self.scheduled[~self.scheduled['game_date'].isin(fresh['game_date'])]
+        self.scheduled = pd.concat([kept, fresh], ignore_index=True)
+        self._index({int(day[:4]) for day in fresh['game_date']})
+        return True
+
+    def _index(self, years):
+        games = pd.concat([self.games, self.scheduled], ignore_index=True)
+        for year in years:
+            self.seasons[int(year)] = build_season(games[games['game_date'].str.startswith(str(year))], int(year))
+
+    def team_features(self, team, game_date, venue_team):
+        """Rest, playing streak and travel for a team going into a game at venue_team's park"""
+        day = datetime.strptime(game_date, '%Y-%m-%d')
+        season = self.seasons.get(day.year)
+        if season is None or team not in self.index or venue_team not in self.index:
+            return dict(NEUTRAL_SCHEDULE)
+
+        row, column = self.index[team], day.timetuple().tm_yday - 1
+        last_venue = season['last_venue'][row, column]
+        return {
+            'rest_days': int(season['rest_days'][row, column]),
+            'games_streak': int(season['games_streak'][row, column]),
+            'travel_miles': float(VENUE_MILES[last_venue, self.index[venue_team]]) if last_venue >= 0 else 0.0,
+            'travel_miles_7d': float(season['travel_miles_7d'][row, column])
+        }
+
+    def matchup_features(self, home_team, away_team, game_date):
+        home = self.team_features(home_team, game_date, home_team)
+        away = self.team_features(away_team, game_date, home_team)
+        features = {f'home_{name}': value for name, value in home.items()}
+        features.update({f'away_{name}': value for name, value in away.items()})
+        # Positive favors the home side
+        features['rest_diff'] = home['rest_days'] - away['rest_days']
+        features['travel_diff'] = away['travel_miles'] - home['travel_miles']
+        return features
@@ -0,0 +1,90 @@
+import os
+import json
+from datetime import datetime
+
+# Where per-slate prediction state is kept between runs
+STATE_DIR = 'state'
+
+
+def game_key(home_team, away_team, game_number=1):
+    """Stable key for one game on a slate; the second game of a doubleheader gets a #2 suffix"""
+    key = f"{away_team}@{home_team}"
+    return f"{key}#{game_number}" if game_number > 1 else key
+
+
+def game_label(home_team, away_team, game_number=1):
+    """Display name for one game on a slate"""
+    label = f"{away_team} @ {home_team}"
+    return f"{label} (Game {game_number})" if game_number > 1 else label
+
+
+class SlateState:
+    """What each game's published prediction was built from, so a rerun can patch it"""
+
+    def __init__(self, game_date, state_dir=STATE_DIR):
+        self.game_date = game_date
+        self.path = os.path.join(state_dir, f'slate-{game_date}.json')
+        # game key -> {'inputs': {...}, 'comparison': {...}}
+        self.games = {}
+        self.tweet_ids = []
+        self.pages = []
+        self.updated_at = None
+
+    @classmethod
+    def load(cls, game_date, state_dir=STATE_DIR):
+        """Load a slate's state, or an empty one if it was never saved"""
+        state = cls(game_date, state_dir)
+        if not os.path.exists(state.path):
+            return state
+
+        with open(state.path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        state.games = saved.get('games', {})
+        state.tweet_ids = saved.get('tweet_ids', [])
+        state.pages = saved.get('pages', [])
+        state.updated_at = saved.get('updated_at')
+        return state
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self.updated_at = datetime.now().isoformat()
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'game_date': self.game_date,
+                'games': self.games,
+                'tweet_ids': self.tweet_ids,
+                'pages': self.pages,
+                'updated_at': self.updated_at
+            }, f, indent=2, default=_to_json)
+        os.replace(tmp_path, self.path)
+
+    def record(self, key, inputs, comparison):
+        """Store the inputs and resulting comparison for one game"""
+        self.games[key] = {
+            'inputs': {name: _normalize(value) for name, value in inputs.items()},
+            'comparison': {name: _normalize(value) for name, value in comparison.items()}
+        }
+
+    def changed_inputs(self, key, inputs):
+        """Names of the inputs that differ from what the game was last built from"""
+        previous = self.games.get(key, {}).get('inputs', {})
+        return {
+            name for name, value in inputs.items()
+            if previous.get(name) != _normalize(value)
+        }
+
+    def comparisons(self):
+        return [record['comparison'] for record in self.games.values()]
+
+
+def _to_json(value):
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+def _normalize(value):
+    """Round-trip a value through JSON so saved and fresh inputs compare equal"""
+    return json.loads(json.dumps(value, default=_to_json))
@@ -0,0 +1,280 @@
+import os
+import json
+import time
+import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+import pandas as pd
+import pybaseball as pb
+import requests
+
+from instrumentation import timed, annotate, frame_stats
+from log_config import configure_logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow  # noqa: F401 - only needed for Parquet partitions
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+# One file per game date, plus a manifest of dates already fetched (including off days)
+WAREHOUSE_DIR = os.path.join('data', 'statcast')
+
+# Days of history kept up to date for park factors and other feature tables
+DEFAULT_WINDOW_DAYS = 60
+
+# Backfill: days per download chunk, concurrent downloads, and attempts per chunk before giving up
+BACKFILL_CHUNK_DAYS = 7
+BACKFILL_WORKERS = 4
+BACKFILL_ATTEMPTS = 3
+
+# MLB schedule, used to confirm that a day's games are all over, or that a day without pitches had none
+SCHEDULE_URL = 'https://statsapi.mlb.com/api/v1/schedule'
+SCHEDULE_TIMEOUT = 15
+
+# Scheduled games in these states never produce pitches
+NOT_PLAYED_STATES = ('Postponed', 'Cancelled')
+
+# A game in this state has thrown its last pitch
+FINAL_STATE = 'Final'
+
+
+def _date_range(start, end):
+    day = datetime.strptime(start, '%Y-%m-%d')
+    last = datetime.strptime(end, '%Y-%m-%d')
+    while day <= last:
+        yield day.strftime('%Y-%m-%d')
+        day += timedelta(days=1)
+
+
+def _chunks(days, chunk_days):
+    """Split sorted dates into runs of consecutive days, at most chunk_days long"""
+    chunk = []
+    for day in days:
+        consecutive = chunk and (datetime.strptime(day, '%Y-%m-%d') - datetime.strptime(chunk[-1], '%Y-%m-%d')).days == 1
+        if chunk and (not consecutive or len(chunk) >= chunk_days):
+            yield chunk
+            chunk = []
+        chunk.append(day)
+    if chunk:
+        yield chunk
+
+
+def schedule_status(start, end):
+    """{date: whether every game is over} for dates from start to end with a game played or scheduled
+
+    Raises when the schedule can't be fetched.
+    """
+    response = requests.get(SCHEDULE_URL, params={'sportId': '1', 'startDate': start, 'endDate': end},
+                            timeout=SCHEDULE_TIMEOUT)
+    response.raise_for_status()
+
+    status = {}
+    for entry in response.json().get('dates', []):
+        games = [game.get('status', {}) for game in entry.get('games', [])]
+        played = [game for game in games if game.get('detailedState') not in NOT_PLAYED_STATES]
+        if played:
+            status[entry['date']] = all(game.get('abstractGameState') == FINAL_STATE for game in played)
+    return status
+
+
+class StatcastWarehouse:
+    """Local date-partitioned copy of pitch-level Statcast data
+
+    Completed days never change, so each is downloaded once and later reads are
+    local. update() only requests the dates the manifest doesn't have yet. A day
+    is only stored once the schedule shows every game on it over, so a late game
+    still in progress at fetch time isn't left out for good, and a day that comes
+    back without pitches only enters the manifest once the schedule confirms
+    nothing was played. Either way the day is requested again next time.
+    """
+
+    def __init__(self, root=WAREHOUSE_DIR, schedule=schedule_status):
+        self.root = root
+        self.schedule = schedule
+        self.manifest_path = os.path.join(root, 'manifest.json')
+        self.progress_path = os.path.join(root, 'backfill.json')
+        self.fetched = set()
+        self._lock = threading.Lock()
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                self.fetched = set(json.load(f).get('dates', []))
+
+    def _partition_path(self, day):
+        extension = 'parquet' if HAS_PARQUET else 'pkl'
+        return os.path.join(self.root, f'date={day}.{extension}')
+
+    def _write_partition(self, day, df):
+        path = self._partition_path(day)
+        tmp_path = f"{path}.tmp"
+        if HAS_PARQUET:
+            df.to_parquet(tmp_path, index=False)
+        else:
+            df.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+
+    def _read_partition(self, day, columns=None):
+        path = self._partition_path(day)
+        if not os.path.exists(path):
+            return None
+        if HAS_PARQUET:
+            return pd.read_parquet(path, columns=columns)
+        df = pd.read_pickle(path)
+        return df[[col for col in columns if col in df.columns]] if columns else df
+
+    def _write_json(self, path, payload):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def _save_manifest(self):
+        self._write_json(self.manifest_path, {'dates': sorted(self.fetched), 'updated_at': datetime.now().isoformat()})
+
+    def _schedule_status(self, days):
+        """{date: every game over} for days with games, or None when the schedule can't be checked"""
+        if not days or self.schedule is None:
+            return None
+        try:
+            return self.schedule(days[0], days[-1])
+        except Exception as e:
+            logger.debug(f"Schedule check for {days[0]}..{days[-1]} failed: {e}")
+            return None
+
+    def _store(self, days, data):
+        """Write one partition per finished game date, then mark those days and confirmed off days as fetched
+
+        Days with games still to finish are skipped, and days without pitches are
+        only marked when the schedule can confirm them. Returns the requested days
+        that entered the manifest.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        status = self._schedule_status(days)
+        stored = set()
+        if not data.empty:
+            data['game_date'] = pd.to_datetime(data['game_date'])
+            for day, day_data in data.groupby(data['game_date'].dt.strftime('%Y-%m-%d')):
+                if status is not None and not status.get(day, True):
+                    logger.info(f"⏳ {day} still has games in progress, fetching it again next update")
+                    continue
+                self._write_partition(day, day_data.reset_index(drop=True))
+                stored.add(day)
+
+        off_days = set() if status is None else {day for day in days if day not in stored and day not in status}
+        done = (stored & set(days)) | off_days
+        with self._lock:
+            self.fetched.update(done)
+            self._save_manifest()
+        return sorted(done)
+
+    def missing_dates(self, start, end):
+        return [day for day in _date_range(start, end) if day not in self.fetched]
+
+    @timed('fetch')
+    def update(self, end=None, days_back=DEFAULT_WINDOW_DAYS):
+        """Download any completed days in the window that aren't stored yet; returns the new dates"""
+        end = end or (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+        start = (datetime.strptime(end, '%Y-%m-%d') - timedelta(days=days_back)).strftime('%Y-%m-%d')
+
+        missing = self.missing_dates(start, end)
+        if not missing:
+            return []
+
+        # One request spanning the gap; pybaseball splits it into its own chunks
+        logger.info(f"📦 Fetching Statcast {missing[0]} to {missing[-1]} into the warehouse...")
+        data = pb.statcast(start_dt=missing[0], end_dt=missing[-1])
+        annotate(**frame_stats(data))
+
+        return self._store(missing, data)
+
+    def _fetch_chunk(self, chunk, attempts=BACKFILL_ATTEMPTS):
+        for attempt in range(1, attempts + 1):
+            try:
+                data = pb.statcast(start_dt=chunk[0], end_dt=chunk[-1], verbose=False, parallel=False)
+                self._store(chunk, data)
+                return len(data)
+            except Exception as e:
+                if attempt == attempts:
+                    raise
+                logger.debug(f"Statcast {chunk[0]}..{chunk[-1]} attempt {attempt} failed: {e}")
+                time.sleep(2 ** attempt)
+
+    @timed('fetch')
+    def backfill(self, start, end, chunk_days=BACKFILL_CHUNK_DAYS, workers=BACKFILL_WORKERS):
+        """Download every missing day from start to end in parallel chunks; safe to rerun after a failure
+
+        Each chunk's partitions are written before its days enter the manifest, so
+        an interrupted run only repeats the chunks that hadn't finished.
+        Progress, including failed chunks and their errors, goes to backfill.json.
+        """
+        chunks = list(_chunks(self.missing_dates(start, end), chunk_days))
+        progress = {'start': start, 'end': end, 'chunks': len(chunks), 'done': 0, 'rows': 0,
+                    'failed': {}, 'started_at': datetime.now().isoformat()}
+        if not chunks:
+            logger.info(f"📦 Warehouse already has {start} to {end}")
+            return progress
+
+        logger.info(f"📦 Backfilling {len(chunks)} chunk(s) of up to {chunk_days} days "
+                    f"from {start} to {end} with {workers} workers...")
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(self._fetch_chunk, chunk): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                chunk = futures[future]
+                label = f"{chunk[0]}..{chunk[-1]}"
+                try:
+                    progress['rows'] += future.result()
+                    progress['done'] += 1
+                except Exception as e:
+                    progress['failed'][label] = f"{type(e).__name__}: {e}"
+                    logger.warning(f"⚠️ Statcast {label} failed, rerun the backfill to retry it ({e})")
+
+                progress['updated_at'] = datetime.now().isoformat()
+                self._write_json(self.progress_path, progress)
+                logger.info(f"📦 {progress['done']}/{len(chunks)} chunks stored ({progress['rows']} pitches)")
+
+        annotate(rows=progress['rows'])
+        return progress
+
+    def dates(self):
+        """Stored game dates (days with at least one pitch), in order"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name[len('date='):].split('.')[0] for name in os.listdir(self.root)
+                      if name.startswith('date=') and not name.endswith('.tmp'))
+
+    @timed('io')
+    def load(self, start=None, end=None, columns=None):
+        """Concatenate stored partitions between two dates (inclusive)"""
+        frames = []
+        for day in self.dates():
+            if (start and day < start) or (end and day > end):
+                continue
+            df = self._read_partition(day, columns)
+            if df is not None and not df.empty:
+                frames.append(df)
+
+        if not frames:
+            return pd.DataFrame(columns=columns or [])
+        data = pd.concat(frames, ignore_index=True)
+        annotate(**frame_stats(data))
+        return data
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed the local Statcast warehouse for a date range")
+    parser.add_argument('start', help="First date (YYYY-MM-DD)")
+    parser.add_argument('end', help="Last date (YYYY-MM-DD)")
+    parser.add_argument('--chunk-days', type=int, default=BACKFILL_CHUNK_DAYS, help="Days per download (1 for daily chunks)")
+    parser.add_argument('--workers', type=int, default=BACKFILL_WORKERS, help="Concurrent downloads")
+    parser.add_argument('--root', default=WAREHOUSE_DIR, help="Warehouse directory")
+    args = parser.parse_args()
+    configure_logging()
+
+    result = StatcastWarehouse(args.root).backfill(args.start, args.end, args.chunk_days, args.workers)
+    if result['failed']:
+        raise SystemExit(f"{len(result['failed'])} chunk(s) failed; rerun the same command to resume")
@@ -0,0 +1,245 @@
+import os
+import json
+import math
+import logging
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+import pandas as pd
+
+from instrumentation import timed
+from feature_tables import TABLE_DIR
+from venues import VENUES, normalize_team
+
+logger = logging.getLogger(__name__)
+
+RESULT_COLUMNS = ['game_date', 'game_pk', 'home_team', 'away_team', 'post_home_score', 'post_away_score']
+
+# Rating vector order; snapshots are stored as plain lists in this order
+TEAMS = sorted(VENUES)
+
+# Rating of a team with no games yet, and the league mean ratings regress toward
+BASE_RATING = 1500.0
+
+# Rating points exchanged per game before the margin-of-victory multiplier
+K_FACTOR = 6.0
+
+# Rating points added to the home side when computing the expected result
+HOME_ADVANTAGE = 24.0
+
+# Share of a team's distance from the league mean kept over the off-season
+SEASON_CARRYOVER = 2 / 3
+
+
+def game_results(statcast, full_names=None):
+    """One row per game with its final score, in date order
+
+    Uses the post-pitch scores, so the last pitch of each game carries the final result.
+    """
+    games = statcast.groupby('game_pk', as_index=False).agg(
+        game_date=('game_date', 'first'), home_team=('home_team', 'first'), away_team=('away_team', 'first'),
+        home_score=('post_home_score', 'max'), away_score=('post_away_score', 'max')
+    )
+    codes = {code: normalize_team(code, full_names)
+             for code in pd.concat([games['home_team'], games['away_team']]).dropna().unique()}
+    games['home_team'] = games['home_team'].map(codes)
+    games['away_team'] = games['away_team'].map(codes)
+    games['game_date'] = pd.to_datetime(games['game_date']).dt.strftime('%Y-%m-%d')
+    return games.sort_values(['game_date', 'game_pk']).reset_index(drop=True)
+
+
+def expected_home_win(home_rating, away_rating):
+    return 1.0 / (1.0 + 10 ** (-(home_rating + HOME_ADVANTAGE - away_rating) / 400.0))
+
+
+class TeamRatings:
+    """Elo ratings updated game by game from the results stream
+
+    Each game is a constant-time update of two ratings. After every game date the
+    full rating vector is snapshotted, so an as-of query is a bisect over the
+    snapshot dates rather than a replay. Season win/loss records are snapshotted
+    alongside, so standings as of any date come from the same bisect. Warehouse
+    days backfilled before the last rated date rewind to the snapshot before
+    them and are replayed in order.
+    """
+
+    def __init__(self, table_dir=TABLE_DIR):
+        self.table_dir = table_dir
+        self.index = {team: i for i, team in enumerate(TEAMS)}
+        self.ratings = [BASE_RATING] * len(TEAMS)
+        self.last_date = None
+        self.games = 0
+        # Season-to-date wins and losses, in rating vector order
+        self.wins = [0] * len(TEAMS)
+        self.losses = [0] * len(TEAMS)
+        # Warehouse days already processed, including days without games
+        self.rated_days = []
+        # Unrounded ratings and games processed after all games through snapshot_dates[i]
+        self.snapshot_dates = []
+        self.snapshots = []
+        self.snapshot_games = []
+        self.snapshot_records = []
+        # Snapshot position -> standings built from it
+        self._standings = {}
+
+    @property
+    def path(self):
+        return os.path.join(self.table_dir, 'team_ratings.json')
+
+    @classmethod
+    def load(cls, table_dir=TABLE_DIR):
+        ratings = cls(table_dir)
+        if os.path.exists(ratings.path):
+            with open(ratings.path) as f:
+                state = json.load(f)
+            # States saved before records were tracked are rebuilt from the warehouse on the next refresh
+            if state.get('teams') == TEAMS and 'snapshot_records' in state:
+                ratings.ratings = state['ratings']
+                ratings.last_date = state['last_date']
+                ratings.games = state['games']
+                ratings.snapshot_dates = state['snapshot_dates']
+                ratings.snapshots = state['snapshots']
+                # States saved before these were tracked rated every day through last_date
+                ratings.rated_days = state.get('rated_days')
+                ratings.snapshot_games = state.get('snapshot_games') or [state['games']] * len(ratings.snapshots)
+                ratings.wins, ratings.losses = state['wins'], state['losses']
+                ratings.snapshot_records = state['snapshot_records']
+        return ratings
+
+    def save(self):
+        os.makedirs(self.table_dir, exist_ok=True)
+        state = {
+            'teams': TEAMS, 'ratings': self.ratings, 'last_date': self.last_date, 'games': self.games,
+            'rated_days': self.rated_days, 'snapshot_dates': self.snapshot_dates, 'snapshots': self.snapshots,
+            'snapshot_games': self.snapshot_games, 'wins': self.wins, 'losses': self.losses,
+            'snapshot_records': self.snapshot_records
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+    def _start_season(self):
+        mean = sum(self.ratings) / len(self.ratings)
+        self.ratings = [mean + SEASON_CARRYOVER * (rating - mean) for rating in self.ratings]
+        self.wins = [0] * len(TEAMS)
+        self.losses = [0] * len(TEAMS)
+
+    def _snapshot(self, day):
+        self.snapshot_dates.append(day)
+        self.snapshots.append(list(self.ratings))
+        self.snapshot_games.append(self.games)
+        self.snapshot_records.append([list(self.wins), list(self.losses)])
+
+    def _rewind(self, day):
+        """Drop everything rated on or after day, restoring the ratings from the snapshot before it"""
+        position = bisect_left(self.snapshot_dates, day)
+        del self.snapshot_dates[position:], self.snapshots[position:], self.snapshot_games[position:]
+        del self.snapshot_records[position:]
+        self._standings = {}
+        self.ratings = list(self.snapshots[-1]) if self.snapshots else [BASE_RATING] * len(TEAMS)
+        wins, losses = self.snapshot_records[-1] if self.snapshot_records else ([0] * len(TEAMS), [0] * len(TEAMS))
+        self.wins, self.losses = list(wins), list(losses)
+        self.last_date = self.snapshot_dates[-1] if self.snapshot_dates else None
+        self.games = self.snapshot_games[-1] if self.snapshot_games else 0
+        self.rated_days = [rated for rated in self.rated_days if rated < day]
+
+    def update_game(self, home_team, away_team, home_score, away_score):
+        """Move both teams' ratings by one game's result"""
+        home, away = self.index[home_team], self.index[away_team]
+        expected = expected_home_win(self.ratings[home], self.ratings[away])
+        outcome = 1.0 if home_score > away_score else 0.0
+        change = K_FACTOR * math.log(abs(home_score - away_score) + 1) * (outcome - expected)
+        self.ratings[home] += change
+        self.ratings[away] -= change
+        winner, loser = (home, away) if outcome else (away, home)
+        self.wins[winner] += 1
+        self.losses[loser] += 1
+        self.games += 1
+
+    @timed('transform')
+    def process(self, results):
+        """Apply a date-ordered frame from game_results; dates already processed are skipped"""
+        current = None
+        for day, home, away, home_score, away_score in zip(
+                results['game_date'], results['home_team'], results['away_team'],
+                results['home_score'], results['away_score']):
+            if self.last_date and day <= self.last_date:
+                continue
+            if home not in self.index or away not in self.index or home_score == away_score:
+                continue
+            if day != current:
+                if current:
+                    self._snapshot(current)
+                previous = current or self.last_date
+                if previous and day[:4] != previous[:4]:
+                    self._start_season()
+                current = day
+            self.update_game(home, away, home_score, away_score)
+
+        if current:
+            self._snapshot(current)
+            self.last_date = current
+
+    def refresh(self, warehouse, full_names=None):
+        """Process warehouse days not yet rated and persist the new state
+
+        When any of them fall on or before the last rated date, the ratings are
+        rewound to before the earliest one and every day from there is replayed.
+        """
+        days = warehouse.dates()
+        if self.rated_days is None:
+            self.rated_days = [day for day in days if self.last_date and day <= self.last_date]
+        rated = set(self.rated_days)
+        new_days = [day for day in days if day not in rated]
+        if not new_days:
+            return False
+        if self.last_date and new_days[0] <= self.last_date:
+            logger.info(f"⏪ Warehouse backfilled from {new_days[0]}, replaying team ratings from there")
+            self._rewind(new_days[0])
+            new_days = [day for day in days if day >= new_days[0]]
+
+        statcast = warehouse.load(new_days[0], new_days[-1], columns=RESULT_COLUMNS)
+        before = self.games
+        if not statcast.empty:
+            self.process(game_results(statcast, full_names))
+        self.rated_days = sorted(set(self.rated_days).union(new_days))
+        self.save()
+        logger.info(f"📈 Team ratings updated with {self.games - before} game(s) through {self.last_date}")
+        return True
+
+    def ratings_as_of(self, day):
+        """{team: rating} after every game played on or before day"""
+        position = bisect_right(self.snapshot_dates, day) - 1
+        ratings = self.snapshots[position] if position >= 0 else [BASE_RATING] * len(TEAMS)
+        return {team: round(rating, 2) for team, rating in zip(TEAMS, ratings)}
+
+    def standings_as_of(self, day):
+        """{team: wins, losses and win_pct} for day's season, counting games played on or before day"""
+        position = bisect_right(self.snapshot_dates, day) - 1
+        if position < 0 or self.snapshot_dates[position][:4] != day[:4]:
+            return {}
+        if position not in self._standings:
+            wins, losses = self.snapshot_records[position]
+            self._standings[position] = {
+                team: {'wins': won, 'losses': lost, 'win_pct': round(won / (won + lost), 3)}
+                for team, won, lost in zip(TEAMS, wins, losses) if won + lost
+            }
+        return self._standings[position]
+
+    def rating(self, team, day):
+        position = bisect_right(self.snapshot_dates, day) - 1
+        if position < 0 or team not in self.index:
+            return BASE_RATING
+        return round(self.snapshots[position][self.index[team]], 2)
+
+    def matchup_features(self, home_team, away_team, game_date):
+        """Both teams' ratings going into game_date, from the snapshot of the day before"""
+        before = (datetime.strptime(game_date, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')
+        home = self.rating(home_team, before)
+        away = self.rating(away_team, before)
+        return {
+            'home_elo': home,
+            'away_elo': away,
+            'elo_diff': home + HOME_ADVANTAGE - away,
+            'elo_home_win_prob': expected_home_win(home, away)
+        }
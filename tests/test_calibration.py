@@ -0,0 +1,73 @@
+import numpy as np
+
+from baseball_predictor import BaseballSavantPredictor
+from calibration import CURVE_GRID, ProbabilityCalibrator, walk_forward_probabilities
+from feature_schema import SCHEMA
+from model_backends import LogisticBackend, ModelBackend
+
+
+class RecordingBackend(ModelBackend):
+    """Records which rows (column 0 holds the row number) each fold trained on and scored"""
+
+    name = 'recording'
+    folds = []
+
+    def build(self):
+        return None
+
+    def fit(self, X, y):
+        self.trained = X[:, 0]
+        return self
+
+    def predict_proba(self, X):
+        RecordingBackend.folds.append((self.trained, X[:, 0]))
+        return np.full(len(X), 0.5)
+
+
+def _raw_probabilities(n_rows, seed=5):
+    """Raw probabilities that run too extreme, with outcomes drawn from a shrunk version of them"""
+    rng = np.random.default_rng(seed)
+    raw = rng.uniform(0.05, 0.95, n_rows)
+    outcomes = (rng.uniform(size=n_rows) < 0.5 + 0.6 * (raw - 0.5)).astype(int)
+    return raw, outcomes
+
+
+def test_walk_forward_folds_only_train_on_earlier_games():
+    RecordingBackend.folds = []
+    X = np.column_stack([np.arange(60), np.zeros(60)])
+    y = np.tile([0, 1], 30)
+
+    oof = walk_forward_probabilities(RecordingBackend(), X, y, folds=5)
+
+    assert len(RecordingBackend.folds) == 5
+    for trained, scored in RecordingBackend.folds:
+        assert trained.max() < scored.min()
+    # The first block has no history to train on
+    assert np.isnan(oof[:10]).all() and not np.isnan(oof[10:]).any()
+
+
+def test_calibration_curves_are_monotone():
+    for n_rows, method in ((60, 'platt'), (400, 'isotonic')):
+        calibrator = ProbabilityCalibrator().fit(*_raw_probabilities(n_rows))
+        assert calibrator.method == method
+        assert (np.diff(calibrator.curve) >= 0).all()
+        # Over-confident raw probabilities get pulled toward the middle
+        assert calibrator.transform(0.9) < 0.9 and calibrator.transform(0.1) > 0.1
+
+
+def test_calibrator_round_trips_through_the_model_artifact(tmp_path):
+    rng = np.random.default_rng(2)
+    X = rng.normal(size=(300, len(SCHEMA.names)))
+    y = (X[:, 0] + rng.normal(size=300) > 0).astype(int)
+
+    trained = BaseballSavantPredictor(model_backend='logistic')
+    trained.model = LogisticBackend().fit(X, y)
+    trained.feature_columns = SCHEMA.names
+    trained.calibrator = ProbabilityCalibrator().fit(*_raw_probabilities(300))
+    path = trained.save_model(str(tmp_path / 'model.pkl'))
+
+    loaded = BaseballSavantPredictor(model_backend='logistic')
+    loaded.load_model(path)
+    assert loaded.calibrator.method == trained.calibrator.method == 'isotonic'
+    np.testing.assert_array_equal(loaded.calibrator.curve, trained.calibrator.curve)
+    np.testing.assert_array_equal(loaded.calibrator.transform(CURVE_GRID), trained.calibrator.transform(CURVE_GRID))
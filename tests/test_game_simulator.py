@@ -0,0 +1,42 @@
+from math import comb
+
+import numpy as np
+
+from game_simulator import MAX_RUNS, PA_OUTCOMES, GameSimulator, half_inning_run_distributions
+
+
+def _only(**probabilities):
+    return np.array([probabilities.get(outcome, 0.0) for outcome in PA_OUTCOMES])
+
+
+def test_markov_solve_matches_a_home_run_or_strikeout_inning():
+    # Every PA is a strikeout (p) or a solo home run, so runs are home runs before the third
+    # strikeout: negative binomial, with 3(1 - p) / p expected runs per inning
+    p = 0.75
+    standard, ghost = half_inning_run_distributions(_only(strikeout=p, home_run=1 - p))
+
+    expected = np.array([comb(k + 2, 2) * p ** 3 * (1 - p) ** k for k in range(MAX_RUNS)])
+    np.testing.assert_allclose(standard[:MAX_RUNS], expected, atol=1e-12)
+    assert abs(standard[MAX_RUNS] - (1 - expected.sum())) < 1e-12
+    assert abs(np.dot(np.arange(MAX_RUNS + 1), standard) - 3 * (1 - p) / p) < 1e-6
+
+    # The ghost runner scores on the first home run, adding a run to every inning that has one
+    assert ghost[0] == standard[0]
+    np.testing.assert_allclose(ghost[2:MAX_RUNS], standard[1:MAX_RUNS - 1], atol=1e-12)
+    assert ghost[1] == 0
+
+
+def test_an_inning_of_outs_scores_nothing():
+    standard, ghost = half_inning_run_distributions(_only(strikeout=0.5, out=0.5))
+    assert standard[0] == ghost[0] == 1.0
+
+
+def test_simulations_are_reproducible_per_seed_and_matchup():
+    def simulate(seed, key):
+        return GameSimulator(n_sims=2000, seed=seed).simulate({}, {}, {}, {}, key=key)
+
+    first = simulate(7, '2025-05-01 BOS@NYY')
+    assert simulate(7, '2025-05-01 BOS@NYY') == first
+    assert simulate(7, '2025-05-01 BOS@NYY#2') != first
+    assert simulate(8, '2025-05-01 BOS@NYY') != first
+    assert first['home_win_probability'] + first['away_win_probability'] == 1.0
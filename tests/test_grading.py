@@ -0,0 +1,100 @@
+import os
+import json
+
+import pandas as pd
+import pytest
+
+from grading import SeasonLedger, grade_pending, grade_slate
+
+# (game_date, game_pk, home, away, home score, away score); NYY-BOS play a doubleheader on 05-01
+RESULTS = [
+    ('2025-05-01', 11, 'NYY', 'BOS', 5, 3),
+    ('2025-05-01', 12, 'NYY', 'BOS', 2, 6),
+    ('2025-05-01', 13, 'LAD', 'SF', 4, 1),
+    ('2025-05-02', 21, 'NYY', 'BOS', 1, 4),
+]
+
+# Published picks, the doubleheader's second game listed first; LAD-SF had no odds
+PREDICTIONS = {
+    '2025-05-01': [
+        {'game': 'BOS @ NYY (Game 2)', 'home_team': 'NYY', 'away_team': 'BOS', 'game_number': 2,
+         'predicted_winner': 'NYY', 'model_home_prob': 0.55, 'home_odds': -120, 'away_odds': 100},
+        {'game': 'BOS @ NYY', 'home_team': 'NYY', 'away_team': 'BOS', 'game_number': 1,
+         'predicted_winner': 'NYY', 'model_home_prob': 0.6, 'home_odds': -150, 'away_odds': 130},
+        {'game': 'SF @ LAD', 'home_team': 'LAD', 'away_team': 'SF', 'game_number': 1,
+         'predicted_winner': 'SF', 'model_home_prob': 0.45, 'home_odds': None, 'away_odds': None},
+    ],
+    '2025-05-02': [
+        {'game': 'BOS @ NYY', 'home_team': 'NYY', 'away_team': 'BOS', 'game_number': 1,
+         'predicted_winner': 'BOS', 'model_home_prob': 0.4, 'home_odds': -140, 'away_odds': 120},
+    ],
+}
+
+
+class FakeWarehouse:
+    """Serves one pitch per game carrying its final score"""
+
+    def dates(self):
+        return sorted({game[0] for game in RESULTS})
+
+    def load(self, start=None, end=None, columns=None):
+        rows = [game for game in RESULTS if start <= game[0] <= end]
+        return pd.DataFrame(rows, columns=['game_date', 'game_pk', 'home_team', 'away_team',
+                                           'post_home_score', 'post_away_score'])
+
+
+@pytest.fixture
+def feed_dir(tmp_path):
+    for day, predictions in PREDICTIONS.items():
+        with open(tmp_path / f'predictions-{day}.json', 'w', encoding='utf-8') as f:
+            json.dump(predictions, f)
+    return str(tmp_path)
+
+
+def test_grading_appends_each_day_once_and_keeps_running_totals(feed_dir):
+    [ledger] = grade_pending(FakeWarehouse(), feed_dir=feed_dir, through='2025-05-01')
+    assert ledger.graded_dates == ['2025-05-01']
+    assert ledger.totals['graded'] == 3
+    assert ledger.totals['correct'] == 1
+    assert ledger.totals['staked'] == 2
+    assert ledger.totals['profit'] == pytest.approx(100 / 150 - 1, abs=1e-4)
+
+    # The next run only grades the new day, appending to the ledger and the totals
+    [ledger] = grade_pending(FakeWarehouse(), feed_dir=feed_dir)
+    [ledger] = grade_pending(FakeWarehouse(), feed_dir=feed_dir)
+    assert ledger.graded_dates == ['2025-05-01', '2025-05-02']
+
+    rows = pd.read_csv(os.path.join(feed_dir, 'ledger-2025.csv'))
+    assert list(rows['game_date']) == ['2025-05-01'] * 3 + ['2025-05-02']
+
+    totals = SeasonLedger.load(2025, feed_dir).totals
+    assert totals['graded'] == len(rows) == 4
+    assert totals['correct'] == rows['correct'].sum() == 2
+    assert totals['brier_sum'] == pytest.approx(rows['brier'].sum())
+    assert totals['profit'] == pytest.approx(rows['profit'].sum())
+
+    summary = SeasonLedger.load(2025, feed_dir).summary()
+    assert (summary['wins'], summary['losses'], summary['through']) == (2, 2, '2025-05-02')
+    assert summary['roi'] == pytest.approx((100 / 150 - 1 + 1.2) / 3, abs=1e-4)
+    assert summary['last_day'] == {'game_date': '2025-05-02', 'wins': 1, 'losses': 0, 'units': 1.2}
+
+
+def test_doubleheader_games_are_graded_against_their_own_scores():
+    predictions = pd.DataFrame(PREDICTIONS['2025-05-01']).assign(game_date='2025-05-01')
+    results = pd.DataFrame([game[1:] for game in RESULTS if game[0] == '2025-05-01'],
+                           columns=['game_pk', 'home_team', 'away_team', 'home_score', 'away_score'])
+
+    graded = grade_slate(predictions, results).set_index('game')
+    assert graded.loc['BOS @ NYY', ['home_score', 'away_score', 'correct']].tolist() == [5, 3, 1]
+    assert graded.loc['BOS @ NYY (Game 2)', ['home_score', 'away_score', 'correct']].tolist() == [2, 6, 0]
+    assert graded.loc['BOS @ NYY', 'profit'] == pytest.approx(100 / 150, abs=1e-4)
+    assert graded.loc['BOS @ NYY (Game 2)', 'profit'] == -1.0
+
+    # No odds: graded for accuracy but not staked
+    assert graded.loc['SF @ LAD', ['correct', 'stake', 'profit']].tolist() == [0, 0.0, 0.0]
+    assert graded.loc['SF @ LAD', 'brier'] == pytest.approx(0.55 ** 2)
+
+    # A feed written before game numbers existed is numbered in slate order
+    legacy = predictions.drop(columns=['game_number']).iloc[[1, 0, 2]]
+    graded = grade_slate(legacy, results).set_index('game')
+    assert graded.loc['BOS @ NYY (Game 2)', 'correct'] == 0
@@ -0,0 +1,140 @@
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from benchmarks.fixtures import FixtureReplay
+from benchmarks.synthetic import SyntheticLeague, write_synthetic_fixtures
+from feature_schema import SCHEMA
+from team_ratings import RESULT_COLUMNS, game_results
+from model_backends import ForestBackend
+
+# A short, light synthetic stretch keeps the replay quick
+START, END = '2025-05-01', '2025-05-24'
+PITCHES_PER_GAME = 120
+
+
+def _day_before(day):
+    return (datetime.strptime(day, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')
+
+
+@pytest.fixture(scope='module')
+def replay(tmp_path_factory):
+    """A trained automation inside a FixtureReplay of a synthetic league, working in a scratch directory"""
+    fixture_dir = tmp_path_factory.mktemp('fixtures')
+    write_synthetic_fixtures(START, END, str(fixture_dir), seed=7, pitches_per_game=PITCHES_PER_GAME)
+
+    with FixtureReplay(str(fixture_dir), workdir=str(tmp_path_factory.mktemp('work'))) as fixtures:
+        from github_twitter_automation import GitHubTwitterAutomation
+
+        day = fixtures.slate_dates()[-1]
+        fixtures.set_today(_day_before(day))
+        automation = GitHubTwitterAutomation()
+        automation.twitter_client = None
+        automation.predictor.odds_api_key = 'fixture'
+        automation.predictor.refresh_feature_tables()
+        automation.predictor.train_model()
+        yield fixtures, automation, day
+
+
+# One column per precomputed table: park, handedness splits, bullpen, Elo and schedule
+TABLE_COLUMNS = ['park_run_factor', 'home_offense_woba_vs_hand', 'home_bullpen_pitches_7d', 'home_elo', 'home_travel_miles_7d']
+
+
+def test_create_features_fills_every_schema_column(replay):
+    _, automation, day = replay
+    predictor = automation.predictor
+    slate = predictor.get_slate_probable_pitchers(day)
+    assert slate
+
+    (home_team, away_team, _), pitchers = next(iter(slate.items()))
+    features = predictor.create_features(home_team, away_team, day, pitchers)
+    values = SCHEMA.encode(features)
+    assert len(values) == len(SCHEMA)
+    assert np.isfinite(values).all()
+
+
+def test_replay_stays_in_its_working_directory(replay):
+    fixtures, _, _ = replay
+    assert os.getcwd() == os.path.realpath(fixtures.workdir)
+    assert os.path.isdir(os.path.join('data', 'statcast'))
+
+
+def test_feature_tables_reach_slate_and_training_rows(replay):
+    _, automation, day = replay
+    predictor = automation.predictor
+    slate = predictor.get_slate_probable_pitchers(day)
+    rows = [SCHEMA.encode(predictor.create_features(home, away, day, pitchers)) for (home, away, _), pitchers in slate.items()]
+    slate_frame = SCHEMA.frame(np.array(rows))
+    training = predictor.prepare_training_data(force_real_data=True)
+
+    for frame in (slate_frame, training):
+        for column in TABLE_COLUMNS:
+            assert (frame[column] != SCHEMA.defaults[SCHEMA.index[column]]).any(), column
+
+
+def test_training_row_standings_exclude_games_from_its_date_on(replay):
+    _, automation, day = replay
+    predictor = automation.predictor
+    results = game_results(predictor.warehouse.load(START, day, columns=RESULT_COLUMNS), predictor.savant_teams)
+    game = results[results['game_date'] < day].iloc[-1]
+    home, away = game['home_team'], game['away_team']
+
+    with predictor.as_of_date(predictor.as_of_for(game['game_date'])):
+        standings = predictor.get_team_standings(game['game_date'])
+        features = predictor.create_features(home, away, game['game_date'])
+
+    before = results[(results['game_date'] < game['game_date']) & (results['home_score'] != results['away_score'])]
+    home_won = before['home_score'] > before['away_score']
+    for team in (home, away):
+        wins = int(((before['home_team'] == team) & home_won).sum() + ((before['away_team'] == team) & ~home_won).sum())
+        played = int(((before['home_team'] == team) | (before['away_team'] == team)).sum())
+        assert (standings[team]['wins'], standings[team]['losses']) == (wins, played - wins)
+    assert features['home_win_pct'] == pytest.approx(standings[home]['win_pct'])
+
+
+def test_compare_with_odds_and_render(replay):
+    _, automation, day = replay
+    predictor = automation.predictor
+    slate = predictor.get_slate_probable_pitchers(day)
+
+    comparisons = predictor.compare_predictions_with_odds(day)
+    assert {(c['home_team'], c['away_team'], c['game_number']) for c in comparisons} == set(slate)
+    for comparison in comparisons:
+        assert comparison['model_home_prob'] + comparison['model_away_prob'] == pytest.approx(1.0)
+        assert comparison['home_odds'] is not None
+
+    data = {'predictions': comparisons, 'generated_at': datetime.now(), 'game_date': day}
+    page = automation.create_github_pages_content(data)
+    assert f'<!-- slate:{day} -->' in page
+    assert page.count('<!-- game:') == len(comparisons)
+    assert automation.create_twitter_thread(data)
+
+
+def _synthetic_matrix(n_rows=400, seed=3):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_rows, 12))
+    y = (X[:, 0] + 0.5 * X[:, 3] + rng.normal(scale=0.8, size=n_rows) > 0).astype(int)
+    return X, y
+
+
+def test_compiled_forest_matches_sklearn():
+    X, y = _synthetic_matrix()
+    backend = ForestBackend().fit(X, y)
+    np.testing.assert_array_equal(backend.compiled.predict_proba(X), backend.estimator.predict_proba(X))
+
+
+def test_explainer_contributions_add_up_to_the_probability():
+    X, y = _synthetic_matrix()
+    backend = ForestBackend().fit(X, y)
+    explainer = backend.explainer()
+    contributions = explainer.contributions(X[:50])
+    np.testing.assert_allclose(explainer.bias + contributions.sum(axis=1), backend.predict_proba(X[:50]), atol=1e-12)
+
+
+def test_synthetic_league_is_seeded():
+    first, second = SyntheticLeague(seed=11, pitches_per_game=60), SyntheticLeague(seed=11, pitches_per_game=60)
+    games = first.schedule(START, '2025-05-03')
+    assert games.equals(second.schedule(START, '2025-05-03'))
+    assert first.statcast(games).equals(second.statcast(games))
@@ -0,0 +1,60 @@
+import pandas as pd
+
+from schedule_index import MAX_REST_DAYS, ScheduleIndex
+from venues import distance_miles
+
+# (game_date, game_pk, home, away): NYY host BOS twice, both are off on 05-03, then NYY go to Boston and LA
+GAMES = [
+    ('2025-05-01', 1, 'NYY', 'BOS'),
+    ('2025-05-02', 2, 'NYY', 'BOS'),
+    ('2025-05-04', 3, 'BOS', 'NYY'),
+    ('2025-05-05', 4, 'LAD', 'NYY'),
+]
+
+
+class FakeWarehouse:
+    """Serves two pitches per game"""
+
+    def dates(self):
+        return sorted({game[0] for game in GAMES})
+
+    def load(self, start=None, end=None, columns=None):
+        rows = [game for game in GAMES if start <= game[0] <= end] * 2
+        return pd.DataFrame(rows, columns=['game_date', 'game_pk', 'home_team', 'away_team'])
+
+
+def _features(schedule, team, game_date, venue_team):
+    features = schedule.team_features(team, game_date, venue_team)
+    return features['rest_days'], features['games_streak'], features['travel_miles'], features['travel_miles_7d']
+
+
+def test_rest_streak_and_travel_on_a_known_schedule(tmp_path):
+    schedule = ScheduleIndex(str(tmp_path))
+    assert schedule.refresh(FakeWarehouse())
+    nyy_bos = distance_miles('NYY', 'BOS')
+
+    # A season's first game counts as fully rested
+    assert _features(schedule, 'NYY', '2025-05-01', 'NYY') == (MAX_REST_DAYS, 0, 0.0, 0.0)
+    assert _features(schedule, 'BOS', '2025-05-02', 'NYY') == (0, 1, 0.0, 0.0)
+    assert _features(schedule, 'BOS', '2025-05-04', 'BOS') == (1, 0, nyy_bos, 0.0)
+    assert _features(schedule, 'NYY', '2025-05-04', 'BOS') == (1, 0, nyy_bos, 0.0)
+    assert _features(schedule, 'NYY', '2025-05-05', 'LAD') == (0, 1, distance_miles('BOS', 'LAD'), nyy_bos)
+
+    # Reloading from the stored game list rebuilds the same arrays
+    assert _features(ScheduleIndex.load(str(tmp_path)), 'NYY', '2025-05-05', 'LAD') == \
+        _features(schedule, 'NYY', '2025-05-05', 'LAD')
+
+
+def test_scheduled_games_are_indexed_but_not_stored(tmp_path):
+    schedule = ScheduleIndex(str(tmp_path))
+    schedule.refresh(FakeWarehouse())
+    with open(schedule.path, 'rb') as f:
+        stored = f.read()
+
+    assert schedule.add_scheduled({'2025-05-06': {('LAD', 'NYY', 1): {}}})
+    assert _features(schedule, 'NYY', '2025-05-07', 'LAD') == (0, 3, 0.0, distance_miles('NYY', 'BOS') + distance_miles('BOS', 'LAD'))
+    # Days the stored list already has are left alone
+    assert not schedule.add_scheduled({'2025-05-05': {('LAD', 'NYY', 1): {}}})
+
+    with open(schedule.path, 'rb') as f:
+        assert f.read() == stored
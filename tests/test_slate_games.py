@@ -0,0 +1,53 @@
+from baseball_predictor import BaseballSavantPredictor
+from slate_state import game_key
+
+DAY = '2025-05-10'
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+        self.status_code = 200
+
+    def json(self):
+        return self.payload
+
+
+def _scheduled(game_number, home_pitcher, away_pitcher):
+    teams = {
+        'home': {'team': {'name': 'New York Yankees'}, 'probablePitcher': {'id': game_number * 10, 'fullName': home_pitcher}},
+        'away': {'team': {'name': 'Boston Red Sox'}, 'probablePitcher': {'id': game_number * 10 + 1, 'fullName': away_pitcher}}
+    }
+    return {'gamePk': 700 + game_number, 'gameNumber': game_number, 'teams': teams}
+
+
+def _odds(commence_time, home_odds):
+    return {'home_team': 'NYY', 'away_team': 'BOS', 'home_odds': home_odds, 'away_odds': 120,
+            'commence_time': commence_time}
+
+
+def test_doubleheader_games_keep_their_own_pitchers_and_odds(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    predictor = BaseballSavantPredictor()
+    payload = {'dates': [{'date': DAY, 'games': [_scheduled(1, 'Cole', 'Crochet'), _scheduled(2, 'Rodon', 'Bello')]}]}
+    monkeypatch.setattr(predictor, '_http_get', lambda source, url, params: FakeResponse(payload))
+    monkeypatch.setattr(predictor, 'get_mlb_odds', lambda game_date=None: [_odds(f'{DAY}T23:05:00Z', -110), _odds(f'{DAY}T17:05:00Z', -150)])
+
+    slate = predictor.get_schedule(DAY)[DAY]
+    assert slate[('NYY', 'BOS', 1)]['home_pitcher']['name'] == 'Cole'
+    assert slate[('NYY', 'BOS', 2)]['home_pitcher']['name'] == 'Rodon'
+    assert predictor.get_probable_pitchers('NYY', 'BOS', DAY, game_number=2)['away_pitcher']['name'] == 'Bello'
+
+    # Odds are numbered by start time, so the afternoon game is game 1
+    odds = predictor.get_slate_odds(DAY)
+    assert odds[('NYY', 'BOS', 1)]['home_odds'] == -150
+    assert odds[('NYY', 'BOS', 2)]['home_odds'] == -110
+    assert game_key('NYY', 'BOS', 1) != game_key('NYY', 'BOS', 2)
+
+
+def test_sample_odds_are_dated_for_the_requested_slate(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    predictor = BaseballSavantPredictor()
+    odds = predictor.get_slate_odds('2025-08-03')
+    assert len(odds) == len(predictor._get_sample_odds())
+    assert all(game['commence_time'].startswith('2025-08-03') for game in odds.values())
@@ -0,0 +1,28 @@
+import pandas as pd
+
+import statcast_warehouse
+from statcast_warehouse import StatcastWarehouse
+
+
+def _pitches(*days):
+    return pd.DataFrame({'game_date': list(days), 'pitcher': range(len(days))})
+
+
+def test_a_day_with_a_game_in_progress_is_fetched_again(tmp_path, monkeypatch):
+    # 05-02's late game was still going at the first fetch; 05-03 was an off day
+    finished = {'2025-05-01': True, '2025-05-02': False}
+    warehouse = StatcastWarehouse(str(tmp_path), schedule=lambda start, end: dict(finished))
+    monkeypatch.setattr(statcast_warehouse.pb, 'statcast',
+                        lambda start_dt, end_dt, **kwargs: _pitches('2025-05-01', '2025-05-02'))
+
+    assert warehouse.update(end='2025-05-03', days_back=2) == ['2025-05-01', '2025-05-03']
+    assert warehouse.dates() == ['2025-05-01']
+
+    finished['2025-05-02'] = True
+    requested = []
+    monkeypatch.setattr(statcast_warehouse.pb, 'statcast',
+                        lambda start_dt, end_dt, **kwargs: requested.append((start_dt, end_dt)) or _pitches('2025-05-02', '2025-05-02'))
+
+    assert warehouse.update(end='2025-05-03', days_back=2) == ['2025-05-02']
+    assert requested == [('2025-05-02', '2025-05-02')]
+    assert len(warehouse.load('2025-05-02', '2025-05-02')) == 2
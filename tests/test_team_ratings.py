@@ -0,0 +1,42 @@
+import pandas as pd
+
+from team_ratings import TeamRatings
+
+# (game_date, game_pk, home, away, home score, away score)
+GAMES = [
+    ('2025-05-01', 1, 'NYY', 'BOS', 5, 3),
+    ('2025-05-01', 2, 'LAD', 'SF', 2, 7),
+    ('2025-05-02', 3, 'NYY', 'BOS', 1, 4),
+    ('2025-05-02', 4, 'SF', 'LAD', 6, 5),
+    ('2025-05-03', 5, 'BOS', 'NYY', 9, 2),
+    ('2025-05-04', 6, 'LAD', 'SF', 3, 1),
+]
+
+
+class FakeWarehouse:
+    """Serves one pitch per game for the stored days"""
+
+    def __init__(self, days):
+        self.days = sorted(days)
+
+    def dates(self):
+        return self.days
+
+    def load(self, start=None, end=None, columns=None):
+        rows = [game for game in GAMES if game[0] in self.days and start <= game[0] <= end]
+        return pd.DataFrame(rows, columns=['game_date', 'game_pk', 'home_team', 'away_team',
+                                           'post_home_score', 'post_away_score'])
+
+
+def test_backfilled_replay_matches_a_full_replay(tmp_path):
+    every_day = sorted({game[0] for game in GAMES})
+    full = TeamRatings(str(tmp_path / 'full'))
+    full.refresh(FakeWarehouse(every_day))
+
+    backfilled = TeamRatings(str(tmp_path / 'backfilled'))
+    backfilled.refresh(FakeWarehouse([day for day in every_day if day != '2025-05-02']))
+    backfilled.refresh(FakeWarehouse(every_day))
+
+    assert backfilled.ratings == full.ratings
+    assert backfilled.snapshots == full.snapshots
+    assert backfilled.games == full.games == len(GAMES)
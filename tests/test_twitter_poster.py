@@ -0,0 +1,59 @@
+import threading
+
+from twitter_poster import ThreadPostingQueue, TweetEndpoint, make_stub_server, pending_threads
+
+
+class FakeClock:
+    """Unix time that only moves when the queue sleeps"""
+
+    def __init__(self, now=1_750_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def _start_stub(limit, window, clock):
+    """Run the stub endpoint on a free port against the fake clock and return its base URL"""
+    server = make_stub_server(0, limit, window, clock=clock)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f'http://127.0.0.1:{server.server_address[1]}'
+
+
+def test_rate_limited_thread_resumes_without_reposting(tmp_path):
+    clock = FakeClock()
+    base_url = _start_stub(limit=2, window=2, clock=clock)
+    endpoint = TweetEndpoint(base_url=base_url)
+
+    queue = ThreadPostingQueue(endpoint, 'slate-test', state_dir=tmp_path, clock=clock, sleep=clock.sleep)
+    queue.enqueue(['one', 'two', 'three'])
+    assert queue.post_next()
+
+    # Another client spends the rest of the window, so the next post gets a 429
+    TweetEndpoint(base_url=base_url).create_tweet('elsewhere')
+    assert not queue.post_next()
+    assert queue.next_attempt_at == clock.now + 2
+    assert pending_threads(tmp_path) == ['slate-test']
+
+    # A later run picks the thread up from disk and sleeps exactly until the window resets
+    resumed = ThreadPostingQueue(endpoint, 'slate-test', state_dir=tmp_path, clock=clock, sleep=clock.sleep)
+    assert resumed.posted_ids == ['1']
+    start = clock.now
+    assert resumed.run()
+    assert clock.now == start + 2
+    assert resumed.posted_ids == ['1', '3', '4']
+    assert pending_threads(tmp_path) == []
+
+
+def test_thread_pauses_when_the_limit_resets_after_the_deadline(tmp_path):
+    clock = FakeClock()
+    endpoint = TweetEndpoint(base_url=_start_stub(limit=1, window=60, clock=clock))
+
+    queue = ThreadPostingQueue(endpoint, 'slate-paused', state_dir=tmp_path, clock=clock, sleep=clock.sleep)
+    queue.enqueue(['one', 'two'])
+    assert queue.start(max_wait=30).wait() == ['1']
+    assert clock.now == 1_750_000_000.0
+    assert pending_threads(tmp_path) == ['slate-paused']
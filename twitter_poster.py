@@ -0,0 +1,264 @@
+import os
+import json
+import time
+import logging
+import argparse
+import threading
+import itertools
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from requests_oauthlib import OAuth1
+
+from slate_state import STATE_DIR
+from instrumentation import timed, annotate
+from log_config import configure_logging
+
+# Point at a local stub (python twitter_poster.py) to exercise posting without Twitter
+TWITTER_API_BASE = os.getenv('TWITTER_API_BASE', 'https://api.twitter.com')
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimited(Exception):
+    """Raised when the tweet endpoint answers 429; reset_at is a unix timestamp"""
+
+    def __init__(self, reset_at):
+        super().__init__(f"rate limited until {datetime.fromtimestamp(reset_at):%H:%M:%S}")
+        self.reset_at = reset_at
+
+
+class TweetEndpoint:
+    """Minimal POST /2/tweets client that reports rate limits instead of sleeping on them"""
+
+    def __init__(self, consumer_key=None, consumer_secret=None, access_token=None,
+                 access_token_secret=None, base_url=TWITTER_API_BASE, timeout=30):
+        self.url = f"{base_url.rstrip('/')}/2/tweets"
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.auth = None
+        if consumer_key and consumer_secret and access_token and access_token_secret:
+            self.auth = OAuth1(consumer_key, consumer_secret, access_token, access_token_secret)
+
+        # (remaining, reset_at) from the last response's rate-limit headers
+        self.last_rate_limit = (None, None)
+
+    def create_tweet(self, text, in_reply_to_tweet_id=None):
+        """Post one tweet and return its id"""
+        payload = {'text': text}
+        if in_reply_to_tweet_id:
+            payload['reply'] = {'in_reply_to_tweet_id': str(in_reply_to_tweet_id)}
+
+        response = self.session.post(self.url, json=payload, auth=self.auth, timeout=self.timeout)
+        annotate(bytes=len(response.content))
+
+        remaining = response.headers.get('x-rate-limit-remaining')
+        reset_at = response.headers.get('x-rate-limit-reset')
+        self.last_rate_limit = (
+            int(remaining) if remaining is not None else None,
+            int(reset_at) if reset_at is not None else None
+        )
+
+        if response.status_code == 429:
+            raise RateLimited(self.last_rate_limit[1] or time.time() + 15 * 60)
+        response.raise_for_status()
+
+        return response.json()['data']['id']
+
+
+class ThreadPostingQueue:
+    """Posts a thread in order, persisting each tweet id so a rerun resumes instead of double-posting
+
+    clock returns the unix time rate-limit resets are compared against and
+    sleep(seconds) waits one out; by default they're the wall clock and a wait
+    that wait() can cut short.
+    """
+
+    def __init__(self, client, thread_key, state_dir=STATE_DIR, clock=time.time, sleep=None):
+        self.client = client
+        self.thread_key = thread_key
+        self.path = os.path.join(state_dir, f'thread-{thread_key}.json')
+        self.clock = clock
+
+        self.tweets = []
+        self.posted_ids = []
+        self.reply_to = None
+        self.next_attempt_at = 0.0
+        self.error = None
+
+        self._stop = threading.Event()
+        self.sleep = sleep or self._stop.wait
+        self._worker = None
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        self.tweets = saved.get('tweets', [])
+        self.posted_ids = saved.get('posted_ids', [])
+        self.reply_to = saved.get('reply_to')
+        self.next_attempt_at = saved.get('next_attempt_at', 0.0)
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'thread_key': self.thread_key,
+                'tweets': self.tweets,
+                'posted_ids': self.posted_ids,
+                'reply_to': self.reply_to,
+                'next_attempt_at': self.next_attempt_at
+            }, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    @property
+    def done(self):
+        return bool(self.tweets) and len(self.posted_ids) >= len(self.tweets)
+
+    def enqueue(self, tweets, reply_to=None):
+        """Set the thread's tweets; anything already posted under this key is kept as-is"""
+        if self.posted_ids:
+            self.tweets = self.tweets[:len(self.posted_ids)] + list(tweets[len(self.posted_ids):])
+        else:
+            self.tweets = list(tweets)
+            self.reply_to = reply_to
+        self._save()
+
+    @timed('publish')
+    def post_next(self):
+        """Post the next pending tweet; returns False if the endpoint is rate limited"""
+        text = self.tweets[len(self.posted_ids)]
+        in_reply_to = self.posted_ids[-1] if self.posted_ids else self.reply_to
+
+        try:
+            tweet_id = self.client.create_tweet(text=text, in_reply_to_tweet_id=in_reply_to)
+        except RateLimited as e:
+            self.next_attempt_at = e.reset_at
+            self._save()
+            logger.warning(f"⏳ Tweet {len(self.posted_ids) + 1}/{len(self.tweets)} {e}")
+            return False
+
+        self.posted_ids.append(tweet_id)
+
+        # Don't burn a request we know will be rejected
+        remaining, reset_at = getattr(self.client, 'last_rate_limit', (None, None))
+        self.next_attempt_at = reset_at if remaining == 0 and reset_at else 0.0
+        self._save()
+
+        logger.debug(f"✅ Posted tweet {len(self.posted_ids)}/{len(self.tweets)}: {text[:50]}...")
+        return True
+
+    def run(self, deadline=None):
+        """Post until done, sleeping through rate limits that reset before the deadline"""
+        while not self.done and not self._stop.is_set():
+            delay = self.next_attempt_at - self.clock()
+            if delay > 0:
+                if deadline is not None and self.next_attempt_at > deadline:
+                    logger.warning(f"⏸️ Thread {self.thread_key} paused until rate limit resets; next run resumes it")
+                    return False
+                if self.sleep(delay) or self._stop.is_set():
+                    return False
+                continue
+
+            try:
+                self.post_next()
+            except Exception as e:
+                self.error = e
+                logger.error(f"❌ Twitter posting failed: {e}")
+                return False
+
+        if self.done:
+            logger.info(f"🐦 Successfully posted {len(self.tweets)} tweet thread!")
+        return self.done
+
+    def start(self, max_wait=None):
+        """Post in a background thread so other stages keep running"""
+        deadline = self.clock() + max_wait if max_wait is not None else None
+        self._worker = threading.Thread(target=self.run, args=(deadline,), daemon=True)
+        self._worker.start()
+        return self
+
+    def wait(self, timeout=None):
+        """Wait for the background poster and return the ids posted so far"""
+        if self._worker:
+            self._worker.join(timeout)
+            if self._worker.is_alive():
+                self._stop.set()
+                self._worker.join()
+        return list(self.posted_ids)
+
+
+def pending_threads(state_dir=STATE_DIR):
+    """Thread keys with tweets still waiting to be posted"""
+    if not os.path.isdir(state_dir):
+        return []
+
+    pending = []
+    for name in sorted(os.listdir(state_dir)):
+        if name.startswith('thread-') and name.endswith('.json'):
+            with open(os.path.join(state_dir, name), 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            if len(saved.get('posted_ids', [])) < len(saved.get('tweets', [])):
+                pending.append(saved['thread_key'])
+    return pending
+
+
+def make_stub_server(port=8123, limit=3, window=60, clock=time.time):
+    """Local stand-in for POST /2/tweets that rate limits after `limit` posts per window of clock time"""
+    ids = itertools.count(1)
+    lock = threading.Lock()
+    bucket = {'count': 0, 'reset_at': int(clock()) + window}
+
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+
+            with lock:
+                now = int(clock())
+                if now >= bucket['reset_at']:
+                    bucket.update(count=0, reset_at=now + window)
+                bucket['count'] += 1
+                remaining = limit - bucket['count']
+                tweet_id = str(next(ids)) if remaining >= 0 else None
+
+            if tweet_id is None:
+                status, body = 429, {'title': 'Too Many Requests'}
+            else:
+                status, body = 201, {'data': {'id': tweet_id, 'text': payload.get('text', '')}}
+                reply = payload.get('reply', {}).get('in_reply_to_tweet_id')
+                logger.info(f"stub: tweet {tweet_id}" + (f" (reply to {reply})" if reply else ""))
+
+            encoded = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('x-rate-limit-remaining', str(max(remaining, 0)))
+            self.send_header('x-rate-limit-reset', str(bucket['reset_at']))
+            self.send_header('Content-Length', str(len(encoded)))
+            self.end_headers()
+            self.wfile.write(encoded)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ThreadingHTTPServer(('127.0.0.1', port), StubHandler)
+
+
+def serve_stub(port=8123, limit=3, window=60):
+    """Run the stub tweet endpoint until interrupted"""
+    server = make_stub_server(port, limit, window)
+    logger.info(f"🧪 Stub tweet endpoint on http://127.0.0.1:{port} ({limit} posts / {window}s)")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tweet endpoint stub for exercising the thread poster")
+    parser.add_argument('--port', type=int, default=8123)
+    parser.add_argument('--limit', type=int, default=3, help="Posts allowed per rate-limit window")
+    parser.add_argument('--window', type=int, default=60, help="Rate-limit window in seconds")
+    args = parser.parse_args()
+    configure_logging(buffer_size=0)
+    serve_stub(args.port, args.limit, args.window)
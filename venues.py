@@ -0,0 +1,70 @@
+import math
+
+# Home venue per team abbreviation (the predictor's codes): location, roof and elevation
+VENUES = {
+    'ARI': {'name': 'Chase Field', 'lat': 33.4455, 'lon': -112.0667, 'roof': 'retractable', 'elevation_ft': 1082},
+    'ATL': {'name': 'Truist Park', 'lat': 33.8908, 'lon': -84.4678, 'roof': 'open', 'elevation_ft': 1050},
+    'BAL': {'name': 'Oriole Park at Camden Yards', 'lat': 39.2838, 'lon': -76.6217, 'roof': 'open', 'elevation_ft': 33},
+    'BOS': {'name': 'Fenway Park', 'lat': 42.3467, 'lon': -71.0972, 'roof': 'open', 'elevation_ft': 20},
+    'CHC': {'name': 'Wrigley Field', 'lat': 41.9484, 'lon': -87.6553, 'roof': 'open', 'elevation_ft': 600},
+    'CWS': {'name': 'Rate Field', 'lat': 41.8299, 'lon': -87.6338, 'roof': 'open', 'elevation_ft': 595},
+    'CIN': {'name': 'Great American Ball Park', 'lat': 39.0979, 'lon': -84.5082, 'roof': 'open', 'elevation_ft': 490},
+    'CLE': {'name': 'Progressive Field', 'lat': 41.4962, 'lon': -81.6852, 'roof': 'open', 'elevation_ft': 650},
+    'COL': {'name': 'Coors Field', 'lat': 39.7559, 'lon': -104.9942, 'roof': 'open', 'elevation_ft': 5200},
+    'DET': {'name': 'Comerica Park', 'lat': 42.3390, 'lon': -83.0485, 'roof': 'open', 'elevation_ft': 600},
+    'HOU': {'name': 'Daikin Park', 'lat': 29.7573, 'lon': -95.3555, 'roof': 'retractable', 'elevation_ft': 50},
+    'KC': {'name': 'Kauffman Stadium', 'lat': 39.0517, 'lon': -94.4803, 'roof': 'open', 'elevation_ft': 750},
+    'LAA': {'name': 'Angel Stadium', 'lat': 33.8003, 'lon': -117.8827, 'roof': 'open', 'elevation_ft': 160},
+    'LAD': {'name': 'Dodger Stadium', 'lat': 34.0739, 'lon': -118.2400, 'roof': 'open', 'elevation_ft': 515},
+    'MIA': {'name': 'loanDepot park', 'lat': 25.7781, 'lon': -80.2197, 'roof': 'retractable', 'elevation_ft': 10},
+    'MIL': {'name': 'American Family Field', 'lat': 43.0280, 'lon': -87.9712, 'roof': 'retractable', 'elevation_ft': 635},
+    'MIN': {'name': 'Target Field', 'lat': 44.9817, 'lon': -93.2776, 'roof': 'open', 'elevation_ft': 815},
+    'NYM': {'name': 'Citi Field', 'lat': 40.7571, 'lon': -73.8458, 'roof': 'open', 'elevation_ft': 20},
+    'NYY': {'name': 'Yankee Stadium', 'lat': 40.8296, 'lon': -73.9262, 'roof': 'open', 'elevation_ft': 55},
+    'OAK': {'name': 'Sutter Health Park', 'lat': 38.5803, 'lon': -121.5133, 'roof': 'open', 'elevation_ft': 25},
+    'PHI': {'name': 'Citizens Bank Park', 'lat': 39.9061, 'lon': -75.1665, 'roof': 'open', 'elevation_ft': 20},
+    'PIT': {'name': 'PNC Park', 'lat': 40.4469, 'lon': -80.0057, 'roof': 'open', 'elevation_ft': 730},
+    'SD': {'name': 'Petco Park', 'lat': 32.7073, 'lon': -117.1566, 'roof': 'open', 'elevation_ft': 20},
+    'SF': {'name': 'Oracle Park', 'lat': 37.7786, 'lon': -122.3893, 'roof': 'open', 'elevation_ft': 10},
+    'SEA': {'name': 'T-Mobile Park', 'lat': 47.5914, 'lon': -122.3325, 'roof': 'retractable', 'elevation_ft': 20},
+    'STL': {'name': 'Busch Stadium', 'lat': 38.6226, 'lon': -90.1928, 'roof': 'open', 'elevation_ft': 465},
+    'TB': {'name': 'Tropicana Field', 'lat': 27.7682, 'lon': -82.6534, 'roof': 'dome', 'elevation_ft': 45},
+    'TEX': {'name': 'Globe Life Field', 'lat': 32.7473, 'lon': -97.0842, 'roof': 'retractable', 'elevation_ft': 550},
+    'TOR': {'name': 'Rogers Centre', 'lat': 43.6414, 'lon': -79.3894, 'roof': 'retractable', 'elevation_ft': 270},
+    'WSN': {'name': 'Nationals Park', 'lat': 38.8730, 'lon': -77.0074, 'roof': 'open', 'elevation_ft': 25}
+}
+
+# Statcast's team codes that differ from the predictor's
+STATCAST_TEAM_CODES = {'AZ': 'ARI', 'WSH': 'WSN', 'ATH': 'OAK', 'CHW': 'CWS', 'KCR': 'KC',
+                       'SDP': 'SD', 'SFG': 'SF', 'TBR': 'TB'}
+
+# Temperature inside domes and closed retractable roofs
+INDOOR_TEMP_F = 72.0
+
+EARTH_RADIUS_MILES = 3958.8
+
+
+def normalize_team(code, full_names=None):
+    """Map a Statcast team code (or a full team name) onto the predictor's abbreviation"""
+    code = STATCAST_TEAM_CODES.get(code, code)
+    if full_names and code not in VENUES:
+        for abbr, name in full_names.items():
+            if name == code:
+                return abbr
+    return code
+
+
+def air_density_ratio(temp_f, elevation_ft):
+    """Air density relative to sea level at 70°F; lower means the ball carries further"""
+    pressure_ratio = math.exp(-elevation_ft / 27000.0)
+    return pressure_ratio * (70.0 + 459.67) / (temp_f + 459.67)
+
+
+def distance_miles(from_team, to_team):
+    """Great-circle distance between two teams' home venues"""
+    a, b = VENUES[from_team], VENUES[to_team]
+    lat1, lat2 = math.radians(a['lat']), math.radians(b['lat'])
+    half_dlat = (lat2 - lat1) / 2
+    half_dlon = math.radians(b['lon'] - a['lon']) / 2
+    h = math.sin(half_dlat) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(half_dlon) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(h))